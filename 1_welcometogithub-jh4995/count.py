@@ -1,22 +1,24 @@
 import os
+from scanner import CorpusScanner
 
 DATA_PATH = r""
+MANIFEST_FILE = "manifest.json"  # 파일 목록 캐시 (다음 실행에서 재사용)
+REUSE_MANIFEST = False  # True면 저장된 manifest를 사용하여 디렉토리 탐색 생략
 
 if __name__ == "__main__":
     
-    folder_count = 0
+    scanner = CorpusScanner(DATA_PATH, MANIFEST_FILE)
+    entries = scanner.scan(REUSE_MANIFEST)
+    
+    folder_count = scanner.num_dirs  # 최상위 폴더 포함
     json_count = 0
     total_size = 0
     
-    for root, dirs, files in os.walk(DATA_PATH):
-        folder_count += 1  # 현재 폴더 포함
-        for f in files:
-            file_path = os.path.join(root, f)
-            total_size += os.path.getsize(file_path)
-            if f.endswith('.json'):
-                json_count += 1
+    for file_path, size, mtime in entries:
+        total_size += size
+        if file_path.endswith('.json'):
+            json_count += 1
     print(f"전체 폴더 개수: {folder_count}")
     print(f"JSON 파일 개수: {json_count}")
 
     print(f"전체 파일 크기: {total_size} 바이트")
-
@@ -0,0 +1,228 @@
+"""고정 메모리 근사 통계용 sketch (Count-Min Sketch, HyperLogLog, Space-Saving)
+
+과제 폴더는 각각 단독으로 실행 / 제출하므로 이 파일을 두 폴더에 같은 내용으로 둠
+- 원본: 2_count-term-jh4995/sketches.py (수정은 원본에서 한 뒤 사본에 그대로 복사)
+- 사본: 3_inverted-index-jh4995/sketches.py
+두 파일이 같은지는 2_count-term-jh4995/tests/test_sketches.py에서 확인
+"""
+import math
+import heapq
+from array import array
+from hashlib import blake2b
+
+# 64비트 마스크
+MASK64 = (1 << 64) - 1
+
+def hash_term(term):
+    """term의 128비트 해시를 두 개의 64비트 정수로 반환
+    
+    Python 내장 hash()는 프로세스마다 달라지므로 워커 간 sketch 병합을 위해 blake2b 사용
+    """
+    h = int.from_bytes(blake2b(term.encode('utf8'), digest_size=16).digest(), 'little')
+    return h & MASK64, (h >> 64) | 1
+
+class CountMinSketch:
+    """Count-Min Sketch: 고정 메모리로 term별 빈도의 상한 추정
+    
+    추정값 <= 실제값 + epsilon * total (확률 1 - delta 이상), epsilon = e / width, delta = e^(-depth)
+    """
+    
+    def __init__(self, width=1 << 18, depth=4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+    
+    def add(self, hashes, count=1):
+        """hash_term() 결과로 빈도 count 추가"""
+        h1, h2 = hashes
+        for i, row in enumerate(self.rows):
+            row[(h1 + i * h2) % self.width] += count
+        self.total += count
+    
+    def estimate(self, hashes):
+        """빈도 상한 추정"""
+        h1, h2 = hashes
+        return min(row[(h1 + i * h2) % self.width] for i, row in enumerate(self.rows))
+    
+    def error_bound(self):
+        """추정 오차 상한 (epsilon * total)"""
+        return math.e / self.width * self.total
+    
+    def confidence(self):
+        """오차 상한이 성립할 확률 (1 - delta)"""
+        return 1 - math.exp(-self.depth)
+    
+    def merge(self, other):
+        """같은 크기의 다른 sketch를 합산"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("크기가 다른 Count-Min Sketch는 병합할 수 없습니다.")
+        for row, other_row in zip(self.rows, other.rows):
+            for j, value in enumerate(other_row):
+                if value:
+                    row[j] += value
+        self.total += other.total
+
+class HyperLogLog:
+    """HyperLogLog: 고정 메모리로 서로 다른 term 수(어휘 크기) 추정 (표준 오차 약 1.04 / sqrt(2^p))"""
+    
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+    
+    def add(self, hashes):
+        """hash_term() 결과로 term 추가"""
+        h = hashes[0]
+        idx = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+    
+    def count(self):
+        """서로 다른 term 수 추정"""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        
+        # 작은 범위 보정 (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros > 0:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+    
+    def standard_error(self):
+        """상대 표준 오차"""
+        return 1.04 / math.sqrt(self.m)
+    
+    def merge(self, other):
+        """같은 크기의 다른 HyperLogLog와 register별 최댓값으로 병합"""
+        if self.p != other.p:
+            raise ValueError("크기가 다른 HyperLogLog는 병합할 수 없습니다.")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+class SpaceSaving:
+    """Space-Saving heavy hitters: 최대 capacity개의 term만 추적하여 상위 빈도 term 추정
+    
+    term별 (count, error)를 유지하며 실제 빈도는 [count - error, count] 범위에 있음
+    """
+    
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self.counters = {}  # term -> [count, error]
+        self.heap = []  # (count, term) 최소 힙 (count가 오래된 항목은 교체 시 갱신)
+    
+    def min_count(self):
+        """가득 찬 경우 추적 중인 최소 count (추적되지 않는 term 빈도의 상한)"""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+    
+    def add(self, term, count=1):
+        """term 빈도 count 추가 (가득 찬 경우 최소 count term을 교체)"""
+        counter = self.counters.get(term)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[term] = [count, 0]
+            heapq.heappush(self.heap, (count, term))
+        else:
+            min_count = self.pop_min()
+            self.counters[term] = [min_count + count, min_count]
+            heapq.heappush(self.heap, (min_count + count, term))
+    
+    def pop_min(self):
+        """최소 count term을 제거하고 그 count 반환 (힙의 오래된 count는 현재 값으로 갱신 후 다시 삽입)"""
+        while True:
+            count, term = heapq.heappop(self.heap)
+            current = self.counters[term][0]
+            if current == count:
+                del self.counters[term]
+                return count
+            heapq.heappush(self.heap, (current, term))
+    
+    def merge(self, other):
+        """다른 summary와 병합 (한쪽에만 있는 term은 다른 쪽 최소 count를 상한/오차로 더함)"""
+        min_self = self.min_count()
+        min_other = other.min_count()
+        
+        merged = {}
+        for term in self.counters.keys() | other.counters.keys():
+            count_a, error_a = self.counters.get(term, (min_self, min_self))
+            count_b, error_b = other.counters.get(term, (min_other, min_other))
+            merged[term] = [count_a + count_b, error_a + error_b]
+        
+        top = sorted(merged, key=lambda t: merged[t][0], reverse=True)[:self.capacity]
+        self.counters = {term: merged[term] for term in top}
+        self.heap = [(counter[0], term) for term, counter in self.counters.items()]
+        heapq.heapify(self.heap)
+    
+    def top(self, n):
+        """count 내림차순 상위 n개 (term, count, error)"""
+        items = sorted(self.counters.items(), key=lambda x: x[1][0], reverse=True)[:n]
+        return [(term, count, error) for term, (count, error) in items]
+
+class CorpusSketch:
+    """문서 집합의 TF/DF/어휘 크기/상위 term을 고정 메모리로 근사 (워커별로 만든 뒤 merge 가능)"""
+    
+    def __init__(self, width=1 << 18, depth=4, hll_p=14, heavy_capacity=20000):
+        self.tf_sketch = CountMinSketch(width, depth)
+        self.df_sketch = CountMinSketch(width, depth)
+        self.vocabulary = HyperLogLog(hll_p)
+        self.heavy_hitters = SpaceSaving(heavy_capacity)
+        self.num_docs = 0
+    
+    def add_document(self, doc_counts):
+        """한 문서의 term 빈도 {term: count}를 반영"""
+        for term, count in doc_counts.items():
+            hashes = hash_term(term)
+            self.tf_sketch.add(hashes, count)
+            self.df_sketch.add(hashes, 1)
+            self.vocabulary.add(hashes)
+            self.heavy_hitters.add(term, count)
+        self.num_docs += 1
+    
+    def merge(self, other):
+        """다른 워커의 sketch를 병합"""
+        self.tf_sketch.merge(other.tf_sketch)
+        self.df_sketch.merge(other.df_sketch)
+        self.vocabulary.merge(other.vocabulary)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.num_docs += other.num_docs
+    
+    def top_terms(self, n):
+        """term_freq 상위 n개를 term_dict.json 형식으로 반환 (추정값은 상한, *_error는 오차 범위)"""
+        df_error = int(math.ceil(self.df_sketch.error_bound()))
+        
+        # 추적 중인 모든 후보의 추정값을 Count-Min으로 보정한 뒤 상위 n개 선택
+        candidates = []
+        for term, count, error in self.heavy_hitters.top(self.heavy_hitters.capacity):
+            hashes = hash_term(term)
+            # 두 추정값 모두 상한이므로 작은 쪽 사용
+            tf_upper = min(count, self.tf_sketch.estimate(hashes))
+            tf_lower = max(0, count - error)
+            df = min(self.df_sketch.estimate(hashes), self.num_docs)
+            candidates.append((term, tf_upper, max(0, tf_upper - tf_lower), df))
+        candidates.sort(key=lambda x: x[1], reverse=True)
+        
+        result = {}
+        for term, tf, tf_error, df in candidates[:n]:
+            result[term] = {
+                "doc_freq": df,
+                "term_freq": tf,
+                "doc_freq_error": df_error,
+                "term_freq_error": tf_error
+            }
+        return result
+    
+    def summary(self):
+        """근사 통계 요약"""
+        return {
+            "num_docs": self.num_docs,
+            "total_terms": self.tf_sketch.total,
+            "vocabulary_size": self.vocabulary.count(),
+            "vocabulary_size_relative_error": self.vocabulary.standard_error(),
+            "term_freq_error_bound": self.tf_sketch.error_bound(),
+            "doc_freq_error_bound": self.df_sketch.error_bound(),
+            "error_bound_confidence": self.tf_sketch.confidence()
+        }
@@ -0,0 +1,78 @@
+import os
+import json
+import random
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+import count_term
+
+
+def random_documents(num_docs, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"단어{i}" for i in range(200)] + [f"term{i}" for i in range(100)]
+    return [rng.choices(vocabulary, k=rng.randint(1, 40)) for _ in range(num_docs)]
+
+
+class CountExactTest(unittest.TestCase):
+    """spill / k-way merge / 외부 정렬을 거친 결과가 메모리에서 직접 계산한 TF/DF와 같은지 확인"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.documents = random_documents(300)
+        
+        self.expected_tf = Counter()
+        self.expected_df = Counter()
+        for terms in self.documents:
+            self.expected_tf.update(terms)
+            self.expected_df.update(set(terms))
+    
+    def expected_output(self):
+        terms = sorted(self.expected_tf)
+        return {term: {"doc_freq": self.expected_df[term], "term_freq": self.expected_tf[term]}
+                for term in sorted(terms, key=lambda term: self.expected_tf[term], reverse=True)}
+    
+    def spill_documents(self, spill_every):
+        """문서 spill_every개마다 부분 테이블을 spill하고 (run 경로들, 남은 TF, 남은 DF) 반환"""
+        run_paths = []
+        term_freq = Counter()
+        doc_freq = Counter()
+        for i, terms in enumerate(self.documents, 1):
+            term_freq.update(terms)
+            doc_freq.update(set(terms))
+            if i % spill_every == 0:
+                run_paths.append(count_term.spill_to_disk(term_freq, doc_freq, self.tmp, len(run_paths)))
+                term_freq = Counter()
+                doc_freq = Counter()
+        return run_paths, term_freq, doc_freq
+    
+    def test_merge_runs_streams_term_order(self):
+        run_paths, term_freq, doc_freq = self.spill_documents(37)
+        merged = count_term.merge_runs(run_paths, term_freq, doc_freq)
+        self.assertNotIsInstance(merged, list)
+        self.assertEqual(list(merged), [(term, self.expected_tf[term], self.expected_df[term])
+                                        for term in sorted(self.expected_tf)])
+    
+    def test_sorted_output_matches_json_dump(self):
+        output_file = os.path.join(self.tmp, "term_dict.json")
+        for spill_threshold in [1000000, 50, 1]:
+            with self.subTest(spill_threshold=spill_threshold), \
+                    mock.patch.object(count_term, "SPILL_THRESHOLD", spill_threshold):
+                run_paths, term_freq, doc_freq = self.spill_documents(50)
+                count_term.save_sorted_results(count_term.merge_runs(run_paths, term_freq, doc_freq),
+                                               output_file, self.tmp)
+                with open(output_file, encoding='utf8') as f:
+                    output = f.read()
+                self.assertEqual(output, json.dumps(self.expected_output(), ensure_ascii=False, indent=4))
+    
+    def test_empty_output(self):
+        output_file = os.path.join(self.tmp, "term_dict.json")
+        count_term.save_sorted_results(iter([]), output_file, self.tmp)
+        with open(output_file, encoding='utf8') as f:
+            self.assertEqual(json.load(f), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
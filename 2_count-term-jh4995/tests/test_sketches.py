@@ -0,0 +1,95 @@
+import os
+import random
+import unittest
+from collections import Counter
+import sketches
+from sketches import CountMinSketch, HyperLogLog, SpaceSaving, CorpusSketch, hash_term
+
+# 3_inverted-index-jh4995에 둔 sketches.py 사본 (과제 폴더별 단독 실행용)
+SKETCHES_COPY = os.path.join(os.path.dirname(__file__), "..", "..", "3_inverted-index-jh4995", "sketches.py")
+
+
+def zipf_documents(num_docs, vocabulary_size, seed=0):
+    """앞쪽 term이 자주 나오는 (Zipf 분포) 임의의 문서별 term 빈도 리스트"""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    return [Counter(rng.choices(vocabulary, weights, k=rng.randint(5, 50))) for _ in range(num_docs)]
+
+
+class SketchErrorBoundTest(unittest.TestCase):
+    """sketch 추정값이 각 자료구조가 보장하는 오차 범위 안에 있는지 확인"""
+    
+    def setUp(self):
+        self.documents = zipf_documents(2000, 3000)
+        self.term_freq = Counter()
+        self.doc_freq = Counter()
+        for doc_counts in self.documents:
+            self.term_freq.update(doc_counts)
+            self.doc_freq.update(doc_counts.keys())
+    
+    def test_count_min_upper_bound(self):
+        halves = [CountMinSketch(width=1024, depth=4), CountMinSketch(width=1024, depth=4)]
+        for i, doc_counts in enumerate(self.documents):
+            for term, count in doc_counts.items():
+                halves[i % 2].add(hash_term(term), count)
+        sketch, other = halves
+        sketch.merge(other)
+        self.assertEqual(sketch.total, sum(self.term_freq.values()))
+        
+        # 추정값은 항상 실제값 이상, epsilon * total을 넘는 term의 비율은 delta 이하
+        over_bound = 0
+        for term, freq in self.term_freq.items():
+            estimate = sketch.estimate(hash_term(term))
+            self.assertGreaterEqual(estimate, freq)
+            over_bound += estimate > freq + sketch.error_bound()
+        self.assertLessEqual(over_bound / len(self.term_freq), 1 - sketch.confidence())
+    
+    def test_hyperloglog_within_standard_error(self):
+        halves = [HyperLogLog(p=10), HyperLogLog(p=10)]
+        for i, term in enumerate(self.term_freq):
+            halves[i % 2].add(hash_term(term))
+        hll, other = halves
+        hll.merge(other)
+        self.assertLessEqual(abs(hll.count() - len(self.term_freq)), 4 * hll.standard_error() * len(self.term_freq))
+    
+    def test_space_saving_brackets_true_counts(self):
+        halves = [SpaceSaving(capacity=200), SpaceSaving(capacity=200)]
+        for i, doc_counts in enumerate(self.documents):
+            for term, count in doc_counts.items():
+                halves[i % 2].add(term, count)
+        summary, other = halves
+        summary.merge(other)
+        
+        for term, count, error in summary.top(summary.capacity):
+            with self.subTest(term=term):
+                self.assertLessEqual(count - error, self.term_freq[term])
+                self.assertGreaterEqual(count, self.term_freq[term])
+        # 추적되지 않은 term의 빈도는 최소 count 이하
+        tracked = set(summary.counters)
+        self.assertTrue(all(freq <= summary.min_count() for term, freq in self.term_freq.items() if term not in tracked))
+    
+    def test_corpus_sketch_top_terms(self):
+        sketch = CorpusSketch(width=4096, hll_p=10, heavy_capacity=200)
+        for doc_counts in self.documents:
+            sketch.add_document(doc_counts)
+        top_terms = sketch.top_terms(20)
+        self.assertEqual(len(top_terms), 20)
+        
+        # 실제 상위 10개 term은 모두 포함되고, TF/DF 추정값은 오차 범위 안에 있음
+        self.assertLessEqual({term for term, _ in self.term_freq.most_common(10)}, set(top_terms))
+        for term, entry in top_terms.items():
+            with self.subTest(term=term):
+                self.assertLessEqual(entry["term_freq"] - entry["term_freq_error"], self.term_freq[term])
+                self.assertGreaterEqual(entry["term_freq"], self.term_freq[term])
+                self.assertGreaterEqual(entry["doc_freq"], self.doc_freq[term])
+                self.assertLessEqual(entry["doc_freq"], self.doc_freq[term] + entry["doc_freq_error"])
+    
+    @unittest.skipUnless(os.path.exists(SKETCHES_COPY), "sketches.py 사본 없음")
+    def test_vendored_copy_is_identical(self):
+        with open(SKETCHES_COPY, 'rb') as copy, open(sketches.__file__, 'rb') as f:
+            self.assertEqual(copy.read(), f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,30 @@
 import os
 import json
 import re
+import heapq
+import tempfile
+import multiprocessing
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 from konlpy.tag import Komoran
+from sketches import CorpusSketch
 
 # 기본 설정
 DATA_PATH = r"C:\Users\82104\OneDrive\바탕 화면\충남대 자료\2025-2\알고리즘\167.과학기술표준분류 대응 특허 데이터\01-1.정식개방데이터\Training\01.원천데이터\unzipped"
 
+# 병렬 처리 / 메모리 설정
+NUM_WORKERS = os.cpu_count() or 1  # 워커 프로세스 수
+CHUNK_SIZE = 500  # 워커가 한 번에 처리하는 파일 수
+SPILL_THRESHOLD = 2000000  # 메모리에 유지할 최대 unique term 수 (초과 시 디스크로 spill)
+
+# 근사 통계 모드 설정 (Count-Min Sketch / HyperLogLog / Space-Saving, 고정 메모리)
+APPROXIMATE = False  # True면 정확한 TF/DF 대신 sketch 기반 근사 통계 계산
+TOP_N = 10000  # 근사 모드에서 출력할 상위 term 수
+SKETCH_CHUNK_SIZE = 20000  # 근사 모드에서 워커가 한 번에 처리하는 파일 수 (sketch가 고정 크기라 묶음을 크게 잡음)
+APPROX_OUTPUT_FILE = "term_dict_approx.json"
+APPROX_SUMMARY_FILE = "term_stats_approx.json"
+
 # 정규식 패턴
 KOREAN_PATTERN = re.compile(r'[가-힣]+')
 ENGLISH_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9_-]*')
@@ -39,71 +57,216 @@ def extract_terms(text):
     return [w.lower() if t == 'SL' else w for w, t in tokens
             if t in {'NNG', 'NNP', 'SL'}]
 
-def calculate_tf_df(documents_terms):
-    """TF와 DF를 계산"""
+def iter_json_files(data_path):
+    """data_path 아래의 JSON 파일 경로를 하나씩 반환 (전체 목록을 메모리에 만들지 않음)"""
+    for root, dirs, files in os.walk(data_path):
+        for file in files:
+            if file.endswith('.json'):
+                yield os.path.join(root, file)
+
+def iter_chunks(iterable, size):
+    """iterable을 size개씩 묶어서 반환"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def count_terms_in_files(file_paths):
+    """(map) 파일 묶음의 각 문서를 읽는 즉시 TF/DF 부분 테이블에 반영"""
     term_freq = Counter()  # TF: 전체 문서 집합에서의 출현 빈도
     doc_freq = Counter()   # DF: 몇 개의 문서에서 사용되었는가
     
-    for doc_terms in documents_terms:
-        # TF 계산
-        term_freq.update(doc_terms)
+    for file_path in file_paths:
+        # JSON 파일 읽기 및 term 추출
+        json_data = read_json_file(file_path)
+        document_terms = extract_terms(extract_text_from_document(json_data))
         
-        # DF 계산 (문서당 unique terms만)
-        unique_terms = set(doc_terms)
-        doc_freq.update(unique_terms)
-    
-    return term_freq, doc_freq
-
-def sort_and_format_results(term_freq, doc_freq):
-    """term_freq 기준으로 내림차순 정렬하여 JSON 형태로 포맷팅"""
-    result = {}
-    for term, tf in term_freq.most_common():
-        result[term] = {
-            "doc_freq": doc_freq[term],
-            "term_freq": tf
-        }
-    return result
+        if document_terms:
+            doc_counts = Counter(document_terms)
+            term_freq.update(doc_counts)
+            # DF 계산 (문서당 unique terms만)
+            doc_freq.update(doc_counts.keys())
+    
+    return term_freq, doc_freq, len(file_paths)
+
+def spill_to_disk(term_freq, doc_freq, spill_dir, run_id):
+    """(reduce) 메모리의 TF/DF 테이블을 term 순으로 정렬해 디스크에 기록"""
+    run_path = os.path.join(spill_dir, f"run_{run_id}.tsv")
+    with open(run_path, 'w', encoding='utf8') as f:
+        for term in sorted(term_freq):
+            f.write(f"{term}\t{term_freq[term]}\t{doc_freq[term]}\n")
+    return run_path
+
+def iter_run(run_path):
+    """spill 파일의 (term, tf, df)를 순서대로 반환"""
+    with open(run_path, encoding='utf8') as f:
+        for line in f:
+            term, tf, df = line.rstrip('\n').split('\t')
+            yield term, int(tf), int(df)
+
+def merge_runs(run_paths, term_freq, doc_freq):
+    """(reduce) spill 파일들과 메모리 테이블을 term 순으로 k-way merge하여 (term, tf, df)를 하나씩 반환"""
+    in_memory = ((term, term_freq[term], doc_freq[term]) for term in sorted(term_freq))
+    streams = [iter_run(path) for path in run_paths] + [in_memory]
+    
+    current = None
+    for term, tf, df in heapq.merge(*streams, key=lambda x: x[0]):
+        if current is not None and current[0] == term:
+            current = (term, current[1] + tf, current[2] + df)
+        else:
+            if current is not None:
+                yield current
+            current = (term, tf, df)
+    if current is not None:
+        yield current
+
+def sort_runs_by_term_freq(term_stats, spill_dir):
+    """(term, tf, df) 스트림을 SPILL_THRESHOLD개씩 tf 내림차순으로 정렬해 디스크에 기록하고 run 경로 리스트 반환"""
+    run_paths = []
+    for chunk in iter_chunks(term_stats, SPILL_THRESHOLD):
+        # 안정 정렬이므로 tf가 같은 term은 term 순서 유지
+        chunk.sort(key=lambda x: x[1], reverse=True)
+        run_path = os.path.join(spill_dir, f"sorted_{len(run_paths)}.tsv")
+        with open(run_path, 'w', encoding='utf8') as f:
+            for term, tf, df in chunk:
+                f.write(f"{term}\t{tf}\t{df}\n")
+        run_paths.append(run_path)
+    return run_paths
+
+def save_sorted_results(term_stats, output_filename, spill_dir):
+    """(term, tf, df) 스트림을 term_freq 내림차순의 term_dict.json으로 저장 (외부 정렬, 전체 어휘를 메모리에 두지 않음)
+    
+    tf가 같으면 term 순서이며, 출력 형식은 json.dump(indent=4)와 같음
+    """
+    run_paths = sort_runs_by_term_freq(term_stats, spill_dir)
+    merged = heapq.merge(*[iter_run(path) for path in run_paths], key=lambda x: -x[1])
+    
+    with open(output_filename, 'w', encoding='utf8') as f:
+        f.write("{")
+        separator = "\n"
+        for term, tf, df in merged:
+            f.write(f'{separator}    {json.dumps(term, ensure_ascii=False)}: {{\n'
+                    f'        "doc_freq": {df},\n'
+                    f'        "term_freq": {tf}\n'
+                    f'    }}')
+            separator = ",\n"
+        f.write("\n}" if separator == ",\n" else "}")
+
+def sketch_terms_in_files(file_paths):
+    """(map) 파일 묶음의 문서들을 하나의 CorpusSketch로 근사"""
+    sketch = CorpusSketch(heavy_capacity=TOP_N * 2)
+    
+    for file_path in file_paths:
+        json_data = read_json_file(file_path)
+        document_terms = extract_terms(extract_text_from_document(json_data))
+        if document_terms:
+            sketch.add_document(Counter(document_terms))
+    
+    return sketch
 
 def save_to_json(data, output_filename):
     """데이터를 JSON 파일로 저장"""
     with open(output_filename, 'w', encoding='utf8') as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
 
-def main():
-    """메인 실행 함수"""
-    all_documents_terms = []
+def count_exact():
+    """정확한 TF/DF: 파일 묶음을 워커들이 부분 테이블로 만들고(map) 도착하는 대로 병합(reduce)"""
+    term_freq = Counter()
+    doc_freq = Counter()
+    run_paths = []
     
     processed_files = 0
+    next_report = 1000
     
-    # JSON 파일들 처리
-    for root, dirs, files in os.walk(DATA_PATH):
-        for file in files:
-            if file.endswith('.json'):
-                file_path = os.path.join(root, file)
-                
-                # JSON 파일 읽기
-                json_data = read_json_file(file_path)
-                
-                # 텍스트 추출
-                document_text = extract_text_from_document(json_data)
-                
-                # term 추출
-                document_terms = extract_terms(document_text)
-                if document_terms:
-                    all_documents_terms.append(document_terms)
+    # JVM 등 워커별 자원이 fork로 공유되지 않도록 spawn 사용
+    mp_context = multiprocessing.get_context("spawn")
+    
+    with tempfile.TemporaryDirectory() as spill_dir, \
+            ProcessPoolExecutor(max_workers=NUM_WORKERS, mp_context=mp_context) as executor:
+        chunks = iter_chunks(iter_json_files(DATA_PATH), CHUNK_SIZE)
+        pending = set()
+        
+        while True:
+            # 처리 중인 묶음 수를 제한하여 부분 테이블이 메모리에 쌓이지 않도록 함
+            while len(pending) < NUM_WORKERS * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(count_terms_in_files, chunk))
+            
+            if not pending:
+                break
+            
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                partial_tf, partial_df, count = future.result()
+                term_freq.update(partial_tf)
+                doc_freq.update(partial_df)
                 
-                processed_files += 1
-                if processed_files % 1000 == 0:
+                processed_files += count
+                if processed_files >= next_report:
                     print(f"처리된 파일: {processed_files:,}개")
+                    next_report += 1000
+            
+            # unique term 수가 임계값을 넘으면 디스크로 spill
+            if len(term_freq) > SPILL_THRESHOLD:
+                run_paths.append(spill_to_disk(term_freq, doc_freq, spill_dir, len(run_paths)))
+                term_freq = Counter()
+                doc_freq = Counter()
+        
+        # TF/DF 병합 결과를 스트림으로 받아 term_freq 내림차순으로 정렬하여 JSON 파일로 저장
+        save_sorted_results(merge_runs(run_paths, term_freq, doc_freq), "term_dict.json", spill_dir)
+
+def count_approximate():
+    """근사 TF/DF: 파일 묶음을 워커들이 고정 크기 sketch로 만들고 도착하는 대로 병합하여 상위 TOP_N term과 오차 범위 저장"""
+    mp_context = multiprocessing.get_context("spawn")
+    
+    sketch = None
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS, mp_context=mp_context) as executor:
+        # 파일 목록은 부모 프로세스에서 한 번만 순회하고 묶음 단위로 워커에 전달
+        chunks = iter_chunks(iter_json_files(DATA_PATH), SKETCH_CHUNK_SIZE)
+        pending = set()
+        
+        while True:
+            # 처리 중인 묶음 수를 제한하여 병합 전 sketch가 메모리에 쌓이지 않도록 함
+            while len(pending) < NUM_WORKERS * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(sketch_terms_in_files, chunk))
+            
+            if not pending:
+                break
+            
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                partial = future.result()
+                if sketch is None:
+                    sketch = partial
+                else:
+                    sketch.merge(partial)
     
-    # TF/DF 계산
-    term_freq, doc_freq = calculate_tf_df(all_documents_terms)
+    if sketch is None:
+        sketch = CorpusSketch(heavy_capacity=TOP_N * 2)
     
-    # 결과 정렬 및 포맷팅
-    formatted_results = sort_and_format_results(term_freq, doc_freq)
+    summary = sketch.summary()
+    print(f"처리된 문서: {summary['num_docs']:,}개")
+    print(f"추정 어휘 크기: {summary['vocabulary_size']:,}개 (상대 표준 오차 {summary['vocabulary_size_relative_error']:.2%})")
+    print(f"TF/DF 추정 오차 상한: {summary['term_freq_error_bound']:.1f} / {summary['doc_freq_error_bound']:.1f} "
+          f"(신뢰도 {summary['error_bound_confidence']:.2%})")
     
-    # JSON 파일로 저장
-    save_to_json(formatted_results, "term_dict.json")
+    # 상위 TOP_N term (term_dict.json 형식 + 오차 범위) 및 요약 저장
+    save_to_json(sketch.top_terms(TOP_N), APPROX_OUTPUT_FILE)
+    save_to_json(summary, APPROX_SUMMARY_FILE)
+
+def main():
+    """메인 실행 함수"""
+    if APPROXIMATE:
+        count_approximate()
+    else:
+        count_exact()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
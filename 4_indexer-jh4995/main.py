@@ -1,17 +1,101 @@
 # main.py
+import os
+import sys
+import json
+import time
+import argparse
 from src.indexer import Indexer
 
 # 설정
-DATA_DIR = r"C:\Users\82104\OneDrive\바탕 화면\충남대 자료\2025-2\알고리즘\167.과학기술표준분류 대응 특허 데이터\01-1.정식개방데이터\Training\01.원천데이터\unzipped"  # data path
+DATA_DIR = os.environ.get("DATA_DIR", r"C:\Users\82104\OneDrive\바탕 화면\충남대 자료\2025-2\알고리즘\167.과학기술표준분류 대응 특허 데이터\01-1.정식개방데이터\Training\01.원천데이터\unzipped")  # data path (환경 변수 DATA_DIR로 변경 가능)
 INDEX_DIR = "index"  # indexer 출력 dir
 DOC_TABLE_FILE = "doc_table.json"
 TERM_DICT_FILE = "term_dict.json"
 POSTINGS_FILE = "postings.bin"
 
-if __name__ == "__main__":
+# CLI 종료 코드
+EXIT_OK = 0
+EXIT_FAILURE = 1  # 실행 중 오류 (데이터 디렉토리 없음 등)
+EXIT_USAGE = 2  # 잘못된 명령행 인자 (argparse)
+EXIT_NO_INDEX = 3  # 인덱스 파일을 읽을 수 없음
+
+
+def run_index(args):
+    """index: 인덱스 구축"""
+    if not os.path.isdir(args.data_dir):
+        print(f"데이터 디렉토리가 없습니다: {args.data_dir}", file=sys.stderr)
+        return EXIT_FAILURE
+    indexer = Indexer(args.data_dir, args.index_dir, DOC_TABLE_FILE,
+                     TERM_DICT_FILE, POSTINGS_FILE)
+    indexer.build_index()
+    return EXIT_OK
+
+
+def run_stats(args):
+    """stats: 인덱스 요약 (문서 / term / 포스팅 수, 파일 크기)"""
+    try:
+        with open(os.path.join(args.index_dir, DOC_TABLE_FILE), 'r', encoding='utf8') as f:
+            doc_table = json.load(f)
+        with open(os.path.join(args.index_dir, TERM_DICT_FILE), 'r', encoding='utf8') as f:
+            term_dict = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"인덱스를 읽을 수 없습니다 ({args.index_dir}): {e}", file=sys.stderr)
+        return EXIT_NO_INDEX
+    
+    print(f"인덱스: {os.path.abspath(args.index_dir)}")
+    print(f"  - 문서 수: {len(doc_table):,}")
+    print(f"  - term 수: {len(term_dict):,}")
+    print(f"  - 포스팅 수: {sum(entry['length'] for entry in term_dict.values()):,}")
+    for name in (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE):
+        path = os.path.join(args.index_dir, name)
+        if os.path.isfile(path):
+            print(f"  - {name}: {os.path.getsize(path):,} bytes")
+    return EXIT_OK
+
+
+def build_parser():
+    """명령행 인자 parser"""
+    parser = argparse.ArgumentParser(description="특허 문서 인덱서 (인자 없이 실행하면 대화형 모드)")
+    parser.add_argument("--index-dir", default=INDEX_DIR, help=f"인덱스 디렉토리 (기본값: {INDEX_DIR})")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    index_parser = subparsers.add_parser("index", help="인덱스 구축")
+    index_parser.add_argument("--data-dir", default=DATA_DIR, help="특허 JSON 데이터 디렉토리 (환경 변수 DATA_DIR로도 지정)")
+    index_parser.set_defaults(handler=run_index)
+    
+    stats_parser = subparsers.add_parser("stats", help="인덱스 요약")
+    stats_parser.set_defaults(handler=run_stats)
+    return parser
+
+
+def interactive():
+    """인자 없이 실행한 경우의 대화형 모드"""
     task = input("작업을 선택하세요 (index/search): ").strip().lower()
     
     if task in ("index", "i"):
-        indexer = Indexer(DATA_DIR, INDEX_DIR, DOC_TABLE_FILE, 
+        indexer = Indexer(DATA_DIR, INDEX_DIR, DOC_TABLE_FILE,
                          TERM_DICT_FILE, POSTINGS_FILE)
-        indexer.build_index()
\ No newline at end of file
+        indexer.build_index()
+
+
+def main(argv=None):
+    """명령행 인자가 없으면 대화형 모드, 있으면 subcommand 실행 후 종료 코드 반환"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive()
+        return EXIT_OK
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return EXIT_USAGE
+    
+    start = time.perf_counter()
+    exit_code = args.handler(args)
+    print(f"경과 시간: {time.perf_counter() - start:.2f}초", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
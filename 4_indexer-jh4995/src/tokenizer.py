@@ -1,9 +1,16 @@
 # src/tokenizer.py
-from konlpy.tag import Komoran
+# Komoran은 생성할 때 JVM을 시작하므로 처음 형태소 분석할 때 생성 (stats 작업은 JVM을 시작하지 않음)
+tagger = None
 
-tagger = Komoran()
+def get_tagger():
+    """Komoran 인스턴스 (처음 호출할 때 생성)"""
+    global tagger
+    if tagger is None:
+        from konlpy.tag import Komoran
+        tagger = Komoran()
+    return tagger
 
 def extract_terms(text):
-    tokens = tagger.pos(text)
+    tokens = get_tagger().pos(text)
     return [w.lower() if t == 'SL' else w for w, t in tokens
             if t in {'NNG', 'NNP', 'SL'}]
\ No newline at end of file
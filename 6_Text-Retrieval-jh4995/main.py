@@ -1,26 +1,366 @@
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
 from src.indexer import Indexer
-from src.searcher import Searcher
+from src.searcher import Searcher, QueryError
 
 # 설정
-DATA_DIR = r"C:\Users\82104\OneDrive\바탕 화면\충남대 자료\2025-2\알고리즘\167.과학기술표준분류 대응 특허 데이터\01-1.정식개방데이터\Training\01.원천데이터\unzipped"  # data path
+DATA_DIR = os.environ.get("DATA_DIR", r"C:\Users\82104\OneDrive\바탕 화면\충남대 자료\2025-2\알고리즘\167.과학기술표준분류 대응 특허 데이터\01-1.정식개방데이터\Training\01.원천데이터\unzipped")  # data path (환경 변수 DATA_DIR로 변경 가능)
 INDEX_DIR = "index"  # indexer 출력 dir
 DOC_TABLE_FILE = "doc_table.json"
 TERM_DICT_FILE = "term_dict.json"
 POSTINGS_FILE = "postings.bin"
+POSTINGS_LAYOUT = "field"  # "field" (T/A/C 분리) 또는 "merged" (term당 단일 포스팅)
+IMPACT_BITS = None  # 8 또는 16이면 양자화 BM25F impact 인덱스도 생성
+IMPACT_ORDER = "doc"  # "doc" 또는 "impact" (impact 내림차순 segment, anytime 검색용)
+MANIFEST_FILE = "manifest.json"  # 코퍼스 파일 목록 캐시 (INDEX_DIR에 저장)
+REUSE_MANIFEST = False  # True면 저장된 manifest를 사용하여 디렉토리 탐색 생략
+JSON_BACKEND = None  # None(자동: orjson 있으면 orjson, 없으면 selective), "orjson", "selective", "json"
+IO_WORKERS = 4  # 문서 읽기/파싱 백그라운드 스레드 수
+NGRAM_FIELDS = ('T', 'A')  # 문자 bigram 보조 인덱스를 만들 필드 (None이면 생성하지 않음)
+NGRAM_UNTAGGED_WORDS = False  # True면 형태소 분석에서 term이 나오지 않은 검색어 단어도 bigram 보조 검색 (조사 / 부사 등도 포함됨)
+# 검색 필터용 메타데이터 {필터 이름: (dataset 키, "category" / "number" / "year")} (None이면 생성하지 않음)
+METADATA_FILTERS = {
+    "CLASS": ("ipc", "category"),
+    "YEAR": ("application_date", "year"),
+    "APPLICANT": ("applicant_name", "category")
+}
+VERSIONED_INDEX = False  # True면 INDEX_DIR/vNNNN/에 새 버전으로 인덱싱하고 CURRENT 포인터를 교체
+AUTO_RELOAD = False  # True면 검색 중 새 인덱스 버전이 게시되면 백그라운드에서 로드 후 교체
+ACCESS_LOG_FILE = "term_access.json"  # query term 사용 횟수 기록 (INDEX_DIR에 저장, None이면 기록하지 않음)
+WARMUP_TERMS = 100  # 검색 시작 시 사용 횟수 상위 term들의 포스팅을 백그라운드에서 미리 읽기 (0이면 사용 안 함)
+WARMUP_BUDGET = 64 * 1024 * 1024  # warmup 메모리 예산 (바이트)
+WARMUP_MODE = "preload"  # "preload" (메모리에 보관) 또는 "prefetch" (OS 페이지 캐시에 미리 읽기)
+PRUNED_INDEX_DIR = "index_pruned"  # prune 작업 출력 dir
+PRUNE_METHOD = "term"  # "term" (term-centric) 또는 "doc" (document-centric)
+PRUNE_KEEP_RATIO = 0.5  # 남길 포스팅 비율
+REORDERED_INDEX_DIR = "index_reordered"  # reorder 작업 출력 dir
+REORDER_METHOD = "minhash"  # "title" (제목 순서) 또는 "minhash" (term 집합 유사도 순서)
+JUDGMENTS_FILE = "judgments.json"  # tune 작업용 [{"query": ..., "relevant": {파일명: 등급}}, ...]
+# tune 작업에서 탐색할 BM25F 파라미터 값 (지정하지 않은 파라미터는 Searcher의 현재 값)
+SWEEP_GRID = {
+    "K1": [0.9, 1.1, 1.4, 1.8],
+    "B_A": [0.5, 0.75, 0.9],
+    "B_C": [0.6, 0.8, 0.9]
+}
+SWEEP_METRIC = "map"  # "map", "ndcg", "recall"
 
-if __name__ == "__main__":
-    task = input("작업을 선택하세요 (index/search): ").strip().lower()
+MEMORY_BUDGET = None  # 인덱싱 포스팅 버퍼 메모리 예산 (바이트, None이면 제한 없음)
+CHECKPOINT_INTERVAL = None  # 파일 N개마다 (또는 run 파일이 생길 때) 인덱싱 중간 상태를 checkpoint로 저장 (None이면 저장하지 않음)
+TIER_FIELDS = None  # 예: ('T', 'A')이면 해당 필드 포스팅을 메모리에 올리고 나머지 필드는 필요한 경우에만 디스크에서 읽음 (tiered 평가)
+
+# CLI 종료 코드
+EXIT_OK = 0
+EXIT_FAILURE = 1  # 실행 중 오류 (데이터 디렉토리 없음 등)
+EXIT_USAGE = 2  # 잘못된 명령행 인자 (argparse)
+EXIT_NO_INDEX = 3  # 인덱스 파일을 읽을 수 없음
+EXIT_QUERY_ERROR = 4  # 형식이 잘못된 쿼리가 있음 (나머지 쿼리는 처리)
+
+
+def parse_tiers(value):
+    """--tiers 값 "T,A" -> ('T', 'A')"""
+    fields = tuple(field.strip().upper() for field in value.split(','))
+    for field in fields:
+        if field not in Searcher.FIELD_WEIGHTS:
+            raise argparse.ArgumentTypeError(f"지원하지 않는 tier 필드: {field}")
+    return fields
+
+
+def open_searcher(args, **kwargs):
+    """CLI용 Searcher 생성 (인덱스를 읽을 수 없으면 None)"""
+    try:
+        return Searcher(args.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                        ngram_untagged_words=NGRAM_UNTAGGED_WORDS, **kwargs)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"인덱스를 읽을 수 없습니다 ({args.index_dir}): {e}", file=sys.stderr)
+        return None
+
+
+def read_queries(args):
+    """검색어 목록: 명령행 query, --query-file, 또는 표준 입력 (한 줄에 하나, 빈 줄 제외)"""
+    if args.query and args.query != '-':
+        return [args.query]
+    if args.query_file:
+        with open(args.query_file, 'r', encoding='utf8') as f:
+            lines = f.readlines()
+    else:
+        lines = sys.stdin.readlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def run_index(args):
+    """index: 인덱스 구축"""
+    if not os.path.isdir(args.data_dir):
+        print(f"데이터 디렉토리가 없습니다: {args.data_dir}", file=sys.stderr)
+        return EXIT_FAILURE
+    memory_budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget else None
+    indexer = Indexer(args.data_dir, args.index_dir, DOC_TABLE_FILE,
+                      TERM_DICT_FILE, POSTINGS_FILE,
+                      postings_layout=args.layout,
+                      impact_bits=args.impact_bits, impact_order=args.impact_order,
+                      manifest_file=MANIFEST_FILE, reuse_manifest=args.reuse_manifest,
+                      scan_workers=args.scan_workers,
+                      json_backend=args.json_backend, io_workers=args.workers,
+                      ngram_fields=None if args.no_ngrams else NGRAM_FIELDS,
+                      metadata_filters=None if args.no_filters else METADATA_FILTERS,
+                      versioned=args.versioned, memory_budget=memory_budget,
+                      checkpoint_interval=args.checkpoint_interval or None, resume=args.resume)
+    try:
+        indexer.build_index()
+    except ValueError as e:
+        print(f"인덱싱 실패: {e}", file=sys.stderr)
+        return EXIT_FAILURE
+    return EXIT_OK
+
+
+def run_search(args):
+    """search: 검색어마다 결과 출력 (text: process_query와 같은 형식, json: 쿼리당 JSON 한 줄)"""
+    searcher = open_searcher(args, access_log=ACCESS_LOG_FILE, warmup_terms=0, tier_fields=args.tiers)
+    if searcher is None:
+        return EXIT_NO_INDEX
+    
+    exit_code = EXIT_OK
+    first_query_ms = None
+    for query in read_queries(args):
+        start = time.perf_counter()
+        try:
+            response = searcher.search(query, offset=args.offset, limit=args.limit, snippets=args.snippets or None)
+        except QueryError as e:
+            print(f"{e} ({query})", file=sys.stderr)
+            exit_code = EXIT_QUERY_ERROR
+            continue
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if first_query_ms is None:
+            first_query_ms = elapsed_ms
+        
+        if args.format == "json":
+            output = {
+                "query": query,
+                "total": response.total,
+                "total_exact": response.total_exact,
+                "exact": response.exact,
+                "elapsed_ms": round(elapsed_ms, 3),
+                "notices": response.notices,
+                "results": [{"rank": result.rank, "doc_id": result.doc_id, "filename": result.filename,
+                             "score": result.score, "snippets": result.snippets} for result in response.results]
+            }
+            print(json.dumps(output, ensure_ascii=False))
+        else:
+            for notice in response.notices:
+                print(notice)
+            print(f"\nRESULT: {query}  ({elapsed_ms:.1f} ms)")
+            print(f"총 {response.total}개{'' if response.total_exact else ' 이상'} 문서 검색")
+            for result in response.results:
+                print(f"  {result.rank}. {result.filename}  {result.score:.2f}")
+            if response.verbose and response.results:
+                searcher.print_verbose_results(response.results)
+    
+    if args.timings:
+        # 결과 출력(JSON 등)과 섞이지 않도록 stderr에 출력
+        with contextlib.redirect_stdout(sys.stderr):
+            searcher.print_startup_times()
+            if first_query_ms is not None:
+                print(f"첫 쿼리: {first_query_ms:.1f} ms")
+    searcher.close()
+    return exit_code
+
+
+def run_bench(args):
+    """bench: 쿼리 목록을 반복 실행하여 지연 시간 분포와 처리량 측정"""
+    searcher = open_searcher(args, access_log=None, warmup_terms=0, tier_fields=args.tiers)
+    if searcher is None:
+        return EXIT_NO_INDEX
+    queries = read_queries(args)
+    if not queries:
+        print("벤치마크할 쿼리가 없습니다.", file=sys.stderr)
+        searcher.close()
+        return EXIT_FAILURE
+    
+    exit_code = EXIT_OK
+    latencies = []
+    for run in range(args.warmup_runs + args.repeat):
+        for query in queries:
+            start = time.perf_counter()
+            try:
+                searcher.search(query, limit=args.limit, snippets=False)
+            except QueryError as e:
+                if run == 0:
+                    print(f"{e} ({query})", file=sys.stderr)
+                exit_code = EXIT_QUERY_ERROR
+                continue
+            if run >= args.warmup_runs:
+                latencies.append((time.perf_counter() - start) * 1000)
+    tier_counts = searcher.tier_counts
+    searcher.close()
+    
+    if latencies:
+        latencies.sort()
+        
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+        
+        total_ms = sum(latencies)
+        print(f"쿼리 {len(queries)}개 x {args.repeat}회 (warmup {args.warmup_runs}회 제외, top-{args.limit})")
+        print(f"  - 평균: {total_ms / len(latencies):.2f} ms")
+        print(f"  - p50: {percentile(50):.2f} ms, p95: {percentile(95):.2f} ms, p99: {percentile(99):.2f} ms, 최대: {latencies[-1]:.2f} ms")
+        print(f"  - 처리량: {len(latencies) / (total_ms / 1000):.1f} queries/s")
+    if args.tiers:
+        print(f"  - tiered 평가 ({', '.join(args.tiers)}): {tier_counts['tiered']}개 쿼리 (전체 평가 {tier_counts['fallback']}개), "
+              f"디스크 포스팅 읽은 term {tier_counts['disk_read']}개 / 건너뛴 term {tier_counts['disk_skipped']}개")
+    return exit_code
+
+
+def run_stats(args):
+    """stats: 인덱스 통계 (구성 요소별 디스크 사용량, 문서 길이 / 포스팅 길이 / df 분포, 상위 term, 주의가 필요한 term)"""
+    from src.index_stats import IndexStats
+    stats = IndexStats(args.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                       top_n=args.top, high_df_ratio=args.high_df)
+    try:
+        report = stats.collect()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"인덱스를 읽을 수 없습니다 ({args.index_dir}): {e}", file=sys.stderr)
+        return EXIT_NO_INDEX
+    
+    if args.format == "json":
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        stats.print_report(report)
+    return EXIT_OK
+
+
+def build_parser():
+    """명령행 인자 parser"""
+    parser = argparse.ArgumentParser(description="특허 문서 BM25F 검색 엔진 (인자 없이 실행하면 대화형 모드)")
+    parser.add_argument("--index-dir", default=INDEX_DIR, help=f"인덱스 디렉토리 (기본값: {INDEX_DIR})")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    index_parser = subparsers.add_parser("index", help="인덱스 구축")
+    index_parser.add_argument("--data-dir", default=DATA_DIR, help="특허 JSON 데이터 디렉토리 (환경 변수 DATA_DIR로도 지정)")
+    index_parser.add_argument("--layout", choices=Indexer.POSTINGS_LAYOUTS, default=POSTINGS_LAYOUT, help="postings layout")
+    index_parser.add_argument("--impact-bits", type=int, choices=[8, 16], default=IMPACT_BITS, help="impact 인덱스 비트 수")
+    index_parser.add_argument("--impact-order", choices=["doc", "impact"], default=IMPACT_ORDER, help="impact 포스팅 정렬 순서")
+    index_parser.add_argument("--workers", type=int, default=IO_WORKERS, help="문서 읽기/파싱 스레드 수")
+    index_parser.add_argument("--scan-workers", type=int, default=16, help="디렉토리 탐색 스레드 수")
+    index_parser.add_argument("--memory-budget", type=float, default=MEMORY_BUDGET and MEMORY_BUDGET / (1024 * 1024),
+                              help="포스팅 버퍼 메모리 예산 (MB, 넘으면 임시 run 파일 사용)")
+    index_parser.add_argument("--json-backend", choices=["orjson", "selective", "json"], default=JSON_BACKEND, help="JSON 파서")
+    index_parser.add_argument("--versioned", action="store_true", default=VERSIONED_INDEX, help="버전별 인덱스 디렉토리에 저장")
+    index_parser.add_argument("--checkpoint-interval", type=int, default=CHECKPOINT_INTERVAL,
+                              help="파일 N개마다 checkpoint 저장 (기본값: 저장하지 않음)")
+    index_parser.add_argument("--resume", action="store_true", help="중단된 인덱싱을 마지막 checkpoint부터 이어서 진행")
+    index_parser.add_argument("--reuse-manifest", action="store_true", default=REUSE_MANIFEST, help="저장된 파일 목록 재사용")
+    index_parser.add_argument("--no-ngrams", action="store_true", help="문자 bigram 보조 인덱스 생성 안 함")
+    index_parser.add_argument("--no-filters", action="store_true", help="메타데이터 필터 생성 안 함")
+    index_parser.set_defaults(handler=run_index)
+    
+    def add_query_arguments(sub):
+        sub.add_argument("query", nargs="?", help="검색어 (생략하거나 '-'이면 --query-file 또는 표준 입력)")
+        sub.add_argument("--query-file", help="검색어 파일 (한 줄에 하나)")
+        sub.add_argument("--limit", type=int, default=Searcher.DISPLAY_TOP_K, help="쿼리당 결과 수")
+        sub.add_argument("--tiers", type=parse_tiers, default=TIER_FIELDS,
+                         help="메모리에 올릴 필드 (예: T,A, tiered 평가)")
+    
+    search_parser = subparsers.add_parser("search", help="검색")
+    add_query_arguments(search_parser)
+    search_parser.add_argument("--offset", type=int, default=0, help="건너뛸 결과 수")
+    search_parser.add_argument("--snippets", action="store_true", help="snippet 포함 ([VERBOSE]와 같음)")
+    search_parser.add_argument("--format", choices=["text", "json"], default="text", help="출력 형식")
+    search_parser.add_argument("--timings", action="store_true", help="시작 시간 내역과 첫 쿼리 시간을 stderr에 출력")
+    search_parser.set_defaults(handler=run_search)
+    
+    bench_parser = subparsers.add_parser("bench", help="검색 지연 시간 / 처리량 측정")
+    add_query_arguments(bench_parser)
+    bench_parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    bench_parser.add_argument("--warmup-runs", type=int, default=1, help="측정 전 실행 횟수")
+    bench_parser.set_defaults(handler=run_bench)
+    
+    stats_parser = subparsers.add_parser("stats", help="인덱스 통계 (디스크 사용량, 길이 / df 분포, 상위 term)")
+    stats_parser.add_argument("--top", type=int, default=20, help="출력할 상위 term 수")
+    stats_parser.add_argument("--high-df", type=float, default=0.3, help="불용어 후보로 표시할 df / 문서 수 비율")
+    stats_parser.add_argument("--format", choices=["text", "json"], default="text", help="출력 형식")
+    stats_parser.set_defaults(handler=run_stats)
+    return parser
+
+
+def interactive():
+    """인자 없이 실행한 경우의 대화형 모드"""
+    task = input("작업을 선택하세요 (index/search/prune/reorder/export/tune/stats): ").strip().lower()
     
     if task in ("index", "i"):
         indexer = Indexer(DATA_DIR, INDEX_DIR, DOC_TABLE_FILE, 
-                         TERM_DICT_FILE, POSTINGS_FILE)
+                         TERM_DICT_FILE, POSTINGS_FILE,
+                         postings_layout=POSTINGS_LAYOUT,
+                         impact_bits=IMPACT_BITS, impact_order=IMPACT_ORDER,
+                         manifest_file=MANIFEST_FILE, reuse_manifest=REUSE_MANIFEST,
+                         json_backend=JSON_BACKEND, io_workers=IO_WORKERS,
+                         ngram_fields=NGRAM_FIELDS, metadata_filters=METADATA_FILTERS,
+                         versioned=VERSIONED_INDEX, memory_budget=MEMORY_BUDGET,
+                         checkpoint_interval=CHECKPOINT_INTERVAL)
         indexer.build_index()
     
     elif task in ("search", "s"):
         searcher = Searcher(INDEX_DIR, DOC_TABLE_FILE, TERM_DICT_FILE, 
-                           POSTINGS_FILE)
+                           POSTINGS_FILE, auto_reload=AUTO_RELOAD,
+                           access_log=ACCESS_LOG_FILE, warmup_terms=WARMUP_TERMS,
+                           warmup_budget=WARMUP_BUDGET, warmup_mode=WARMUP_MODE,
+                           tier_fields=TIER_FIELDS, ngram_untagged_words=NGRAM_UNTAGGED_WORDS)
         while True:
             input_query = input("검색어를 입력하세요: ").strip()
             if not input_query:
                 break
-            searcher.process_query(input_query)
\ No newline at end of file
+            searcher.process_query(input_query)
+        searcher.close()
+    
+    elif task in ("prune", "p"):
+        # 오프라인 도구는 필요할 때만 import (matrix / evaluation은 numpy / scipy import 비용이 큼)
+        from src.pruning import IndexPruner
+        pruner = IndexPruner(INDEX_DIR, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                             PRUNED_INDEX_DIR, method=PRUNE_METHOD, keep_ratio=PRUNE_KEEP_RATIO)
+        pruner.prune()
+    
+    elif task in ("reorder", "r"):
+        from src.reorder import DocReorderer
+        reorderer = DocReorderer(INDEX_DIR, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                 REORDERED_INDEX_DIR, method=REORDER_METHOD)
+        reorderer.reorder()
+    
+    elif task in ("export", "e"):
+        from src.matrix import MatrixExporter
+        exporter = MatrixExporter(INDEX_DIR, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE)
+        exporter.export()
+    
+    elif task in ("tune", "t"):
+        from src.evaluation import ParameterSweep
+        sweep = ParameterSweep(INDEX_DIR, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, JUDGMENTS_FILE)
+        results = sweep.grid_search(SWEEP_GRID, SWEEP_METRIC)
+        sweep.report(results, SWEEP_METRIC)
+    
+    elif task == "stats":
+        from src.index_stats import IndexStats
+        IndexStats(INDEX_DIR, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE).print_report()
+
+
+def main(argv=None):
+    """명령행 인자가 없으면 대화형 모드, 있으면 subcommand 실행 후 종료 코드 반환"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive()
+        return EXIT_OK
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return EXIT_USAGE
+    
+    start = time.perf_counter()
+    exit_code = args.handler(args)
+    print(f"경과 시간: {time.perf_counter() - start:.2f}초", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import os
+import json
+from array import array
+
+
+class IndexCheckpoint:
+    """인덱싱 중간 상태를 output_dir에 주기적으로 저장하고 중단된 인덱싱을 이어서 진행
+    
+    output_dir/
+    ├── checkpoint.json           # 마지막 checkpoint (처리한 파일 수, 마지막 파일 경로, 필드 길이 합, 아래 파일들의 유효 길이)
+    ├── checkpoint_docs.jsonl     # doc_table 항목 (checkpoint마다 새 문서만 이어서 기록)
+    ├── checkpoint_terms.jsonl    # term id 순서의 term (checkpoint마다 새 term만 이어서 기록)
+    ├── checkpoint_state.jsonl    # checkpoint마다 한 줄: global df 변화량, 새 문서의 bigram / 필터 값
+    ├── checkpoint_tail_NNNN.bin  # run 파일 NNNN개 이후 버퍼에 쌓인 포스팅 (checkpoint마다 새 포스팅만 이어서 기록)
+    ├── postings_run_NNNN.tmp     # checkpoint 시점까지의 포스팅 run 파일 (메모리 예산으로 내보낸 것)
+    └── postings_run_NNNN.idx     # run 파일의 (field, term id) -> 위치
+    
+    모든 파일은 이전 checkpoint 이후에 바뀐 부분만 덧붙이므로 checkpoint 한 번의 I/O는 그동안 처리한 문서 양에 비례함.
+    checkpoint는 run 파일을 새로 만들지 않으므로 run 파일 수는 메모리 예산에 의해서만 늘어남.
+    checkpoint.json은 다른 파일을 모두 기록한 뒤 마지막에 원자적으로 교체하므로, 어느 시점에 중단되어도
+    checkpoint.json이 가리키는 상태는 온전함 (그 뒤에 덧붙은 jsonl 내용과 run 파일은 재개할 때 버림)
+    doc_id 순서대로 같은 파일들을 이어서 처리하므로 재개한 결과는 중단 없이 구축한 인덱스와 같음
+    """
+    
+    CHECKPOINT_FILE = "checkpoint.json"
+    DOCS_FILE = "checkpoint_docs.jsonl"
+    TERMS_FILE = "checkpoint_terms.jsonl"
+    STATE_FILE = "checkpoint_state.jsonl"
+    TAIL_FILE = "checkpoint_tail_{:04d}.bin"
+    RUN_INDEX_FILE = "postings_run_{:04d}.idx"
+    
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.checkpoint_path = os.path.join(output_dir, self.CHECKPOINT_FILE)
+        self.docs_path = os.path.join(output_dir, self.DOCS_FILE)
+        self.terms_path = os.path.join(output_dir, self.TERMS_FILE)
+        self.state_path = os.path.join(output_dir, self.STATE_FILE)
+        
+        # 마지막 checkpoint까지 기록한 범위
+        self.saved_docs = 0
+        self.saved_terms = 0
+        self.saved_runs = 0
+        self.saved_doc_freqs = array('i')  # 마지막 checkpoint 시점의 global df (변화량 계산용)
+        self.docs_bytes = 0
+        self.terms_bytes = 0
+        self.state_bytes = 0
+        self.tail_bytes = 0
+    
+    @classmethod
+    def exists(cls, output_dir):
+        """output_dir에 재개할 수 있는 checkpoint가 있는지 확인"""
+        return os.path.exists(os.path.join(output_dir, cls.CHECKPOINT_FILE))
+    
+    def append_lines(self, path, values, valid_bytes):
+        """jsonl 파일을 valid_bytes까지 남기고 values를 한 줄씩 덧붙인 뒤 새 길이 반환"""
+        with open(path, "ab") as f:
+            f.truncate(valid_bytes)
+            for value in values:
+                f.write(json.dumps(value, ensure_ascii=False).encode('utf8') + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+    
+    def append_bytes(self, path, data, valid_bytes):
+        """파일을 valid_bytes까지 남기고 data를 덧붙인 뒤 새 길이 반환"""
+        with open(path, "ab") as f:
+            f.truncate(valid_bytes)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+    
+    def tail_path(self, num_runs):
+        """run 파일이 num_runs개일 때 버퍼 포스팅을 기록하는 tail 파일 경로"""
+        return os.path.join(self.output_dir, self.TAIL_FILE.format(num_runs))
+    
+    @staticmethod
+    def read_lines(path, valid_bytes):
+        """jsonl 파일의 앞 valid_bytes 바이트를 값 리스트로 읽기"""
+        with open(path, "rb") as f:
+            return [json.loads(line) for line in f.read(valid_bytes).splitlines()]
+    
+    def save_run_index(self, run_number, locations):
+        """run 파일의 위치 정보를 [field 번호, term id, 시작 위치, 바이트 수] 배열로 저장"""
+        fields = {field: i for i, field in enumerate(sorted({field for field, _ in locations}))}
+        records = array('q')
+        for (field, term_id), (offset, nbytes) in locations.items():
+            records.extend((fields[field], term_id, offset, nbytes))
+        with open(os.path.join(self.output_dir, self.RUN_INDEX_FILE.format(run_number)), "wb") as f:
+            f.write(json.dumps(list(fields)).encode('utf8') + b"\n")
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def load_run_index(self, run_number):
+        """save_run_index로 저장한 위치 정보 {(field, term id): (시작 위치, 바이트 수)}"""
+        with open(os.path.join(self.output_dir, self.RUN_INDEX_FILE.format(run_number)), "rb") as f:
+            fields = json.loads(f.readline())
+            records = array('q')
+            records.frombytes(f.read())
+        return {(fields[records[i]], records[i + 1]): (records[i + 2], records[i + 3])
+                for i in range(0, len(records), 4)}
+    
+    def save(self, processed_files, last_path, postings_buffer, doc_table, totals,
+             ngram_buffer, filter_builder, settings):
+        """마지막 checkpoint 이후의 인덱싱 상태를 덧붙여 새 checkpoint 저장
+        
+        포스팅 버퍼는 비우지 않고 마지막 checkpoint 이후의 포스팅만 tail 파일에 덧붙임
+        (마지막 checkpoint 뒤에 run 파일이 생겼으면 버퍼에는 그 이후 포스팅만 있으므로 새 tail 파일에 기록)
+        """
+        num_runs = len(postings_buffer.runs)
+        for run_number in range(self.saved_runs, len(postings_buffer.runs)):
+            self.save_run_index(run_number, postings_buffer.runs[run_number][1])
+        
+        docs_bytes = self.append_lines(self.docs_path,
+                                       (doc_table[doc_id] for doc_id in range(self.saved_docs, processed_files)),
+                                       self.docs_bytes)
+        terms_bytes = self.append_lines(self.terms_path, postings_buffer.terms[self.saved_terms:],
+                                        self.terms_bytes)
+        
+        # global df는 바뀐 term의 [term id, 변화량]만 기록
+        doc_freqs = postings_buffer.doc_freqs
+        saved_doc_freqs = self.saved_doc_freqs
+        df_delta = []
+        for term_id, df in enumerate(doc_freqs):
+            change = df - (saved_doc_freqs[term_id] if term_id < len(saved_doc_freqs) else 0)
+            if change:
+                df_delta.extend((term_id, change))
+        state = {
+            "doc_freqs": df_delta,
+            "ngrams": ngram_buffer.checkpoint_delta(self.saved_docs) if ngram_buffer is not None else None,
+            "filters": filter_builder.checkpoint_delta(self.saved_docs) if filter_builder is not None else None
+        }
+        state_bytes = self.append_lines(self.state_path, [state], self.state_bytes)
+        tail_bytes = self.append_bytes(self.tail_path(num_runs),
+                                       postings_buffer.checkpoint_delta(self.saved_docs).tobytes(),
+                                       self.tail_bytes if num_runs == self.saved_runs else 0)
+        
+        checkpoint = {
+            "processed_files": processed_files,
+            "last_path": last_path,
+            "totals": list(totals),
+            "num_terms": len(postings_buffer.terms),
+            "num_runs": num_runs,
+            "docs_bytes": docs_bytes,
+            "terms_bytes": terms_bytes,
+            "state_bytes": state_bytes,
+            "tail_bytes": tail_bytes,
+            "settings": settings
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        
+        # 새 checkpoint가 기록된 뒤에 이전 run 파일 구간의 tail 파일 삭제
+        if num_runs != self.saved_runs and os.path.exists(self.tail_path(self.saved_runs)):
+            os.remove(self.tail_path(self.saved_runs))
+        
+        self.saved_docs = processed_files
+        self.saved_terms = len(postings_buffer.terms)
+        self.saved_runs = num_runs
+        self.saved_doc_freqs = array('i', doc_freqs)
+        self.docs_bytes = docs_bytes
+        self.terms_bytes = terms_bytes
+        self.state_bytes = state_bytes
+        self.tail_bytes = tail_bytes
+    
+    def load(self, postings_buffer, ngram_buffer, filter_builder, settings):
+        """checkpoint를 읽어 postings_buffer와 bigram / 필터 builder를 복원하고 나머지 상태를 dict로 반환
+        
+        반환: {"processed_files", "last_path", "doc_table", "totals"}
+        인덱싱 설정(layout, 데이터 디렉토리 등)이 checkpoint와 다르면 ValueError
+        """
+        with open(self.checkpoint_path, 'r', encoding='utf8') as f:
+            checkpoint = json.load(f)
+        if checkpoint["settings"] != settings:
+            changed = sorted(key for key in set(settings) | set(checkpoint["settings"])
+                             if settings.get(key) != checkpoint["settings"].get(key))
+            raise ValueError(f"checkpoint와 인덱싱 설정이 다릅니다: {', '.join(changed)}")
+        
+        # 마지막 checkpoint 뒤에 덧붙은 내용은 버림
+        self.saved_docs = checkpoint["processed_files"]
+        self.saved_terms = checkpoint["num_terms"]
+        self.saved_runs = checkpoint["num_runs"]
+        self.docs_bytes = checkpoint["docs_bytes"]
+        self.terms_bytes = checkpoint["terms_bytes"]
+        self.state_bytes = checkpoint["state_bytes"]
+        self.tail_bytes = checkpoint["tail_bytes"]
+        
+        doc_table = {entry["doc_id"]: entry for entry in self.read_lines(self.docs_path, self.docs_bytes)}
+        terms = self.read_lines(self.terms_path, self.terms_bytes)
+        
+        # checkpoint 순서대로 변화량을 다시 적용
+        doc_freqs = array('i', bytes(4 * len(terms)))
+        for state in self.read_lines(self.state_path, self.state_bytes):
+            df_delta = state["doc_freqs"]
+            for i in range(0, len(df_delta), 2):
+                doc_freqs[df_delta[i]] += df_delta[i + 1]
+            if ngram_buffer is not None:
+                ngram_buffer.apply_checkpoint_delta(state["ngrams"])
+            if filter_builder is not None:
+                filter_builder.apply_checkpoint_delta(state["filters"])
+        self.saved_doc_freqs = array('i', doc_freqs)
+        
+        runs = [(os.path.join(self.output_dir, postings_buffer.RUN_FILE.format(run_number)),
+                 self.load_run_index(run_number))
+                for run_number in range(self.saved_runs)]
+        postings_buffer.restore(terms, doc_freqs, runs)
+        if self.tail_bytes:
+            with open(self.tail_path(self.saved_runs), "rb") as f:
+                tail = array('i')
+                tail.frombytes(f.read(self.tail_bytes))
+            postings_buffer.apply_checkpoint_delta(tail)
+        
+        return {
+            "processed_files": checkpoint["processed_files"],
+            "last_path": checkpoint["last_path"],
+            "doc_table": doc_table,
+            "totals": checkpoint["totals"]
+        }
+    
+    def remove(self):
+        """인덱스 저장이 끝난 뒤 checkpoint 파일과 남은 run 파일 (마지막 checkpoint 이후 중단된 실행의 run) 삭제"""
+        for name in os.listdir(self.output_dir):
+            if name.startswith("checkpoint") or name.startswith("postings_run_"):
+                os.remove(os.path.join(self.output_dir, name))
@@ -0,0 +1,230 @@
+import math
+import json
+import time
+import random
+import itertools
+from array import array
+from .searcher import Searcher
+from .tokenizer import extract_terms
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ParameterSweep:
+    """relevance judgment가 있는 쿼리 집합으로 BM25F 파라미터(K1, FIELD_WEIGHTS, FIELD_B)를 grid / random search
+    
+    쿼리마다 형태소 분석, 후보 문서 계산, 포스팅 읽기는 처음 한 번만 하고
+    후보 문서별 필드 tf와 (문서 길이 / 평균 길이) 배열을 캐시해 두므로,
+    파라미터 조합 하나의 평가 비용은 캐시된 배열로 점수를 다시 계산하는 것뿐임 (numpy가 있으면 벡터 연산)
+    
+    judgments 파일 (JSON): [{"query": "[AND] 위성 서버", "relevant": {"doc_1.json": 2, "doc_7.json": 1}}, ...]
+    - relevant는 {파일명: 등급} 또는 파일명 리스트(등급 1)
+    - 쿼리 prefix 중 AND, FIELD, 메타데이터 필터를 반영 (PHRASE는 지원하지 않음)
+    """
+    
+    PARAMETERS = ("K1", "W_T", "W_A", "W_C", "B_T", "B_A", "B_C")
+    METRICS = ("map", "ndcg", "recall")
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file, judgments, k=10, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ValueError("numpy가 설치되어 있지 않습니다.")
+        self.use_numpy = use_numpy
+        self.k = k
+        self.searcher = Searcher(index_dir, doc_table_file, term_dict_file, postings_file,
+                                 use_impacts=False, use_ngrams=False)
+        if isinstance(judgments, str):
+            judgments = self.load_judgments(judgments)
+        self.judgments = judgments
+        
+        start = time.perf_counter()
+        self.cache = self.build_cache()
+        self.cache_time = time.perf_counter() - start
+        self.run_time = 0.0
+    
+    @staticmethod
+    def load_judgments(path):
+        """judgments JSON 파일 읽기"""
+        with open(path, 'r', encoding='utf8') as f:
+            return json.load(f)
+    
+    def default_params(self):
+        """Searcher에 설정된 현재 파라미터"""
+        searcher = self.searcher
+        params = {"K1": searcher.K1}
+        for field in ['T', 'A', 'C']:
+            params[f"W_{field}"] = searcher.FIELD_WEIGHTS[field]
+            params[f"B_{field}"] = searcher.FIELD_B[field]
+        return params
+    
+    def build_cache(self):
+        """쿼리별 후보 문서, 정답 등급, term별 idf와 필드 tf 배열, 필드별 길이 비율 배열"""
+        searcher = self.searcher
+        doc_ids_by_name = {doc_info["filename"]: int(doc_id) for doc_id, doc_info in searcher.doc_table.items()}
+        cache = []
+        
+        for judgment in self.judgments:
+            relevant = judgment["relevant"]
+            if isinstance(relevant, list):
+                relevant = {name: 1 for name in relevant}
+            grades = {doc_ids_by_name[name]: grade for name, grade in relevant.items()
+                      if name in doc_ids_by_name and grade > 0}
+            
+            parsed = searcher.parse_query(judgment["query"])
+            if parsed['invalid_prefixes'] or parsed['phrase_mode']:
+                raise ValueError(f"평가할 수 없는 쿼리입니다: {judgment['query']}")
+            query_terms = [term for term in extract_terms(parsed['query_text']) if term in searcher.term_dict]
+            fields = parsed['fields']
+            doc_filter = searcher.filter_index.evaluate(parsed['filters']) if parsed['filters'] else None
+            docs = sorted(searcher.get_candidate_docs(query_terms, fields, parsed['and_mode'], doc_filter))
+            
+            ratios = {}
+            for field in fields:
+                avgdl = searcher.avgdl[field]
+                # avgdl이 0이면 길이 정규화를 하지 않으므로 비율 1 (분모가 항상 1)
+                ratios[field] = array('d', [searcher.doc_table[str(doc_id)][f"len_{field}"] / avgdl if avgdl > 0 else 1.0
+                                            for doc_id in docs])
+            
+            terms = []
+            positions = {doc_id: i for i, doc_id in enumerate(docs)}
+            for term in query_terms:
+                idf = searcher.calculate_idf(searcher.term_dict[term]["df"])
+                field_tfs = {}
+                for field in fields:
+                    tfs = array('d', bytes(8 * len(docs)))
+                    for doc_id, tf in zip(*searcher.get_postings_arrays(term, field)):
+                        i = positions.get(doc_id)
+                        if i is not None:
+                            tfs[i] = tf
+                    field_tfs[field] = tfs
+                terms.append((idf, field_tfs))
+            searcher.clear_cache()
+            
+            if self.use_numpy:
+                ratios = {field: np.asarray(values) for field, values in ratios.items()}
+                terms = [(idf, {field: np.asarray(tfs) for field, tfs in field_tfs.items()}) for idf, field_tfs in terms]
+            cache.append({"docs": docs, "grades": grades, "ratios": ratios, "terms": terms})
+        
+        return cache
+    
+    def rescore(self, entry, params):
+        """캐시된 쿼리 하나의 후보 문서 점수 리스트 (docs 순서, calculate_bm25f_score와 같은 식)"""
+        k1 = params["K1"]
+        if self.use_numpy:
+            scores = np.zeros(len(entry["docs"]))
+            denominators = {field: (1 - params[f"B_{field}"]) + params[f"B_{field}"] * ratios
+                            for field, ratios in entry["ratios"].items()}
+            for idf, field_tfs in entry["terms"]:
+                tf_tilde = sum(params[f"W_{field}"] * (tfs / denominators[field]) for field, tfs in field_tfs.items())
+                scores += idf * ((k1 + 1) * tf_tilde) / (k1 + tf_tilde)
+            return scores.tolist()
+        
+        scores = [0.0] * len(entry["docs"])
+        denominators = {field: [(1 - params[f"B_{field}"]) + params[f"B_{field}"] * ratio for ratio in ratios]
+                        for field, ratios in entry["ratios"].items()}
+        for idf, field_tfs in entry["terms"]:
+            tf_tildes = [0.0] * len(scores)
+            for field, tfs in field_tfs.items():
+                weight = params[f"W_{field}"]
+                field_denominators = denominators[field]
+                for i, tf in enumerate(tfs):
+                    if tf > 0:
+                        tf_tildes[i] += weight * (tf / field_denominators[i])
+            for i, tf_tilde in enumerate(tf_tildes):
+                if tf_tilde > 0:
+                    scores[i] += idf * ((k1 + 1) * tf_tilde) / (k1 + tf_tilde)
+        return scores
+    
+    def query_metrics(self, entry, ranking):
+        """한 쿼리의 (AP, nDCG@k, recall@k)"""
+        grades = entry["grades"]
+        if not grades:
+            return 0.0, 0.0, 0.0
+        
+        hits = 0
+        precision_sum = 0.0
+        for rank, doc_id in enumerate(ranking, 1):
+            if doc_id in grades:
+                hits += 1
+                precision_sum += hits / rank
+        average_precision = precision_sum / len(grades)
+        
+        dcg = sum((2 ** grades.get(doc_id, 0) - 1) / math.log2(rank + 1)
+                  for rank, doc_id in enumerate(ranking[:self.k], 1))
+        ideal = sorted(grades.values(), reverse=True)[:self.k]
+        idcg = sum((2 ** grade - 1) / math.log2(rank + 1) for rank, grade in enumerate(ideal, 1))
+        
+        recall = sum(1 for doc_id in ranking[:self.k] if doc_id in grades) / len(grades)
+        return average_precision, dcg / idcg, recall
+    
+    def evaluate(self, params=None):
+        """파라미터 조합의 평균 지표 {"map", "ndcg@k", "recall@k"} (지정하지 않은 파라미터는 현재 값)"""
+        full_params = self.default_params()
+        full_params.update(params or {})
+        
+        totals = [0.0, 0.0, 0.0]
+        for entry in self.cache:
+            scores = self.rescore(entry, full_params)
+            ranked = sorted((item for item in zip(entry["docs"], scores) if item[1] > 0),
+                            key=lambda item: (-item[1], item[0]))
+            for i, value in enumerate(self.query_metrics(entry, [doc_id for doc_id, _ in ranked])):
+                totals[i] += value
+        
+        count = max(1, len(self.cache))
+        return {
+            "map": totals[0] / count,
+            f"ndcg@{self.k}": totals[1] / count,
+            f"recall@{self.k}": totals[2] / count
+        }
+    
+    def metric_key(self, metric):
+        """정렬 기준 지표 이름 -> evaluate() 결과의 키"""
+        if metric not in self.METRICS:
+            raise ValueError(f"지원하지 않는 지표: {metric}")
+        return "map" if metric == "map" else f"{metric}@{self.k}"
+    
+    def check_params(self, names):
+        """탐색할 파라미터 이름 확인"""
+        for name in names:
+            if name not in self.PARAMETERS:
+                raise ValueError(f"지원하지 않는 파라미터: {name} ({', '.join(self.PARAMETERS)})")
+    
+    def run(self, candidates, metric):
+        """파라미터 조합들을 평가하여 metric 내림차순 [(params, 지표), ...] 반환"""
+        key = self.metric_key(metric)
+        start = time.perf_counter()
+        results = [(params, self.evaluate(params)) for params in candidates]
+        self.run_time = time.perf_counter() - start
+        results.sort(key=lambda result: -result[1][key])
+        return results
+    
+    def grid_search(self, grid, metric="map"):
+        """grid = {파라미터 이름: 값 리스트}의 모든 조합 평가"""
+        self.check_params(grid)
+        names = list(grid)
+        candidates = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+        return self.run(candidates, metric)
+    
+    def random_search(self, ranges, trials=50, metric="map", seed=0):
+        """ranges = {파라미터 이름: (최솟값, 최댓값)}에서 균등 분포로 trials개 조합 평가"""
+        self.check_params(ranges)
+        rng = random.Random(seed)
+        candidates = [{name: round(rng.uniform(low, high), 4) for name, (low, high) in ranges.items()}
+                      for _ in range(trials)]
+        return self.run(candidates, metric)
+    
+    def report(self, results, metric="map", top=5):
+        """현재 파라미터 대비 상위 top개 결과 출력"""
+        key = self.metric_key(metric)
+        baseline = self.evaluate()
+        print(f"파라미터 탐색 결과 (쿼리 {len(self.cache)}개, {len(results)}개 조합, 기준: {key})")
+        print(f"  - 캐시 구축: {self.cache_time:.2f}초, 조합당 평가: {self.run_time / max(1, len(results)) * 1000:.1f} ms")
+        print(f"  - 현재 파라미터: " + ', '.join(f"{name}={value:.4f}" for name, value in baseline.items()))
+        for params, metrics in results[:top]:
+            params_str = ', '.join(f"{name}={value}" for name, value in params.items())
+            metrics_str = ', '.join(f"{name}={value:.4f}" for name, value in metrics.items())
+            print(f"  - {params_str}: {metrics_str}")
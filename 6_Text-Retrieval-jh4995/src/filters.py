@@ -0,0 +1,355 @@
+import os
+import re
+import json
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from .lexicon import Lexicon
+
+
+class Bitmap:
+    """roaring 방식 doc_id 집합: doc_id 상위 16비트별 container
+    
+    - 원소가 ARRAY_LIMIT개 이하인 container는 하위 16비트의 정렬된 array('H') (원소당 2바이트)
+    - 그보다 많으면 65536비트 bitset (Python int, 8KB)
+    집합 연산은 container 단위로 처리하고 bitset끼리는 정수 &, | 연산 한 번으로 계산됨
+    """
+    
+    ARRAY_LIMIT = 4096
+    BITSET_BYTES = 1 << 13
+    
+    def __init__(self, containers=None):
+        self.containers = containers if containers is not None else {}  # 상위 16비트 -> array('H') 또는 int
+    
+    @classmethod
+    def from_sorted(cls, doc_ids):
+        """doc_id 오름차순 iterable로 생성"""
+        groups = {}
+        for doc_id in doc_ids:
+            key = doc_id >> 16
+            low = groups.get(key)
+            if low is None:
+                low = groups[key] = array('H')
+            low.append(doc_id & 0xFFFF)
+        return cls({key: cls.optimize(low) for key, low in groups.items()})
+    
+    @classmethod
+    def optimize(cls, low):
+        """원소 수에 맞는 container 형태로 변환 (비어 있으면 None)"""
+        if isinstance(low, int):
+            count = bin(low).count('1')
+            if count > cls.ARRAY_LIMIT:
+                return low
+            low = array('H', cls.iter_bits(low))
+        if not low:
+            return None
+        if len(low) <= cls.ARRAY_LIMIT:
+            return low
+        bits = 0
+        for value in low:
+            bits |= 1 << value
+        return bits
+    
+    @staticmethod
+    def iter_bits(bits):
+        """bitset의 1인 비트 위치를 오름차순으로 (가장 낮은 비트를 하나씩 제거)"""
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+    
+    @staticmethod
+    def to_bits(container):
+        """container를 bitset(int)으로 변환"""
+        if isinstance(container, int):
+            return container
+        bits = 0
+        for value in container:
+            bits |= 1 << value
+        return bits
+    
+    def __contains__(self, doc_id):
+        container = self.containers.get(doc_id >> 16)
+        if container is None:
+            return False
+        low = doc_id & 0xFFFF
+        if isinstance(container, int):
+            return (container >> low) & 1 == 1
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+    
+    def __and__(self, other):
+        containers = {}
+        for key in self.containers.keys() & other.containers.keys():
+            a = self.containers[key]
+            b = other.containers[key]
+            if isinstance(a, int) and isinstance(b, int):
+                merged = a & b
+            elif isinstance(a, int):
+                merged = array('H', (v for v in b if (a >> v) & 1))
+            elif isinstance(b, int):
+                merged = array('H', (v for v in a if (b >> v) & 1))
+            else:
+                merged = array('H', sorted(set(a).intersection(b)))
+            merged = self.optimize(merged)
+            if merged is not None:
+                containers[key] = merged
+        return Bitmap(containers)
+    
+    def __or__(self, other):
+        containers = dict(self.containers)
+        for key, b in other.containers.items():
+            a = containers.get(key)
+            if a is None:
+                containers[key] = b
+            elif isinstance(a, int) or isinstance(b, int):
+                containers[key] = self.optimize(self.to_bits(a) | self.to_bits(b))
+            else:
+                containers[key] = self.optimize(array('H', sorted(set(a).union(b))))
+        return Bitmap(containers)
+    
+    def __len__(self):
+        return sum(bin(c).count('1') if isinstance(c, int) else len(c) for c in self.containers.values())
+    
+    def __iter__(self):
+        """doc_id 오름차순 순회"""
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            base = key << 16
+            lows = self.iter_bits(container) if isinstance(container, int) else container
+            for low in lows:
+                yield base + low
+    
+    def to_bytes(self):
+        """직렬화: container 수, 이후 container마다 (상위 16비트, 종류, 원소 수) + 데이터"""
+        parts = [struct.pack("<I", len(self.containers))]
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            if isinstance(container, int):
+                parts.append(struct.pack("<HBI", key, 1, bin(container).count('1')))
+                parts.append(container.to_bytes(self.BITSET_BYTES, 'little'))
+            else:
+                parts.append(struct.pack("<HBI", key, 0, len(container)))
+                parts.append(container.tobytes())
+        return b''.join(parts)
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """to_bytes() 결과로 복원"""
+        containers = {}
+        (num_containers,) = struct.unpack_from("<I", data, 0)
+        offset = 4
+        for _ in range(num_containers):
+            key, kind, count = struct.unpack_from("<HBI", data, offset)
+            offset += struct.calcsize("<HBI")
+            if kind == 1:
+                containers[key] = int.from_bytes(data[offset:offset + cls.BITSET_BYTES], 'little')
+                offset += cls.BITSET_BYTES
+            else:
+                low = array('H')
+                low.frombytes(data[offset:offset + 2 * count])
+                containers[key] = low
+                offset += 2 * count
+        return cls(containers)
+
+
+class FilterBuilder:
+    """인덱싱 중 문서 메타데이터를 모아 필터 인덱스(filters.json / filters.bin) 생성
+    
+    filters: {필터 이름: (dataset 키, 종류)}
+    - "category": 값별 doc_id Bitmap (리스트이거나 ',' / ';'로 구분된 값은 각각 등록, 대문자로 정규화)
+    - "number": 정수 값 column
+    - "year": 날짜 문자열(예: "20170315")의 앞 네 자리 연도 column
+    """
+    
+    KINDS = ("category", "number", "year")
+    
+    def __init__(self, filters):
+        for name, (key, kind) in filters.items():
+            if kind not in self.KINDS:
+                raise ValueError(f"지원하지 않는 필터 종류: {name} ({kind})")
+        self.filters = {name.upper(): (key, kind) for name, (key, kind) in filters.items()}
+        self.categories = {name: {} for name, (key, kind) in self.filters.items() if kind == "category"}
+        self.columns = {name: [] for name, (key, kind) in self.filters.items() if kind != "category"}
+    
+    @property
+    def source_keys(self):
+        """FieldReader가 dataset에서 읽어야 하는 키 (필터 순서)"""
+        return [key for key, kind in self.filters.values()]
+    
+    @staticmethod
+    def category_values(raw):
+        """category 원본 값 -> 정규화된 값 집합"""
+        if isinstance(raw, list):
+            values = [str(v) for v in raw]
+        else:
+            values = re.split(r'[,;]', str(raw)) if raw not in (None, '') else []
+        return {v.strip().upper() for v in values if v.strip()}
+    
+    @staticmethod
+    def numeric_value(raw, kind):
+        """number / year 원본 값 -> 정수 (숫자가 없으면 None)"""
+        match = re.search(r'-?\d+', str(raw)) if raw not in (None, '') else None
+        if match is None:
+            return None
+        digits = match.group()
+        return int(digits[:4]) if kind == "year" else int(digits)
+    
+    def add_document(self, doc_id, raw_values):
+        """한 문서의 메타데이터 원본 값 리스트(source_keys 순서)를 추가 (doc_id는 증가 순서로 호출)"""
+        for (name, (key, kind)), raw in zip(self.filters.items(), raw_values):
+            if kind == "category":
+                for value in self.category_values(raw):
+                    self.categories[name].setdefault(value, array('i')).append(doc_id)
+            else:
+                value = self.numeric_value(raw, kind)
+                if value is not None:
+                    self.columns[name].append((value, doc_id))
+    
+    def checkpoint_delta(self, since_doc_id):
+        """doc_id since_doc_id 이후에 추가된 값 {"categories": {name: {value: [doc_id, ...]}}, "columns": {name: [[value, doc_id], ...]}}"""
+        categories = {}
+        for name, values in self.categories.items():
+            categories[name] = {value: buf[bisect_left(buf, since_doc_id):].tolist()
+                                for value, buf in values.items() if buf[-1] >= since_doc_id}
+        columns = {}
+        for name, column in self.columns.items():
+            # column은 doc_id 증가 순서로 추가되므로 뒤에서부터 since_doc_id 이전 값이 나올 때까지만 확인
+            start = len(column)
+            while start > 0 and column[start - 1][1] >= since_doc_id:
+                start -= 1
+            columns[name] = [list(item) for item in column[start:]]
+        return {"categories": categories, "columns": columns}
+    
+    def apply_checkpoint_delta(self, delta):
+        """checkpoint_delta()로 기록한 값을 다시 추가 (checkpoint 순서대로 호출)"""
+        for name, values in delta["categories"].items():
+            for value, doc_ids in values.items():
+                self.categories[name].setdefault(value, array('i')).extend(doc_ids)
+        for name, items in delta["columns"].items():
+            self.columns[name].extend((value, doc_id) for value, doc_id in items)
+    
+    def save(self, index_dir):
+        """filters.bin (Bitmap / column 바이트)과 filters.json (필터별 위치) 저장"""
+        output = {"metadata": {}, "filters": {}}
+        offset = 0
+        
+        with open(os.path.join(index_dir, FilterIndex.POSTINGS_FILE), "wb") as f:
+            for name, (key, kind) in self.filters.items():
+                output["metadata"][name] = {"key": key, "kind": kind}
+                if kind == "category":
+                    values = {}
+                    for value in sorted(self.categories[name]):
+                        data = Bitmap.from_sorted(self.categories[name][value]).to_bytes()
+                        f.write(data)
+                        values[value] = [offset, len(data)]
+                        offset += len(data)
+                    output["filters"][name] = values
+                else:
+                    # 값 오름차순 (값, doc_id) column: 범위 조건은 이진 탐색 두 번으로 구간 계산
+                    column = sorted(self.columns[name])
+                    values_data = array('i', [value for value, _ in column]).tobytes()
+                    doc_ids_data = array('i', [doc_id for _, doc_id in column]).tobytes()
+                    f.write(values_data)
+                    f.write(doc_ids_data)
+                    output["filters"][name] = {"start": offset, "length": len(column)}
+                    offset += len(values_data) + len(doc_ids_data)
+        
+        with open(os.path.join(index_dir, FilterIndex.DICT_FILE), 'w', encoding='utf8') as f:
+            json.dump(output, f, ensure_ascii=False)
+
+
+class FilterIndex:
+    """검색 시 [CLASS=H04W], [YEAR>=2015] 같은 필터 prefix를 doc_id Bitmap으로 변환
+    
+    category 필터의 '=' 조건은 값의 prefix 매칭 (예: [CLASS=H04]는 H04로 시작하는 모든 분류)
+    """
+    
+    DICT_FILE = "filters.json"
+    POSTINGS_FILE = "filters.bin"
+    PREFIX_PATTERN = re.compile(r'^([A-Z_]+)\s*(>=|<=|=|>|<)\s*(.+)$')
+    
+    def __init__(self, index_dir):
+        with open(os.path.join(index_dir, self.DICT_FILE), 'r', encoding='utf8') as f:
+            data = json.load(f)
+        self.metadata = data["metadata"]
+        self.filters = data["filters"]
+        # category 필터별 정렬된 값 목록 (prefix 구간 탐색용)
+        self.lexicons = {name: Lexicon(sorted(self.filters[name]))
+                         for name, info in self.metadata.items() if info["kind"] == "category"}
+        self.fp = open(os.path.join(index_dir, self.POSTINGS_FILE), "rb")
+    
+    @classmethod
+    def exists(cls, index_dir):
+        """index_dir에 필터 인덱스가 있는지 확인"""
+        return os.path.exists(os.path.join(index_dir, cls.DICT_FILE))
+    
+    def parse(self, prefix):
+        """대문자 prefix 문자열을 (필터 이름, 연산자, 값)으로 변환 (필터가 아니거나 형식이 틀리면 None)"""
+        match = self.PREFIX_PATTERN.match(prefix)
+        if match is None:
+            return None
+        name, op, value = match.group(1), match.group(2), match.group(3).strip()
+        info = self.metadata.get(name)
+        if info is None:
+            return None
+        if info["kind"] == "category":
+            if op != '=':
+                return None
+        else:
+            if not re.fullmatch(r'-?\d+', value):
+                return None
+            value = int(value)
+        return name, op, value
+    
+    def read(self, offset, length):
+        """filters.bin에서 length 바이트 읽기"""
+        self.fp.seek(offset)
+        data = self.fp.read(length)
+        if len(data) != length:
+            raise ValueError(f"Incomplete data read at offset {offset}")
+        return data
+    
+    def category_bitmap(self, name, prefix):
+        """prefix로 시작하는 모든 값의 Bitmap 합집합"""
+        lexicon = self.lexicons[name]
+        lo, hi = lexicon.prefix_range(prefix)
+        result = Bitmap()
+        for value in lexicon.terms[lo:hi]:
+            offset, length = self.filters[name][value]
+            result = result | Bitmap.from_bytes(self.read(offset, length))
+        return result
+    
+    def numeric_bitmap(self, name, op, value):
+        """정렬된 column에서 조건을 만족하는 구간의 doc_id들을 Bitmap으로 변환"""
+        entry = self.filters[name]
+        length = entry["length"]
+        values = array('i')
+        values.frombytes(self.read(entry["start"], 4 * length))
+        
+        lo, hi = 0, length
+        if op in ('>=', '='):
+            lo = bisect_left(values, value)
+        elif op == '>':
+            lo = bisect_right(values, value)
+        if op in ('<=', '='):
+            hi = bisect_right(values, value)
+        elif op == '<':
+            hi = bisect_left(values, value)
+        if lo >= hi:
+            return Bitmap()
+        
+        doc_ids = array('i')
+        doc_ids.frombytes(self.read(entry["start"] + 4 * length + 4 * lo, 4 * (hi - lo)))
+        return Bitmap.from_sorted(sorted(doc_ids))
+    
+    def evaluate(self, specs):
+        """필터 조건들을 모두 만족하는 문서 Bitmap (조건들의 교집합)"""
+        result = None
+        for name, op, value in specs:
+            if self.metadata[name]["kind"] == "category":
+                bitmap = self.category_bitmap(name, value)
+            else:
+                bitmap = self.numeric_bitmap(name, op, value)
+            result = bitmap if result is None else result & bitmap
+        return result
@@ -0,0 +1,165 @@
+import os
+import json
+import struct
+import random
+from array import array
+from .searcher import Searcher
+
+
+class ImpactBuilder:
+    """인덱스 구축 후 포스팅마다 BM25F 기여도를 미리 계산하여 정수(impact)로 양자화 저장"""
+    
+    # impact는 필드 제한이 없는 기본 쿼리(T, A, C 전체) 기준으로 계산
+    FIELDS = ['T', 'A', 'C']
+    
+    # 포스팅 정렬 순서
+    # - "doc": term별 (doc_id, impact)를 doc_id 오름차순으로 저장
+    # - "impact": impact 내림차순 segment로 묶어 doc_id만 저장 (score-at-a-time / anytime 검색용)
+    ORDERS = ("doc", "impact")
+    
+    # 1차 스캔에서 계산한 기여도를 2차 스캔까지 보관하는 임시 파일 (term별 doc_id int32 배열 + score float64 배열)
+    SCORES_FILE = "impact_scores.tmp"
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file, bits=8, order="doc"):
+        if bits not in Searcher.IMPACT_FORMATS:
+            raise ValueError(f"지원하지 않는 impact 비트 수: {bits} (8 또는 16)")
+        if order not in self.ORDERS:
+            raise ValueError(f"지원하지 않는 impact 정렬 순서: {order}")
+        self.bits = bits
+        self.order = order
+        self.max_level = (1 << bits) - 1
+        self.index_dir = os.path.abspath(index_dir)
+        self.impact_dict_file = os.path.join(self.index_dir, Searcher.IMPACT_DICT_FILE)
+        self.impact_postings_file = os.path.join(self.index_dir, Searcher.IMPACT_POSTINGS_FILE)
+        self.scores_file = os.path.join(self.index_dir, self.SCORES_FILE)
+        
+        # K1, FIELD_WEIGHTS, FIELD_B 및 길이 정규화는 Searcher와 동일한 코드로 계산
+        self.searcher = Searcher(index_dir, doc_table_file, term_dict_file, postings_file,
+                                 use_impacts=False, preload_tagger=False)
+    
+    def exact_term_contributions(self, term):
+        """term의 포스팅별 정확한 BM25F 기여도 {doc_id: score} 계산"""
+        contributions = self.searcher.term_contributions(term, self.FIELDS)
+        self.searcher.clear_cache()
+        return contributions
+    
+    def quantize(self, score, scale):
+        """기여도를 1 ~ max_level 정수로 양자화 (0보다 큰 기여도는 최소 1)"""
+        return max(1, min(self.max_level, round(score / scale)))
+    
+    def build(self, sample_queries=200, top_k=10):
+        """impacts.bin, impact_dict.json 생성 후 양자화에 따른 랭킹 품질 손실 보고"""
+        terms = sorted(self.searcher.term_dict)
+        
+        # 1차 스캔: 기여도를 임시 파일에 기록하면서 전역 최대 기여도로 양자화 scale 결정
+        # (모든 term이 같은 scale을 공유해야 정수 합산 가능, 2차 스캔은 기여도를 다시 계산하지 않고 임시 파일을 읽음)
+        max_score = 0.0
+        counts = []
+        with open(self.scores_file, "wb") as sbin:
+            for term in terms:
+                contributions = self.exact_term_contributions(term)
+                if contributions:
+                    max_score = max(max_score, max(contributions.values()))
+                array('i', contributions.keys()).tofile(sbin)
+                array('d', contributions.values()).tofile(sbin)
+                counts.append(len(contributions))
+        scale = max_score / self.max_level if max_score > 0 else 1.0
+        
+        # 2차 스캔: 양자화된 impact 포스팅 저장 및 포스팅 단위 오차 측정
+        fmt = Searcher.IMPACT_FORMATS[self.bits]
+        record_size = struct.calcsize(fmt) if self.order == "doc" else 4
+        term_entries = {}
+        offset = 0
+        num_postings = 0
+        total_error = 0.0
+        max_error = 0.0
+        
+        with open(self.scores_file, "rb") as sbin, open(self.impact_postings_file, "wb") as ibin:
+            for term, count in zip(terms, counts):
+                doc_ids = array('i')
+                doc_ids.fromfile(sbin, count)
+                scores = array('d')
+                scores.fromfile(sbin, count)
+                levels = {}
+                for doc_id, score in zip(doc_ids, scores):
+                    level = self.quantize(score, scale)
+                    levels[doc_id] = level
+                    error = abs(level * scale - score)
+                    total_error += error
+                    max_error = max(max_error, error)
+                
+                entry = {"start": offset, "length": count}
+                if self.order == "doc":
+                    buf = b''.join(struct.pack(fmt, doc_id, level) for doc_id, level in levels.items())
+                else:
+                    # impact가 같은 포스팅끼리 segment로 묶고 impact 내림차순으로 기록
+                    segments = {}
+                    for doc_id, level in levels.items():
+                        segments.setdefault(level, []).append(doc_id)
+                    buf = bytearray()
+                    entry["segments"] = []
+                    for level in sorted(segments, reverse=True):
+                        segment = segments[level]
+                        buf += struct.pack(f"<{len(segment)}i", *segment)
+                        entry["segments"].append([level, len(segment)])
+                ibin.write(buf)
+                term_entries[term] = entry
+                offset += len(buf)
+                num_postings += count
+        os.remove(self.scores_file)
+        
+        output = {
+            "metadata": {
+                "bits": self.bits,
+                "scale": scale,
+                "record_size": record_size,
+                "order": self.order,
+                "fields": ''.join(self.FIELDS)
+            },
+            "terms": term_entries
+        }
+        with open(self.impact_dict_file, 'w', encoding='utf8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=4)
+        
+        overlap = self.evaluate_ranking_loss(terms, scale, sample_queries, top_k)
+        
+        print(f"impact 인덱스 생성 완료 ({self.bits}-bit, {self.order} order, scale={scale:.6f})")
+        print(f"  - 포스팅 수: {num_postings:,}개")
+        if num_postings > 0:
+            print(f"  - 포스팅 양자화 오차: 평균 {total_error / num_postings:.6f}, 최대 {max_error:.6f}")
+        if overlap is not None:
+            print(f"  - 샘플 쿼리 {sample_queries}개 top-{top_k} 일치율 (exact 대비): {overlap:.2%}")
+        print(f"  - {self.impact_dict_file}")
+        print(f"  - {self.impact_postings_file}")
+        
+        return overlap
+    
+    def evaluate_ranking_loss(self, terms, scale, sample_queries, top_k):
+        """임의의 2~3 term 쿼리들에 대해 exact 점수와 양자화 점수의 top-k 일치율 평균 계산
+        
+        샘플 쿼리는 IndexPruner.evaluate와 같이 df에 비례하여 뽑음 (실제 쿼리처럼 흔한 term이 자주 포함되도록)
+        """
+        if not terms or sample_queries <= 0:
+            return None
+        weights = [self.searcher.term_dict[term]["df"] for term in terms]
+        
+        rng = random.Random(0)
+        overlaps = []
+        for _ in range(sample_queries):
+            query_terms = list(dict.fromkeys(rng.choices(terms, weights, k=rng.randint(2, 3))))
+            
+            exact_scores = {}
+            quantized_scores = {}
+            for term in query_terms:
+                for doc_id, score in self.exact_term_contributions(term).items():
+                    exact_scores[doc_id] = exact_scores.get(doc_id, 0.0) + score
+                    quantized_scores[doc_id] = quantized_scores.get(doc_id, 0) + self.quantize(score, scale)
+            
+            if not exact_scores:
+                continue
+            
+            exact_top = sorted(exact_scores, key=lambda d: (-exact_scores[d], d))[:top_k]
+            quantized_top = sorted(quantized_scores, key=lambda d: (-quantized_scores[d], d))[:top_k]
+            overlaps.append(len(set(exact_top) & set(quantized_top)) / len(exact_top))
+        
+        return sum(overlaps) / len(overlaps) if overlaps else None
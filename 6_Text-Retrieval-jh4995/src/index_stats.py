@@ -0,0 +1,379 @@
+import os
+import json
+import heapq
+from array import array
+from collections import Counter
+from .lexicon import Lexicon
+from .ngram import NgramIndex
+from .filters import FilterIndex
+from .reorder import DocReorderer
+from .searcher import Searcher
+from .versions import IndexVersions
+
+
+class JsonObjectReader:
+    """큰 JSON 객체를 전체를 메모리에 올리지 않고 key 단위로 읽는 reader
+    
+    chunk_size씩 읽은 버퍼에서 json.JSONDecoder.raw_decode로 값을 하나씩 디코딩하므로
+    메모리 사용량은 버퍼와 값 하나 크기만큼임 (term_dict.json처럼 term 수에 비례하는 파일용)
+    
+    사용법: for key in reader.keys(): 다음 key로 넘어가기 전에 reader.value() 또는 reader.keys()로 값을 읽어야 함
+    """
+    
+    WHITESPACE = ' \t\n\r'
+    NUMBER_CHARS = '0123456789+-.eE'
+    
+    def __init__(self, f, chunk_size=1 << 20):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def fill(self):
+        """버퍼에 다음 chunk 추가 (더 읽을 내용이 없으면 False)"""
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+    
+    def peek(self):
+        """공백을 건너뛰고 다음 문자 반환 (파일 끝이면 '')"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+    
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 위치에 {self.peek()!r}")
+        self.pos += 1
+    
+    def value(self):
+        """다음 JSON 값 하나를 디코딩 (버퍼 끝에서 잘린 값이면 더 읽어서 다시 디코딩)"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # 숫자는 버퍼 끝에서 잘려도 앞부분만 디코딩되므로 ("12." -> 12, "1e" -> 1)
+            # 숫자 뒤에 구분 문자 없이 버퍼가 끝났으면 더 읽어서 다시 디코딩
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and not self.buf[end:].strip(self.NUMBER_CHARS) and self.fill()):
+                continue
+            self.pos = end
+            return value
+    
+    def keys(self):
+        """현재 위치의 JSON 객체의 key를 차례로 yield"""
+        self.expect('{')
+        first = True
+        while True:
+            if self.peek() == '}':
+                self.pos += 1
+                return
+            if not first:
+                self.expect(',')
+            key = self.value()
+            self.expect(':')
+            yield key
+            first = False
+
+
+def iter_json_items(path, key=None):
+    """JSON 객체 파일의 (key, value)를 스트리밍으로 yield (key가 주어지면 최상위 객체의 해당 key 아래 객체)"""
+    with open(path, 'r', encoding='utf8') as f:
+        reader = JsonObjectReader(f)
+        for top_key in reader.keys():
+            if key is None:
+                yield top_key, reader.value()
+            elif top_key == key:
+                for item_key in reader.keys():
+                    yield item_key, reader.value()
+            else:
+                reader.value()
+
+
+def read_json_key(path, key):
+    """JSON 객체 파일에서 최상위 key 하나의 값만 읽기 (없으면 None)"""
+    with open(path, 'r', encoding='utf8') as f:
+        reader = JsonObjectReader(f)
+        for top_key in reader.keys():
+            value = reader.value()
+            if top_key == key:
+                return value
+    return None
+
+
+class IndexStats:
+    """인덱스 파일을 스트리밍으로 읽어 크기 / 분포 통계를 계산 (용량 계획, 캐시 크기 결정용)
+    
+    - 구성 요소별 디스크 사용량 (COMPONENTS에 없는 파일은 "기타")
+    - 필드별 문서 길이 분포 (doc_table.json)
+    - 필드별 포스팅 길이 분포와 log2 히스토그램, df 히스토그램 (term_dict.json)
+    - 포스팅 바이트 상위 term, df 비율이 큰 term (불용어 후보)과 포스팅 파일 비중이 큰 term
+    - bigram 보조 인덱스 / impact 인덱스 요약
+    
+    term_dict.json / doc_table.json은 JsonObjectReader로 항목 단위로 읽고, 분포 계산용 길이 배열(term당 4바이트)과
+    상위 term 힙만 메모리에 유지함. 포스팅 바이트는 term_dict의 길이 x 레코드 크기로 계산하므로 postings.bin은 읽지 않음
+    """
+    
+    # 구성 요소 이름 -> 파일 목록 (새 파일 형식을 추가하면 여기에 등록)
+    COMPONENTS = [
+        ("문서 테이블", ["{doc_table}"]),
+        ("term 사전", ["{term_dict}", Lexicon.LEXICON_FILE]),
+        ("포스팅", ["{postings}"]),
+        ("impact 인덱스", [Searcher.IMPACT_DICT_FILE, Searcher.IMPACT_POSTINGS_FILE]),
+        ("bigram 보조 인덱스", [NgramIndex.DICT_FILE, NgramIndex.POSTINGS_FILE]),
+        ("메타데이터 필터", [FilterIndex.DICT_FILE, FilterIndex.POSTINGS_FILE]),
+        ("term-document 행렬", ["matrix.json", "matrix.bin"]),  # matrix.py는 numpy / scipy를 import하므로 파일 이름만 사용
+        ("doc_id 재배치 매핑", [DocReorderer.MAP_FILE])
+    ]
+    # 레이아웃별 포스팅 레코드 크기 (field: doc_id, tf / merged: doc_id, tf_T, tf_A, tf_C)
+    RECORD_SIZES = {"field": 8, "merged": 16}
+    PERCENTILES = (50, 90, 99)
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file,
+                 top_n=20, high_df_ratio=0.3, large_term_ratio=0.01):
+        # versioned 인덱스이면 CURRENT가 가리키는 버전
+        self.version = None
+        if IndexVersions.is_versioned(index_dir):
+            versions = IndexVersions(index_dir)
+            self.version = versions.current()
+            index_dir = versions.path(self.version)
+        self.index_dir = os.path.abspath(index_dir)
+        self.file_names = {"doc_table": doc_table_file, "term_dict": term_dict_file, "postings": postings_file}
+        self.doc_table_file = os.path.join(self.index_dir, doc_table_file)
+        self.term_dict_file = os.path.join(self.index_dir, term_dict_file)
+        self.postings_file = os.path.join(self.index_dir, postings_file)
+        
+        self.top_n = top_n
+        self.high_df_ratio = high_df_ratio  # df / 문서 수가 이 비율 이상이면 불용어 후보
+        self.large_term_ratio = large_term_ratio  # 포스팅 파일에서 이 비율 이상을 차지하면 큰 term
+    
+    @staticmethod
+    def distribution(values):
+        """길이 배열의 개수 / 합 / 평균 / 최솟값 / 백분위수 / 최댓값"""
+        if not values:
+            return {"count": 0, "sum": 0, "mean": 0, "min": 0, "max": 0}
+        ordered = sorted(values)
+        result = {"count": len(ordered), "sum": sum(ordered), "mean": sum(ordered) / len(ordered), "min": ordered[0]}
+        for p in IndexStats.PERCENTILES:
+            result[f"p{p}"] = ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+        result["max"] = ordered[-1]
+        return result
+    
+    @staticmethod
+    def log2_histogram(values):
+        """[(구간 하한, 구간 상한, 개수)] (구간은 [1], [2, 3], [4, 7], ...; 0은 [0, 0])"""
+        buckets = Counter(value.bit_length() for value in values)
+        return [((1 << (bits - 1)) if bits else 0, (1 << bits) - 1, buckets[bits]) for bits in sorted(buckets)]
+    
+    def component_sizes(self):
+        """구성 요소별 [(이름, [(파일 이름, 바이트)])] (COMPONENTS에 없는 파일은 "기타")"""
+        present = {name: os.path.getsize(os.path.join(self.index_dir, name))
+                   for name in os.listdir(self.index_dir) if os.path.isfile(os.path.join(self.index_dir, name))}
+        components = []
+        for component, names in self.COMPONENTS:
+            files = [(name, present.pop(name)) for name in (name.format(**self.file_names) for name in names)
+                     if name in present]
+            if files:
+                components.append((component, files))
+        if present:
+            components.append(("기타", sorted(present.items())))
+        return components
+    
+    def document_stats(self):
+        """doc_table.json 메타데이터와 필드별 문서 길이 분포"""
+        metadata = read_json_key(self.doc_table_file, "metadata") or {}
+        lengths = {field: array('i') for field in ('T', 'A', 'C')}
+        for _, doc in iter_json_items(self.doc_table_file, "documents"):
+            for field in lengths:
+                lengths[field].append(doc[f"len_{field}"])
+        return metadata, {field: self.distribution(values) for field, values in lengths.items()}
+    
+    def term_stats(self, layout, num_docs):
+        """term_dict.json을 한 번 읽어 필드별 포스팅 길이 분포, df 분포, 상위 / 주의 term 계산"""
+        record_size = self.RECORD_SIZES[layout]
+        fields = ('M',) if layout == "merged" else ('T', 'A', 'C')
+        lengths = {field: array('i') for field in fields}
+        dfs = array('i')
+        largest = []  # (포스팅 바이트, term) min-heap (상위 top_n개)
+        high_df = []  # (df, term) min-heap (df 비율이 high_df_ratio 이상인 term 중 상위 top_n개)
+        num_high_df = 0
+        referenced_bytes = 0
+        large_terms = []  # (포스팅 바이트, term): 포스팅 파일 비중이 large_term_ratio 이상
+        postings_bytes = os.path.getsize(self.postings_file) if os.path.exists(self.postings_file) else 0
+        
+        for term, entry in iter_json_items(self.term_dict_file):
+            num_bytes = 0
+            for field in fields:
+                if field in entry:
+                    lengths[field].append(entry[field]["length"])
+                    num_bytes += entry[field]["length"] * record_size
+            df = entry["df"]
+            dfs.append(df)
+            referenced_bytes += num_bytes
+            
+            item = (num_bytes, term)
+            if len(largest) < self.top_n:
+                heapq.heappush(largest, item)
+            elif item > largest[0]:
+                heapq.heapreplace(largest, item)
+            if num_docs and df / num_docs >= self.high_df_ratio:
+                num_high_df += 1
+                if len(high_df) < self.top_n:
+                    heapq.heappush(high_df, (df, term))
+                elif (df, term) > high_df[0]:
+                    heapq.heapreplace(high_df, (df, term))
+            if postings_bytes and num_bytes / postings_bytes >= self.large_term_ratio:
+                large_terms.append(item)
+        
+        return {
+            "num_terms": len(dfs),
+            "postings": {field: dict(self.distribution(values), bytes=sum(values) * record_size,
+                                     histogram=self.log2_histogram(values))
+                         for field, values in lengths.items()},
+            "df": dict(self.distribution(dfs), histogram=self.log2_histogram(dfs)),
+            "largest_terms": [{"term": term, "bytes": num_bytes} for num_bytes, term in sorted(largest, reverse=True)],
+            "high_df_terms": [{"term": term, "df": df, "ratio": df / num_docs} for df, term in sorted(high_df, reverse=True)],
+            "num_high_df_terms": num_high_df,
+            "large_terms": [{"term": term, "bytes": num_bytes, "ratio": num_bytes / postings_bytes}
+                            for num_bytes, term in sorted(large_terms, reverse=True)],
+            "postings_file_bytes": postings_bytes,
+            "unreferenced_bytes": postings_bytes - referenced_bytes
+        }
+    
+    def ngram_stats(self):
+        """bigram 보조 인덱스 요약 (bigram 수, 필드별 포스팅 수)"""
+        path = os.path.join(self.index_dir, NgramIndex.DICT_FILE)
+        if not os.path.exists(path):
+            return None
+        num_grams = 0
+        postings = Counter()
+        for _, fields in iter_json_items(path, "grams"):
+            num_grams += 1
+            for field, entry in fields.items():
+                postings[field] += entry["df"]
+        size = os.path.getsize(os.path.join(self.index_dir, NgramIndex.POSTINGS_FILE))
+        return {"num_grams": num_grams, "postings": dict(postings), "postings_file_bytes": size}
+    
+    def impact_stats(self):
+        """impact 인덱스 요약 (설정, term 수, 포스팅 수)"""
+        path = os.path.join(self.index_dir, Searcher.IMPACT_DICT_FILE)
+        if not os.path.exists(path):
+            return None
+        metadata = read_json_key(path, "metadata") or {}
+        num_terms = 0
+        num_postings = 0
+        for _, entry in iter_json_items(path, "terms"):
+            num_terms += 1
+            num_postings += entry["length"]
+        return {"bits": metadata.get("bits"), "order": metadata.get("order", "doc"),
+                "num_terms": num_terms, "num_postings": num_postings}
+    
+    def collect(self):
+        """모든 통계를 dict로 반환 (JSON 직렬화 가능)"""
+        metadata, doc_lengths = self.document_stats()
+        layout = metadata.get("postings_layout", "field")
+        num_docs = doc_lengths['T']["count"]
+        components = self.component_sizes()
+        return {
+            "index_dir": self.index_dir,
+            "version": self.version,
+            "postings_layout": layout,
+            "num_docs": num_docs,
+            "avgdl": {field: metadata.get(f"avgdl_{field}", 0) for field in ('T', 'A', 'C')},
+            "doc_lengths": doc_lengths,
+            "components": [{"name": name, "files": [{"file": file, "bytes": size} for file, size in files]}
+                           for name, files in components],
+            "total_bytes": sum(size for _, files in components for _, size in files),
+            "terms": self.term_stats(layout, num_docs),
+            "ngrams": self.ngram_stats(),
+            "impacts": self.impact_stats()
+        }
+    
+    def print_report(self, report=None):
+        """collect() 결과를 사람이 읽는 형식으로 출력"""
+        report = report or self.collect()
+        terms = report["terms"]
+        total_bytes = report["total_bytes"] or 1
+        
+        def summary(dist):
+            percentiles = ', '.join(f"p{p} {dist[f'p{p}']:,}" for p in self.PERCENTILES if f"p{p}" in dist)
+            return f"최소 {dist['min']:,}, {percentiles}, 최대 {dist['max']:,}, 평균 {dist['mean']:.1f}"
+        
+        def print_histogram(histogram):
+            max_count = max((count for _, _, count in histogram), default=1)
+            for low, high, count in histogram:
+                label = f"{low:,}" if low == high else f"{low:,}-{high:,}"
+                print(f"      {label:>15}: {count:>10,} {'#' * max(1, round(40 * count / max_count))}")
+        
+        print(f"인덱스: {report['index_dir']}" + (f" (버전 {report['version']})" if report["version"] else ""))
+        print(f"  - 문서 수: {report['num_docs']:,}")
+        print(f"  - term 수: {terms['num_terms']:,}")
+        print(f"  - postings layout: {report['postings_layout']}")
+        print(f"  - 포스팅 수: " + ', '.join(f"{field} {dist['sum']:,}" for field, dist in terms["postings"].items()))
+        print(f"  - 평균 길이: " + ', '.join(f"{field} {avgdl:.1f}" for field, avgdl in report["avgdl"].items()))
+        
+        print(f"\n[디스크 사용량] 총 {report['total_bytes']:,} bytes")
+        for component in report["components"]:
+            component_bytes = sum(file["bytes"] for file in component["files"])
+            print(f"  - {component['name']}: {component_bytes:,} bytes ({100 * component_bytes / total_bytes:.1f}%)")
+            for file in component["files"]:
+                print(f"      {file['file']}: {file['bytes']:,} bytes")
+        
+        print(f"\n[문서 길이 분포]")
+        for field, dist in report["doc_lengths"].items():
+            print(f"  - {field}: {summary(dist)}")
+        
+        print(f"\n[필드별 포스팅 길이 분포] (term당 포스팅 수)")
+        for field, dist in terms["postings"].items():
+            if not dist["count"]:
+                continue
+            print(f"  - {field}: term {dist['count']:,}개, 포스팅 {dist['sum']:,}개, {dist['bytes']:,} bytes")
+            print(f"      {summary(dist)}")
+            print_histogram(dist["histogram"])
+        
+        if terms["df"]["count"]:
+            print(f"\n[df 히스토그램] {summary(terms['df'])}")
+            print_histogram(terms["df"]["histogram"])
+        
+        print(f"\n[포스팅 바이트 상위 {len(terms['largest_terms'])}개 term]")
+        for rank, item in enumerate(terms["largest_terms"], 1):
+            share = item["bytes"] / terms["postings_file_bytes"] if terms["postings_file_bytes"] else 0
+            print(f"  {rank:>3}. {item['term']}: {item['bytes']:,} bytes ({100 * share:.2f}%)")
+        
+        print(f"\n[주의가 필요한 term]")
+        print(f"  - df 비율 {self.high_df_ratio:.0%} 이상 (불용어 후보): {terms['num_high_df_terms']:,}개")
+        for item in terms["high_df_terms"]:
+            print(f"      {item['term']}: df {item['df']:,} ({item['ratio']:.1%})")
+        print(f"  - 포스팅 파일의 {self.large_term_ratio:.0%} 이상 차지: {len(terms['large_terms']):,}개")
+        for item in terms["large_terms"][:self.top_n]:
+            print(f"      {item['term']}: {item['bytes']:,} bytes ({item['ratio']:.1%})")
+        if terms["unreferenced_bytes"]:
+            print(f"  - term_dict가 가리키지 않는 포스팅 바이트: {terms['unreferenced_bytes']:,} bytes")
+        
+        if report["ngrams"] is not None:
+            ngrams = report["ngrams"]
+            num_postings = sum(ngrams["postings"].values())
+            print(f"\n[bigram 보조 인덱스] bigram {ngrams['num_grams']:,}개, 포스팅 "
+                  + ', '.join(f"{field} {count:,}" for field, count in ngrams["postings"].items())
+                  + (f", 포스팅당 {ngrams['postings_file_bytes'] / num_postings:.2f} bytes" if num_postings else ""))
+        
+        if report["impacts"] is not None:
+            impacts = report["impacts"]
+            print(f"\n[impact 인덱스] {impacts['bits']}비트 ({impacts['order']} 순서), "
+                  f"term {impacts['num_terms']:,}개, 포스팅 {impacts['num_postings']:,}개")
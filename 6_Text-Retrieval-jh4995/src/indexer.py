@@ -1,35 +1,293 @@
 import os
 import json
-import struct
-from collections import defaultdict, Counter
+import heapq
+import itertools
+from array import array
+from collections import Counter
 from .tokenizer import extract_terms
+from .impact import ImpactBuilder
+from .scanner import CorpusScanner
+from .reader import FieldReader
+from .lexicon import Lexicon
+from .ngram import NgramBuffer, NgramIndex
+from .filters import FilterBuilder, FilterIndex
+from .versions import IndexVersions
+from .checkpoint import IndexCheckpoint
+
+
+class PostingsBuffer:
+    """인덱싱 중 포스팅을 term id별 array('i') 버퍼에 누적
+    
+    term은 정수 id로 intern하고, 필드별 포스팅은 [doc_id, tf, doc_id, tf, ...] 형태의
+    typed 배열에 저장하므로 포스팅당 8바이트만 사용함 (tuple + list 대비 약 1/10 이하)
+    
+    memory_budget(바이트)이 주어지면 버퍼가 예산을 넘을 때마다 spill_dir의 run 파일로 내보내고 비움
+    run 파일은 (term id, field) 순서로 기록하고 doc_id가 증가 순서로 추가되므로, 저장 시 run들을 앞에서부터
+    순차적으로 k-way merge하여 (같은 key는 run 순서대로 이어 붙임) term 순서의 정렬된 포스팅을 만듦
+    """
+    
+    FIELDS = ('T', 'A', 'C')
+    RUN_FILE = "postings_run_{:04d}.tmp"
+    MERGE_FILE = "postings_merge_{:04d}.tmp"
+    MAX_OPEN_RUNS = 64  # 한 번에 병합하는 run 파일 수 (넘으면 중간 run으로 먼저 병합하여 열린 파일 수 제한)
+    READ_BUFFER = 1024 * 1024  # run 파일 순차 읽기 버퍼 (바이트)
+    
+    def __init__(self, spill_dir=None, memory_budget=None):
+        self.term_ids = {}  # term -> term id
+        self.terms = []  # term id -> term
+        self.postings = {field: [] for field in self.FIELDS}  # field -> term id -> array('i')
+        self.doc_freqs = array('i')  # term id -> global df
+        
+        self.spill_dir = spill_dir
+        self.memory_budget = memory_budget
+        self.buffered_bytes = 0  # 버퍼에 있는 포스팅 바이트 수
+        self.runs = []  # [(run 파일 경로, {(field, term id): (시작 위치, 바이트 수)})], 위치 dict는 파일 기록 순서
+        self.merge_files = []  # 저장 단계에서 만든 중간 병합 run 파일 경로
+    
+    def get_term_id(self, term):
+        """term을 정수 id로 intern (처음 등장하면 새 버퍼 할당)"""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.term_ids[term] = term_id
+            self.terms.append(term)
+            for field in self.FIELDS:
+                self.postings[field].append(array('i'))
+            self.doc_freqs.append(0)
+        return term_id
+    
+    def add_document(self, doc_id, field_freqs):
+        """한 문서의 필드별 term 빈도 {field: Counter}를 포스팅에 추가 (doc_id는 증가 순서로 호출)"""
+        doc_terms = set()
+        for field in self.FIELDS:
+            field_postings = self.postings[field]
+            for term, freq in field_freqs[field].items():
+                term_id = self.get_term_id(term)
+                buf = field_postings[term_id]
+                buf.append(doc_id)
+                buf.append(freq)
+                doc_terms.add(term_id)
+                self.buffered_bytes += 2 * buf.itemsize
+        
+        # global df: 어느 필드에든 등장한 문서 수
+        for term_id in doc_terms:
+            self.doc_freqs[term_id] += 1
+        
+        if self.memory_budget is not None and self.buffered_bytes > self.memory_budget:
+            self.spill()
+    
+    def spill(self):
+        """버퍼의 포스팅을 (term id, field) 순서로 새 run 파일에 내보내고 버퍼 비우기"""
+        path = os.path.join(self.spill_dir, self.RUN_FILE.format(len(self.runs)))
+        locations = {}
+        offset = 0
+        with open(path, "wb") as f:
+            for term_id in range(len(self.terms)):
+                for field in self.FIELDS:
+                    field_postings = self.postings[field]
+                    buf = field_postings[term_id]
+                    if not buf:
+                        continue
+                    data = buf.tobytes()
+                    f.write(data)
+                    locations[(field, term_id)] = (offset, len(data))
+                    offset += len(data)
+                    field_postings[term_id] = array('i')
+        self.runs.append((path, locations))
+        self.buffered_bytes = 0
+    
+    def iter_run(self, path, locations):
+        """run 파일의 ((term id, field 번호), 포스팅 바이트)를 파일 앞에서부터 순차적으로 반환"""
+        field_numbers = {field: i for i, field in enumerate(self.FIELDS)}
+        with open(path, "rb", buffering=self.READ_BUFFER) as f:
+            for (field, term_id), (offset, nbytes) in locations.items():
+                yield (term_id, field_numbers[field]), f.read(nbytes)
+    
+    def iter_buffer(self):
+        """메모리 버퍼의 ((term id, field 번호), 포스팅 바이트)를 (term id, field) 순서로 반환"""
+        for term_id in range(len(self.terms)):
+            for i, field in enumerate(self.FIELDS):
+                buf = self.postings[field][term_id]
+                if buf:
+                    yield (term_id, i), buf.tobytes()
+    
+    def merge_streams(self, streams):
+        """(key, 포스팅 바이트) 스트림들을 key 순서로 k-way merge (같은 key는 스트림 순서 = doc_id 순서로 이어 붙임)"""
+        for key, group in itertools.groupby(heapq.merge(*streams, key=lambda item: item[0]), key=lambda item: item[0]):
+            yield key, b''.join(data for _, data in group)
+    
+    def compact_runs(self, runs):
+        """run 수가 MAX_OPEN_RUNS 이하가 될 때까지 앞에서부터 MAX_OPEN_RUNS개씩 중간 run 파일로 병합"""
+        while len(runs) > self.MAX_OPEN_RUNS:
+            merged_runs = []
+            for i in range(0, len(runs), self.MAX_OPEN_RUNS):
+                group = runs[i:i + self.MAX_OPEN_RUNS]
+                if len(group) == 1:
+                    merged_runs.extend(group)
+                    continue
+                path = os.path.join(self.spill_dir, self.MERGE_FILE.format(len(self.merge_files)))
+                self.merge_files.append(path)
+                locations = {}
+                offset = 0
+                with open(path, "wb") as f:
+                    for (term_id, field_number), data in self.merge_streams(
+                            [self.iter_run(run_path, run_locations) for run_path, run_locations in group]):
+                        f.write(data)
+                        locations[(self.FIELDS[field_number], term_id)] = (offset, len(data))
+                        offset += len(data)
+                merged_runs.append((path, locations))
+            runs = merged_runs
+        return runs
+    
+    def iter_postings(self):
+        """term id 순서로 (term id, {field: 포스팅 [doc_id, tf, ...]}) 반환 (run 파일 + 버퍼, 포스팅이 있는 field만)
+        
+        run 파일은 순차적으로 한 번씩만 읽고, 동시에 여는 run 파일은 MAX_OPEN_RUNS개 이하
+        """
+        if not self.runs:
+            for term_id in range(len(self.terms)):
+                yield term_id, {field: self.postings[field][term_id] for field in self.FIELDS
+                                if self.postings[field][term_id]}
+            return
+        
+        runs = self.compact_runs(self.runs)
+        streams = [self.iter_run(path, locations) for path, locations in runs] + [self.iter_buffer()]
+        for term_id, group in itertools.groupby(self.merge_streams(streams), key=lambda item: item[0][0]):
+            field_postings = {}
+            for (_, field_number), data in group:
+                buf = array('i')
+                buf.frombytes(data)
+                field_postings[self.FIELDS[field_number]] = buf
+            yield term_id, field_postings
+    
+    def checkpoint_delta(self, since_doc_id):
+        """버퍼에서 doc_id since_doc_id 이후에 추가된 포스팅 [field 번호, term id, 포스팅 수, doc_id, tf, ...] 배열"""
+        records = array('i')
+        for i, field in enumerate(self.FIELDS):
+            for term_id, buf in enumerate(self.postings[field]):
+                if not buf or buf[-2] < since_doc_id:
+                    continue
+                start = len(buf)
+                while start > 0 and buf[start - 2] >= since_doc_id:
+                    start -= 2
+                records.extend((i, term_id, (len(buf) - start) // 2))
+                records.extend(buf[start:])
+        return records
+    
+    def apply_checkpoint_delta(self, records):
+        """checkpoint_delta()로 기록한 포스팅을 버퍼에 다시 추가 (checkpoint 순서대로 호출)"""
+        i = 0
+        while i < len(records):
+            field_number, term_id, count = records[i], records[i + 1], records[i + 2]
+            self.postings[self.FIELDS[field_number]][term_id].extend(records[i + 3:i + 3 + 2 * count])
+            self.buffered_bytes += 2 * count * records.itemsize
+            i += 3 + 2 * count
+    
+    def restore(self, terms, doc_freqs, runs):
+        """checkpoint에서 읽은 term 목록, global df, run 파일 목록으로 빈 버퍼 상태 복원"""
+        self.term_ids = {term: term_id for term_id, term in enumerate(terms)}
+        self.terms = list(terms)
+        self.postings = {field: [array('i') for _ in terms] for field in self.FIELDS}
+        self.doc_freqs = doc_freqs
+        self.buffered_bytes = 0
+        self.runs = runs
+    
+    def remove_runs(self):
+        """저장이 끝난 뒤 run 파일과 중간 병합 파일 삭제"""
+        for path in [path for path, _ in self.runs] + self.merge_files:
+            os.remove(path)
+        self.runs = []
+        self.merge_files = []
+    
+    def __len__(self):
+        return len(self.terms)
+
 
 class Indexer:
     
-    def __init__(self, data_dir, output_dir, doc_table_file, term_dict_file, postings_file):
+    # postings.bin 레이아웃
+    # - "field": term마다 T/A/C 포스팅 리스트를 따로 저장 (doc_id, tf)
+    # - "merged": term마다 하나의 포스팅 리스트에 (doc_id, tf_T, tf_A, tf_C)를 저장
+    POSTINGS_LAYOUTS = ("field", "merged")
+    
+    def __init__(self, data_dir, output_dir, doc_table_file, term_dict_file, postings_file,
+                 postings_layout="field", impact_bits=None, impact_order="doc",
+                 manifest_file=None, reuse_manifest=False, scan_workers=16,
+                 json_backend=None, io_workers=4, ngram_fields=None, metadata_filters=None,
+                 versioned=False, keep_versions=2, memory_budget=None,
+                 checkpoint_interval=None, resume=False):
+        if postings_layout not in self.POSTINGS_LAYOUTS:
+            raise ValueError(f"지원하지 않는 postings layout: {postings_layout}")
+        self.postings_layout = postings_layout
+        # 8 또는 16이면 인덱싱 후 양자화 BM25F impact 인덱스도 생성
+        self.impact_bits = impact_bits
+        self.impact_order = impact_order
         self.data_dir = os.path.abspath(data_dir)
-        self.output_dir = os.path.abspath(output_dir)
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.index_root = os.path.abspath(output_dir)
+        os.makedirs(self.index_root, exist_ok=True)
+        
+        # versioned=True이면 output_dir/vNNNN/에 새 버전을 만들고 인덱싱이 끝나면 CURRENT 포인터를 교체
+        # (실행 중인 Searcher는 이전 버전으로 계속 검색하다가 쿼리 사이에 새 버전으로 교체)
+        self.versions = IndexVersions(self.index_root) if versioned else None
+        self.keep_versions = keep_versions
+        # resume=True이면 마지막 checkpoint부터 이어서 인덱싱 (versioned이면 게시되지 않은 최신 버전을 이어서 사용)
+        self.resume = resume
+        resumable = None
+        if self.versions is not None and resume:
+            pending = [version for version in self.versions.versions()
+                       if version != self.versions.current() and IndexCheckpoint.exists(self.versions.path(version))]
+            resumable = pending[-1] if pending else None
+        if resumable is not None:
+            self.version, self.output_dir = resumable, self.versions.path(resumable)
+        elif self.versions is not None:
+            self.version, self.output_dir = self.versions.create()
+        else:
+            self.version = None
+            self.output_dir = self.index_root
         
         self.doc_table_file = os.path.join(self.output_dir, doc_table_file)
         self.term_dict_file = os.path.join(self.output_dir, term_dict_file)
         self.postings_file = os.path.join(self.output_dir, postings_file)
-
+        
+        # 코퍼스 파일 목록 (manifest_file이 주어지면 output_dir에 저장하고 reuse_manifest=True일 때 재사용)
+        manifest_path = os.path.join(self.index_root, manifest_file) if manifest_file else None
+        self.scanner = CorpusScanner(self.data_dir, manifest_path, scan_workers)
+        self.reuse_manifest = reuse_manifest
+        
+        # 메타데이터 필터 {필터 이름: (dataset 키, "category" / "number" / "year")}
+        # 예: {"CLASS": ("ipc", "category"), "YEAR": ("application_date", "year")}
+        self.metadata_filters = metadata_filters or {}
+        
+        # 문서에서 세 필드 (및 필터용 메타데이터)만 읽는 reader (백그라운드 I/O 스레드에서 미리 읽기)
+        metadata_keys = [key for key, kind in self.metadata_filters.values()]
+        self.reader = FieldReader(json_backend, io_workers, metadata_fields=metadata_keys)
+        
+        # 필드 목록 (예: ('T', 'A'))이 주어지면 같은 패스에서 문자 bigram 보조 인덱스도 생성
+        self.ngram_fields = tuple(ngram_fields) if ngram_fields else None
+        
+        # 포스팅 버퍼 메모리 예산 (바이트, None이면 제한 없음). 넘으면 output_dir의 임시 run 파일로 내보냄
+        self.memory_budget = memory_budget
+        
+        # 메모리 예산으로 run 파일이 생길 때와 파일 checkpoint_interval개마다 중간 상태를 output_dir에 checkpoint로 저장 (None이면 저장하지 않음)
+        # checkpoint는 run 파일을 새로 만들지 않고 버퍼에 남은 포스팅을 tail 파일에 이어서 기록
+        self.checkpoint_interval = checkpoint_interval
+    
     def build_index(self):
         """인덱스 구축 메인 함수"""
         
-        def read_json_file(file_path):
-            """JSON 파일을 읽어서 데이터를 반환"""
-            with open(file_path, encoding='utf8') as f:
-                return json.load(f)
-
-        def extract_fields_from_document(data):
-            """invention_title, abstract, claims를 각각 분리하여 추출"""
-            dataset = data['dataset']
-            title = dataset.get('invention_title', '')
-            abstract = dataset.get('abstract', '')
-            claims = dataset.get('claims', '')
-            return title, abstract, claims
+        def iter_document_paths():
+            """인덱싱할 JSON 파일 경로 (병렬 디렉토리 탐색 결과에서 중복 파일명 제외)"""
+            seen_filenames = set()  # 중복 파일명 체크용
+            for file_path, file_size, file_mtime in self.scanner.scan(self.reuse_manifest or self.resume):
+                file = os.path.basename(file_path)
+                if not file.endswith('.json'):
+                    continue
+                
+                # 중복 파일명 건너뛰기
+                if file in seen_filenames:
+                    continue
+                seen_filenames.add(file)
+                yield file_path
         
         def calculate_field_term_frequencies(title, abstract, claims):
             """각 필드별 단어 추출 및 빈도 계산"""
@@ -45,8 +303,7 @@ class Indexer:
         
         def update_postings_and_doc_table(title_freq, abstract_freq, claims_freq, 
                                           len_t, len_a, len_c, title_text,
-                                          doc_id, term_postings_t, term_postings_a, term_postings_c,
-                                          doc_table, file, file_path):
+                                          doc_id, postings_buffer, doc_table, file, file_path):
             """포스팅 리스트 업데이트 및 문서 테이블에 정보 저장"""
             # 문서 테이블에 doc_id를 키로 저장
             doc_table[doc_id] = {
@@ -59,20 +316,16 @@ class Indexer:
                 "T_text": title_text
             }
             
-            # 필드별 postings 리스트에 추가
-            for term, freq in title_freq.items():
-                term_postings_t[term].append((doc_id, freq))
-            for term, freq in abstract_freq.items():
-                term_postings_a[term].append((doc_id, freq))
-            for term, freq in claims_freq.items():
-                term_postings_c[term].append((doc_id, freq))
+            # 필드별 postings 버퍼에 추가
+            postings_buffer.add_document(doc_id, {'T': title_freq, 'A': abstract_freq, 'C': claims_freq})
         
         def save_doc_table(doc_table, total_len_t, total_len_a, total_len_c, num_docs):
             """doc_table.json 파일 저장 (평균 길이 정보 포함)"""
             metadata = {
                 "avgdl_T": total_len_t / num_docs if num_docs > 0 else 0,
                 "avgdl_A": total_len_a / num_docs if num_docs > 0 else 0,
-                "avgdl_C": total_len_c / num_docs if num_docs > 0 else 0
+                "avgdl_C": total_len_c / num_docs if num_docs > 0 else 0,
+                "postings_layout": self.postings_layout
             }
             output = {
                 "metadata": metadata,
@@ -81,53 +334,40 @@ class Indexer:
             with open(self.doc_table_file, 'w', encoding='utf8') as f:
                 json.dump(output, f, ensure_ascii=False, indent=4)
         
-        def save_postings_and_term_dict(term_postings_t, term_postings_a, term_postings_c):
-            """postings.bin과 term_dict.json 파일 생성 및 저장"""
-            # 모든 term 수집
-            all_terms = set(term_postings_t.keys()) | set(term_postings_a.keys()) | set(term_postings_c.keys())
+        def save_postings_and_term_dict(postings_buffer, doc_table):
+            """postings.bin과 term_dict.json 파일 생성 및 저장
             
+            필드 entry에는 포스팅의 최대 tf, 최소 필드 길이, 최대 tf / 필드 길이도 저장
+            (BM25F 파라미터와 무관하게 필드 tf 상한을 계산할 수 있는 값, tiered 평가용)
+            """
             term_dict = {}
             offset = 0
+            field_lengths = {field: array('i', [doc_table[doc_id][f"len_{field}"] for doc_id in range(len(doc_table))])
+                             for field in PostingsBuffer.FIELDS}
             
             with open(self.postings_file, "wb") as pbin:
-                for term in all_terms:
-                    term_entry = {"df": 0}
-                    
-                    # 해당 term이 등장하는 모든 문서 ID 수집 (global df 계산용)
-                    doc_ids = set()
+                for term_id, field_postings in postings_buffer.iter_postings():
+                    # global df는 해당 term이 등장하는 문서 수 (누적 중 계산됨)
+                    term = postings_buffer.terms[term_id]
+                    term_entry = {"df": postings_buffer.doc_freqs[term_id]}
                     
-                    # Title 필드 포스팅
-                    if term in term_postings_t:
-                        plist = term_postings_t[term]
-                        start = offset
-                        for doc_id, freq in plist:
-                            pbin.write(struct.pack("ii", doc_id, freq))
-                            doc_ids.add(doc_id)
-                            offset += 8
-                        term_entry["T"] = {"start": start, "length": len(plist)}
+                    # 필드별 포스팅 버퍼는 (doc_id, tf) 레코드와 같은 바이트 배치이므로 한 번에 기록
+                    for field in PostingsBuffer.FIELDS:
+                        buf = field_postings.get(field)
+                        if not buf:
+                            continue
+                        pbin.write(buf.tobytes())
+                        lengths = field_lengths[field]
+                        doc_lengths = [lengths[doc_id] for doc_id in buf[0::2]]
+                        term_entry[field] = {
+                            "start": offset,
+                            "length": len(buf) // 2,
+                            "max_tf": max(buf[1::2]),
+                            "min_len": min(doc_lengths),
+                            "max_tf_ratio": max(tf / dl for tf, dl in zip(buf[1::2], doc_lengths))
+                        }
+                        offset += len(buf) * buf.itemsize
                     
-                    # Abstract 필드 포스팅
-                    if term in term_postings_a:
-                        plist = term_postings_a[term]
-                        start = offset
-                        for doc_id, freq in plist:
-                            pbin.write(struct.pack("ii", doc_id, freq))
-                            doc_ids.add(doc_id)
-                            offset += 8
-                        term_entry["A"] = {"start": start, "length": len(plist)}
-                    
-                    # Claims 필드 포스팅
-                    if term in term_postings_c:
-                        plist = term_postings_c[term]
-                        start = offset
-                        for doc_id, freq in plist:
-                            pbin.write(struct.pack("ii", doc_id, freq))
-                            doc_ids.add(doc_id)
-                            offset += 8
-                        term_entry["C"] = {"start": start, "length": len(plist)}
-                    
-                    # global df는 해당 term이 등장하는 문서 수
-                    term_entry["df"] = len(doc_ids)
                     term_dict[term] = term_entry
             
             # term_dict.json 저장
@@ -136,74 +376,164 @@ class Indexer:
             
             return term_dict
         
+        def save_merged_postings_and_term_dict(postings_buffer):
+            """merged 레이아웃: term당 하나의 포스팅 리스트 (doc_id, tf_T, tf_A, tf_C) 저장"""
+            term_dict = {}
+            offset = 0
+            
+            with open(self.postings_file, "wb") as pbin:
+                for term_id, field_postings in postings_buffer.iter_postings():
+                    # doc_id -> [tf_T, tf_A, tf_C]
+                    term = postings_buffer.terms[term_id]
+                    merged = {}
+                    for field_idx, field in enumerate(PostingsBuffer.FIELDS):
+                        buf = field_postings.get(field, ())
+                        for i in range(0, len(buf), 2):
+                            merged.setdefault(buf[i], [0, 0, 0])[field_idx] = buf[i + 1]
+                    
+                    # doc_id 오름차순으로 기록 -> 검색 시 term당 한 번의 순차 스캔
+                    records = array('i')
+                    for doc_id in sorted(merged):
+                        records.append(doc_id)
+                        records.extend(merged[doc_id])
+                    pbin.write(records.tobytes())
+                    
+                    # merged 레이아웃에서는 포스팅 길이가 곧 global df
+                    term_dict[term] = {
+                        "df": len(merged),
+                        "M": {"start": offset, "length": len(merged)}
+                    }
+                    offset += len(records) * records.itemsize
+            
+            with open(self.term_dict_file, 'w', encoding='utf8') as f:
+                json.dump(term_dict, f, ensure_ascii=False, indent=4)
+            
+            return term_dict
+        
         # 메인 로직 시작
         doc_table = {}
-        term_postings_t = defaultdict(list)  # Title 포스팅
-        term_postings_a = defaultdict(list)  # Abstract 포스팅
-        term_postings_c = defaultdict(list)  # Claims 포스팅
-        seen_filenames = set()  # 중복 파일명 체크용
+        postings_buffer = PostingsBuffer(self.output_dir, self.memory_budget)  # 필드별 포스팅 (term id -> array('i'))
+        ngram_buffer = NgramBuffer(self.ngram_fields) if self.ngram_fields else None
+        filter_builder = FilterBuilder(self.metadata_filters) if self.metadata_filters else None
         
         doc_id = 0
         processed_files = 0
         total_len_t = 0
         total_len_a = 0
         total_len_c = 0
+        document_paths = iter_document_paths()
         
-        # JSON 파일들 처리
-        for root, dirs, files in os.walk(self.data_dir):
-            for file in files:
-                if file.endswith('.json'):
-                    # 중복 파일명 건너뛰기
-                    if file in seen_filenames:
-                        continue
-                    seen_filenames.add(file)
-                    
-                    file_path = os.path.join(root, file)
-                    
-                    # JSON 파일 읽기
-                    json_data = read_json_file(file_path)
-                    
-                    # 필드별 텍스트 추출
-                    title, abstract, claims = extract_fields_from_document(json_data)
-                    
-                    # 필드별 단어 빈도 계산
-                    title_freq, abstract_freq, claims_freq, len_t, len_a, len_c = calculate_field_term_frequencies(title, abstract, claims)
-                    
-                    # 평균 길이 계산용 누적
-                    total_len_t += len_t
-                    total_len_a += len_a
-                    total_len_c += len_c
-                    
-                    # 포스팅 및 문서 테이블 업데이트
-                    update_postings_and_doc_table(
-                        title_freq, abstract_freq, claims_freq,
-                        len_t, len_a, len_c, title,
-                        doc_id, term_postings_t, term_postings_a, term_postings_c,
-                        doc_table, file, file_path
-                    )
-                    
-                    doc_id += 1
-                    processed_files += 1
-                    
-                    # 테스트용: 1000개 파일만 처리
-                    # if processed_files >= 1000:
-                    #     break
-                    
-                    if processed_files % 1000 == 0:
-                        print(f"처리된 파일: {processed_files:,}개")
+        checkpoint = IndexCheckpoint(self.output_dir) if self.checkpoint_interval or self.resume else None
+        checkpoint_settings = {
+            "data_dir": self.data_dir,
+            "postings_layout": self.postings_layout,
+            "ngram_fields": list(self.ngram_fields) if self.ngram_fields else None,
+            "metadata_filters": {name: list(spec) for name, spec in self.metadata_filters.items()}
+        }
+        if self.resume and IndexCheckpoint.exists(self.output_dir):
+            state = checkpoint.load(postings_buffer, ngram_buffer, filter_builder, checkpoint_settings)
+            doc_table = state["doc_table"]
+            total_len_t, total_len_a, total_len_c = state["totals"]
+            doc_id = processed_files = state["processed_files"]
+            
+            # 이미 처리한 파일 건너뛰기 (파일 목록이 checkpoint 때와 같은지 마지막 파일 경로로 확인)
+            last_path = None
+            for last_path in itertools.islice(document_paths, processed_files):
+                pass
+            if last_path != state["last_path"]:
+                raise ValueError(f"checkpoint 이후 코퍼스 파일 목록이 바뀌어 이어서 인덱싱할 수 없습니다: {state['last_path']}")
+            print(f"checkpoint에서 이어서 인덱싱: {processed_files:,}개 파일 처리됨")
+        elif self.resume:
+            print("checkpoint가 없어 처음부터 인덱싱합니다.")
+        
+        # JSON 파일들 처리 (읽기/파싱은 백그라운드 스레드에서 토큰화와 겹쳐서 진행)
+        for file_path, (title, abstract, claims, *metadata_values) in self.reader.iter_fields(document_paths):
+            file = os.path.basename(file_path)
+            
+            # 필드별 단어 빈도 계산
+            title_freq, abstract_freq, claims_freq, len_t, len_a, len_c = calculate_field_term_frequencies(title, abstract, claims)
+            
+            # 평균 길이 계산용 누적
+            total_len_t += len_t
+            total_len_a += len_a
+            total_len_c += len_c
             
-            # 테스트용: 1000개 파일만 처리 (외부 루프 break)
+            # 포스팅 및 문서 테이블 업데이트
+            update_postings_and_doc_table(
+                title_freq, abstract_freq, claims_freq,
+                len_t, len_a, len_c, title,
+                doc_id, postings_buffer, doc_table, file, file_path
+            )
+            if ngram_buffer is not None:
+                ngram_buffer.add_document(doc_id, {'T': title, 'A': abstract, 'C': claims})
+            if filter_builder is not None:
+                filter_builder.add_document(doc_id, metadata_values)
+            
+            doc_id += 1
+            processed_files += 1
+            
+            # 테스트용: 1000개 파일만 처리
             # if processed_files >= 1000:
             #     break
+            
+            if processed_files % 1000 == 0:
+                print(f"처리된 파일: {processed_files:,}개")
+            
+            # 메모리 예산으로 run 파일이 새로 생긴 시점과 파일 checkpoint_interval개마다 checkpoint 저장
+            if self.checkpoint_interval and (len(postings_buffer.runs) > checkpoint.saved_runs or
+                                             processed_files - checkpoint.saved_docs >= self.checkpoint_interval):
+                checkpoint.save(processed_files, file_path, postings_buffer, doc_table,
+                                (total_len_t, total_len_a, total_len_c),
+                                ngram_buffer, filter_builder, checkpoint_settings)
         
         # 결과 파일들 저장
         save_doc_table(doc_table, total_len_t, total_len_a, total_len_c, processed_files)
-        term_dict = save_postings_and_term_dict(term_postings_t, term_postings_a, term_postings_c)
+        if self.postings_layout == "merged":
+            term_dict = save_merged_postings_and_term_dict(postings_buffer)
+        else:
+            term_dict = save_postings_and_term_dict(postings_buffer, doc_table)
+        num_runs = len(postings_buffer.runs)
+        postings_buffer.remove_runs()
+        if checkpoint is not None:
+            checkpoint.remove()
+        
+        # 와일드카드 검색용 정렬된 lexicon 저장
+        lexicon_file = os.path.join(self.output_dir, Lexicon.LEXICON_FILE)
+        Lexicon.save(term_dict.keys(), lexicon_file)
         
         # 완료 메시지 출력
         print(f"인덱싱 완료: 총 {processed_files:,}개 파일 처리")
-        print(f"총 {len(term_dict):,}개 unique terms")
+        print(f"총 {len(term_dict):,}개 unique terms (postings layout: {self.postings_layout})")
+        if num_runs:
+            print(f"{num_runs}개 포스팅 run 파일을 병합 (메모리 예산 초과)")
         print(f"결과 파일:")
         print(f"  - {self.doc_table_file}")
         print(f"  - {self.term_dict_file}")
-        print(f"  - {self.postings_file}")
\ No newline at end of file
+        print(f"  - {self.postings_file}")
+        print(f"  - {lexicon_file}")
+        
+        if ngram_buffer is not None:
+            num_grams = ngram_buffer.save(self.output_dir)
+            print(f"bigram 보조 인덱스: {num_grams:,}개 bigram (fields: {', '.join(self.ngram_fields)})")
+            print(f"  - {os.path.join(self.output_dir, NgramIndex.DICT_FILE)}")
+            print(f"  - {os.path.join(self.output_dir, NgramIndex.POSTINGS_FILE)}")
+        
+        if filter_builder is not None:
+            filter_builder.save(self.output_dir)
+            print(f"메타데이터 필터: {', '.join(filter_builder.filters)}")
+            print(f"  - {os.path.join(self.output_dir, FilterIndex.DICT_FILE)}")
+            print(f"  - {os.path.join(self.output_dir, FilterIndex.POSTINGS_FILE)}")
+        
+        if self.impact_bits:
+            builder = ImpactBuilder(self.output_dir, os.path.basename(self.doc_table_file),
+                                    os.path.basename(self.term_dict_file),
+                                    os.path.basename(self.postings_file), self.impact_bits,
+                                    self.impact_order)
+            builder.build()
+        
+        if self.versions is not None:
+            self.versions.publish(self.version)
+            removed = self.versions.cleanup(self.keep_versions)
+            print(f"인덱스 버전 {self.version} 게시 ({self.versions.current_path})")
+            if removed:
+                print(f"이전 버전 삭제: {', '.join(removed)}")
\ No newline at end of file
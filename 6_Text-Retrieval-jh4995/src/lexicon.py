@@ -0,0 +1,212 @@
+import re
+import json
+import heapq
+import fnmatch
+from array import array
+from bisect import bisect_left
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """a, b의 편집 거리 (max_distance를 넘으면 계산을 중단하고 max_distance + 1 반환)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            row_min = min(row_min, cur[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        prev = cur
+    return min(prev[-1], max_distance + 1)
+
+
+class Lexicon:
+    """정렬된 term 목록 기반 lexicon (prefix / wildcard 확장, 오타 보정)
+    
+    term들이 정렬되어 있으므로 prefix가 같은 term들은 연속 구간에 모여 있고,
+    그 구간의 경계는 이진 탐색 두 번(O(log V))으로 찾을 수 있음.
+    오타 보정은 문자 bigram 역색인으로 후보를 좁힌 뒤 편집 거리로 검증함
+    """
+    
+    LEXICON_FILE = "lexicon.json"
+    WILDCARD_CHARS = '*?'
+    
+    def __init__(self, terms):
+        self.terms = terms  # 정렬된 term 리스트
+        self.ngram_index = None  # 문자 bigram -> term 번호 배열 (오타 보정 첫 사용 시 생성)
+        self.df_tree = None  # (leaf 수, df 배열, segment tree) (와일드카드 확장 첫 사용 시 생성)
+    
+    @classmethod
+    def load(cls, path):
+        """Indexer가 저장한 lexicon.json 로드"""
+        with open(path, 'r', encoding='utf8') as f:
+            return cls(json.load(f))
+    
+    @classmethod
+    def save(cls, terms, path):
+        """term들을 정렬하여 lexicon.json으로 저장"""
+        with open(path, 'w', encoding='utf8') as f:
+            json.dump(sorted(terms), f, ensure_ascii=False)
+    
+    @classmethod
+    def is_wildcard(cls, token):
+        """와일드카드(*, ?)가 포함된 token인지 확인"""
+        return any(c in token for c in cls.WILDCARD_CHARS)
+    
+    @classmethod
+    def wildcard_prefix(cls, pattern):
+        """첫 와일드카드 앞까지의 고정 prefix"""
+        for i, c in enumerate(pattern):
+            if c in cls.WILDCARD_CHARS:
+                return pattern[:i]
+        return pattern
+    
+    @staticmethod
+    def bigrams(term):
+        """양 끝 경계 문자를 붙인 문자 bigram 리스트 (길이 len(term) + 1)"""
+        padded = '\x00' + term + '\x00'
+        return [padded[i:i + 2] for i in range(len(padded) - 1)]
+    
+    def build_ngram_index(self):
+        """lexicon 전체에 대한 문자 bigram 역색인 생성"""
+        index = {}
+        for term_no, term in enumerate(self.terms):
+            for gram in set(self.bigrams(term)):
+                term_nos = index.get(gram)
+                if term_nos is None:
+                    term_nos = index[gram] = array('i')
+                term_nos.append(term_no)
+        self.ngram_index = index
+    
+    def fuzzy_lookup(self, term, get_df, max_distance=None):
+        """term과 편집 거리 max_distance 이내인 가장 가까운 term 반환 (없으면 None)
+        
+        max_distance가 None이면 4글자 이하는 1, 그보다 길면 2
+        편집 한 번은 bigram을 최대 2개 바꾸므로 후보는 (bigram 수 - 2 * max_distance)개 이상을 공유해야 함.
+        이 조건을 만족하려면 df가 작은 bigram들 중 앞의 일부 중 하나는 반드시 공유하므로
+        그 bigram들의 term 목록만 후보로 모아서 편집 거리를 검증함 (prefix filtering)
+        """
+        if max_distance is None:
+            max_distance = 1 if len(term) <= 4 else 2
+        if self.ngram_index is None:
+            self.build_ngram_index()
+        
+        grams = self.bigrams(term)
+        unique_grams = set(grams)
+        min_shared = len(grams) - 2 * max_distance - (len(grams) - len(unique_grams))
+        # 아주 짧은 term은 공유 bigram 조건이 0 이하가 되므로 최소 1개 공유로 근사
+        min_shared = max(1, min_shared)
+        
+        empty = array('i')
+        gram_lists = sorted((self.ngram_index.get(gram, empty) for gram in unique_grams), key=len)
+        candidates = set()
+        for term_nos in gram_lists[:len(gram_lists) - min_shared + 1]:
+            candidates.update(term_nos)
+        
+        best = None
+        best_key = None
+        for term_no in candidates:
+            candidate = self.terms[term_no]
+            distance = bounded_levenshtein(term, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            # 편집 거리가 작은 term, 같으면 df가 큰 term 우선
+            key = (distance, -get_df(candidate), candidate)
+            if best_key is None or key < best_key:
+                best = candidate
+                best_key = key
+        return best
+    
+    def prefix_range(self, prefix):
+        """prefix로 시작하는 term들의 구간 [lo, hi)"""
+        lo = bisect_left(self.terms, prefix)
+        hi = bisect_left(self.terms, prefix + '\U0010ffff', lo)
+        return lo, hi
+    
+    def build_df_tree(self, get_df):
+        """lexicon 순서의 df에 대한 구간 최댓값 segment tree 생성
+        
+        leaf는 term 번호, 내부 노드는 자식 중 df가 큰 term 번호 (같으면 앞의 term)
+        """
+        size = 1
+        while size < len(self.terms):
+            size *= 2
+        dfs = array('i', (get_df(term) for term in self.terms))
+        tree = array('i', [-1]) * (2 * size)
+        for term_no in range(len(self.terms)):
+            tree[size + term_no] = term_no
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if right < 0 or (left >= 0 and dfs[left] >= dfs[right]) else right
+        self.df_tree = (size, dfs, tree)
+    
+    def iter_by_df(self, lo, hi):
+        """구간 [lo, hi)의 term 번호를 df 내림차순(같으면 lexicon 순서)으로 yield
+        
+        구간을 덮는 segment tree 노드들의 최댓값으로 힙을 만들고, 꺼낸 노드의 자식을 넣는 방식이므로
+        k개를 꺼내는 비용은 구간 크기와 관계없이 O(k log V)
+        """
+        size, dfs, tree = self.df_tree
+        heap = []
+        
+        def push(node):
+            term_no = tree[node]
+            if term_no >= 0:
+                heapq.heappush(heap, (-dfs[term_no], term_no, node))
+        
+        left, right = lo + size, hi + size
+        while left < right:
+            if left & 1:
+                push(left)
+                left += 1
+            if right & 1:
+                right -= 1
+                push(right)
+            left //= 2
+            right //= 2
+        
+        while heap:
+            _, term_no, node = heapq.heappop(heap)
+            if node >= size:
+                yield term_no
+            else:
+                push(2 * node)
+                push(2 * node + 1)
+    
+    def expand(self, pattern, get_df, max_terms=50):
+        """와일드카드 pattern에 매칭되는 term들을 최대 max_terms개 반환
+        
+        prefix 구간 전체에서 df가 큰 순서로 매칭 term을 찾음 (처음 호출할 때 get_df로 df segment tree 생성).
+        '*'로 끝나는 prefix pattern은 구간 크기와 관계없이 O(max_terms log V), 그 밖의 pattern은 매칭 term을
+        max_terms + 1개 찾을 때까지 df 순서로 검사함
+        반환값: (term 리스트, 매칭 term이 max_terms개를 넘어 잘렸는지 여부)
+        매칭 term이 max_terms개 이하이면 lexicon 순서, 잘렸으면 df 내림차순
+        """
+        prefix = self.wildcard_prefix(pattern)
+        lo, hi = self.prefix_range(prefix)
+        
+        # prefix 뒤가 '*' 하나뿐이면 구간 전체가 매칭 (정규식 검사 생략)
+        if pattern == prefix + '*':
+            if hi - lo <= max_terms:
+                return self.terms[lo:hi], False
+            matcher = None
+        else:
+            matcher = re.compile(fnmatch.translate(pattern))
+        
+        if self.df_tree is None:
+            self.build_df_tree(get_df)
+        matches = []
+        for term_no in self.iter_by_df(lo, hi):
+            term = self.terms[term_no]
+            if matcher is None or matcher.match(term):
+                matches.append(term_no)
+                if len(matches) > max_terms:
+                    break
+        
+        if len(matches) > max_terms:
+            return [self.terms[term_no] for term_no in matches[:max_terms]], True
+        return [self.terms[term_no] for term_no in sorted(matches)], False
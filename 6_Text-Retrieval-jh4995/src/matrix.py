@@ -0,0 +1,249 @@
+import os
+import json
+import heapq
+from array import array
+from .searcher import Searcher
+from .tokenizer import extract_terms
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+
+class MatrixExporter:
+    """인덱스를 필드별 CSR term-document 행렬(행 = term, 열 = doc_id)로 export
+    
+    matrix.bin에 저장하는 배열
+    - 필드별 indptr(int64, term 수 + 1), indices(int32 doc_id), data(int32 tf)
+    - 필드별 길이 정규화 벡터 norms(float64, 문서 수): w_f / ((1 - b_f) + b_f * dl / avgdl)
+    - term별 idf 벡터(float64)
+    matrix.json에는 term 순서(= 행 번호)와 배열별 (바이트 위치, 원소 수)를 저장함
+    
+    행(term) 단위로 연속 저장되므로 열 기준으로 보면 doc-term 행렬의 CSC와 같은 배치임
+    """
+    
+    DICT_FILE = "matrix.json"
+    DATA_FILE = "matrix.bin"
+    FIELDS = ['T', 'A', 'C']
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file):
+        # BM25F 파라미터와 idf / 길이 정규화는 Searcher와 같은 코드로 계산
+        self.searcher = Searcher(index_dir, doc_table_file, term_dict_file, postings_file,
+                                 use_impacts=False, use_ngrams=False, preload_tagger=False)
+        self.index_dir = self.searcher.index_dir
+    
+    def field_norms(self, field):
+        """문서별 필드 tf 배율 (calculate_field_tf(1, field, doc_info)와 같은 값)"""
+        searcher = self.searcher
+        return array('d', [searcher.calculate_field_tf(1, field, searcher.doc_table[str(doc_id)])
+                           for doc_id in range(searcher.N)])
+    
+    def export(self):
+        """matrix.bin / matrix.json 저장"""
+        searcher = self.searcher
+        terms = sorted(searcher.term_dict)
+        arrays = {}
+        offset = 0
+        
+        def write_array(f, values):
+            nonlocal offset
+            f.write(values.tobytes())
+            entry = [offset, len(values)]
+            offset += len(values) * values.itemsize
+            return entry
+        
+        with open(os.path.join(self.index_dir, self.DATA_FILE), "wb") as f:
+            for field in self.FIELDS:
+                indptr = array('q', [0])
+                indices = array('i')
+                data = array('i')
+                for term in terms:
+                    doc_ids, tfs = searcher.get_postings_arrays(term, field)
+                    indices.extend(doc_ids)
+                    data.extend(tfs)
+                    indptr.append(len(indices))
+                    searcher.clear_cache()
+                arrays[field] = {
+                    "indptr": write_array(f, indptr),
+                    "indices": write_array(f, indices),
+                    "data": write_array(f, data),
+                    "norms": write_array(f, self.field_norms(field))
+                }
+            idf = array('d', [searcher.calculate_idf(searcher.term_dict[term]["df"]) for term in terms])
+            arrays["idf"] = write_array(f, idf)
+        
+        output = {
+            "metadata": {
+                "N": searcher.N,
+                "K1": searcher.K1,
+                "fields": self.FIELDS,
+                "nnz": {field: arrays[field]["indices"][1] for field in self.FIELDS}
+            },
+            "terms": terms,
+            "arrays": arrays
+        }
+        with open(os.path.join(self.index_dir, self.DICT_FILE), 'w', encoding='utf8') as f:
+            json.dump(output, f, ensure_ascii=False)
+        
+        print(f"term-document 행렬 export 완료 ({len(terms):,} terms x {searcher.N:,} docs)")
+        for field in self.FIELDS:
+            print(f"  - {field}: nnz {output['metadata']['nnz'][field]:,}")
+        print(f"  - {os.path.join(self.index_dir, self.DICT_FILE)}")
+        print(f"  - {os.path.join(self.index_dir, self.DATA_FILE)}")
+        searcher.close()
+
+
+class BatchScorer:
+    """MatrixExporter가 저장한 행렬로 많은 쿼리의 BM25F 점수를 한 번에 계산하여 쿼리별 top-k 반환
+    
+    필드 조합마다 term-document 점수 행렬 S를 한 번 만들어 두고 (tf saturation까지 적용한 term 기여도)
+    쿼리 점수는 쿼리-term 개수 행렬 Q와의 곱 Q @ S로 계산함 (calculate_bm25f_score와 같은 점수)
+    
+    backend
+    - "scipy": scipy.sparse 행렬 곱 (numpy / scipy가 설치된 경우 기본값)
+    - "python": 표준 라이브러리만 사용. term 행을 배치 안에서 한 번만 계산하고 쿼리들이 공유 (term-at-a-time)
+    """
+    
+    BACKENDS = ("scipy", "python")
+    
+    def __init__(self, index_dir, backend=None):
+        if backend is None:
+            backend = "scipy" if sparse is not None else "python"
+        if backend not in self.BACKENDS:
+            raise ValueError(f"지원하지 않는 행렬 backend: {backend}")
+        if backend == "scipy" and sparse is None:
+            raise ValueError("numpy / scipy가 설치되어 있지 않습니다.")
+        self.backend = backend
+        
+        with open(os.path.join(index_dir, MatrixExporter.DICT_FILE), 'r', encoding='utf8') as f:
+            data = json.load(f)
+        self.metadata = data["metadata"]
+        self.terms = data["terms"]
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        self.N = self.metadata["N"]
+        self.K1 = self.metadata["K1"]
+        
+        # 행렬 파일은 한 번에 읽어서 배열로 보관
+        with open(os.path.join(index_dir, MatrixExporter.DATA_FILE), "rb") as f:
+            raw = f.read()
+        arrays = data["arrays"]
+        self.idf = self.read_array(raw, 'd', arrays["idf"])
+        self.matrices = {}
+        for field in self.metadata["fields"]:
+            entry = arrays[field]
+            self.matrices[field] = {
+                "indptr": self.read_array(raw, 'q', entry["indptr"]),
+                "indices": self.read_array(raw, 'i', entry["indices"]),
+                "data": self.read_array(raw, 'i', entry["data"]),
+                "norms": self.read_array(raw, 'd', entry["norms"])
+            }
+        self.score_matrices = {}  # 필드 조합 -> scipy 점수 행렬 S
+    
+    def read_array(self, raw, typecode, entry):
+        """matrix.bin 바이트에서 (위치, 원소 수) 구간을 배열로 변환 (scipy backend는 numpy 배열)"""
+        start, count = entry
+        if self.backend == "scipy":
+            return np.frombuffer(raw, dtype=np.dtype(typecode), count=count, offset=start)
+        values = array(typecode)
+        values.frombytes(raw[start:start + count * values.itemsize])
+        return values
+    
+    def query_term_ids(self, query_terms):
+        """query term 리스트 -> {term_id: 등장 횟수} (인덱스에 없는 term은 제외)"""
+        counts = {}
+        for term in query_terms:
+            term_id = self.term_ids.get(term)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + 1
+        return counts
+    
+    def score_matrix(self, fields):
+        """scipy backend: 필드 조합의 term-document 점수 행렬 S (캐싱)"""
+        key = tuple(sorted(fields))
+        if key in self.score_matrices:
+            return self.score_matrices[key]
+        
+        shape = (len(self.terms), self.N)
+        tf_tilde = None
+        for field in key:
+            matrix = self.matrices[field]
+            tf = sparse.csr_matrix((matrix["data"].astype(np.float64), matrix["indices"], matrix["indptr"]), shape=shape)
+            weighted = tf @ sparse.diags(matrix["norms"])
+            tf_tilde = weighted if tf_tilde is None else tf_tilde + weighted
+        tf_tilde = tf_tilde.tocsr()
+        tf_tilde.data = (self.K1 + 1) * tf_tilde.data / (self.K1 + tf_tilde.data)
+        scores = sparse.diags(np.asarray(self.idf)) @ tf_tilde
+        self.score_matrices[key] = scores.tocsr()
+        return self.score_matrices[key]
+    
+    def term_row(self, term_id, fields):
+        """python backend: term 한 행의 {doc_id: 기여도}"""
+        tf_tildes = {}
+        for field in fields:
+            matrix = self.matrices[field]
+            norms = matrix["norms"]
+            start, end = matrix["indptr"][term_id], matrix["indptr"][term_id + 1]
+            for doc_id, tf in zip(matrix["indices"][start:end], matrix["data"][start:end]):
+                tf_tildes[doc_id] = tf_tildes.get(doc_id, 0.0) + tf * norms[doc_id]
+        idf = self.idf[term_id]
+        return {doc_id: idf * ((self.K1 + 1) * x) / (self.K1 + x) for doc_id, x in tf_tildes.items()}
+    
+    @staticmethod
+    def top_k_items(doc_ids, scores, top_k):
+        """(doc_id, 점수) 중 점수 내림차순(동점은 doc_id 오름차순) 상위 top_k개"""
+        return heapq.nsmallest(top_k, zip(doc_ids, scores), key=lambda item: (-item[1], item[0]))
+    
+    def score_batch(self, queries, top_k=10, fields=('T', 'A', 'C')):
+        """query term 리스트들의 쿼리별 top-k [(doc_id, score), ...] 리스트 (OR 쿼리 기준)"""
+        query_counts = [self.query_term_ids(query_terms) for query_terms in queries]
+        if self.backend == "scipy":
+            return self.score_batch_scipy(query_counts, top_k, fields)
+        return self.score_batch_python(query_counts, top_k, fields)
+    
+    def score_batch_scipy(self, query_counts, top_k, fields):
+        """scipy backend: 쿼리-term 행렬과 점수 행렬의 곱 한 번으로 전체 배치 점수 계산"""
+        rows, cols, values = [], [], []
+        for row, counts in enumerate(query_counts):
+            for term_id, count in counts.items():
+                rows.append(row)
+                cols.append(term_id)
+                values.append(count)
+        query_matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(query_counts), len(self.terms)),
+                                         dtype=np.float64)
+        results = (query_matrix @ self.score_matrix(fields)).tocsr()
+        
+        ranked = []
+        for row in range(len(query_counts)):
+            start, end = results.indptr[row], results.indptr[row + 1]
+            doc_ids = results.indices[start:end]
+            scores = results.data[start:end]
+            if len(scores) > top_k:
+                # 경계 동점을 doc_id 순서로 고를 수 있도록 top_k번째 점수 이상을 모두 후보로 남김
+                kth = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+                keep = scores >= kth
+                doc_ids, scores = doc_ids[keep], scores[keep]
+            ranked.append([(int(doc_id), float(score))
+                           for doc_id, score in self.top_k_items(doc_ids, scores, top_k)])
+        return ranked
+    
+    def score_batch_python(self, query_counts, top_k, fields):
+        """python backend: 배치에 등장하는 term 행을 한 번씩만 계산하여 쿼리별 점수 누적"""
+        rows = {}
+        ranked = []
+        for counts in query_counts:
+            doc_scores = {}
+            for term_id, count in counts.items():
+                row = rows.get(term_id)
+                if row is None:
+                    row = rows[term_id] = self.term_row(term_id, fields)
+                for doc_id, score in row.items():
+                    doc_scores[doc_id] = doc_scores.get(doc_id, 0.0) + count * score
+            ranked.append(self.top_k_items(doc_scores.keys(), doc_scores.values(), top_k))
+        return ranked
+    
+    def score_texts(self, texts, top_k=10, fields=('T', 'A', 'C')):
+        """검색어 문자열들을 형태소 분석하여 score_batch() 실행"""
+        return self.score_batch([extract_terms(text) for text in texts], top_k, fields)
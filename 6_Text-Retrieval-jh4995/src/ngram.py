@@ -0,0 +1,189 @@
+import os
+import re
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+def text_bigrams(text):
+    """텍스트의 단어(\\w+)별 문자 bigram 집합 (단어 경계를 넘는 bigram은 만들지 않음)"""
+    grams = set()
+    for word in NgramIndex.WORD_PATTERN.findall(text.lower()):
+        for i in range(len(word) - 1):
+            grams.add(word[i:i + 2])
+    return grams
+
+
+class NgramBuffer:
+    """인덱싱 중 필드별 문자 bigram -> doc_id 포스팅을 array('i') 버퍼에 누적 (등장 여부만, tf 없음)"""
+    
+    def __init__(self, fields=('T', 'A')):
+        self.fields = tuple(fields)
+        self.postings = {field: {} for field in self.fields}  # field -> bigram -> array('i')
+    
+    def add_document(self, doc_id, field_texts):
+        """한 문서의 필드별 원문 {field: text}를 추가 (doc_id는 증가 순서로 호출)"""
+        for field in self.fields:
+            field_postings = self.postings[field]
+            for gram in sorted(text_bigrams(field_texts[field])):
+                buf = field_postings.get(gram)
+                if buf is None:
+                    buf = field_postings[gram] = array('i')
+                buf.append(doc_id)
+    
+    def checkpoint_delta(self, since_doc_id):
+        """doc_id since_doc_id 이후에 추가된 포스팅 {field: {bigram: [doc_id, ...]}} (checkpoint에 이어서 기록할 부분)"""
+        delta = {}
+        for field in self.fields:
+            grams = {}
+            for gram, buf in self.postings[field].items():
+                if buf[-1] >= since_doc_id:
+                    grams[gram] = buf[bisect_left(buf, since_doc_id):].tolist()
+            delta[field] = grams
+        return delta
+    
+    def apply_checkpoint_delta(self, delta):
+        """checkpoint_delta()로 기록한 포스팅을 버퍼에 다시 추가 (checkpoint 순서대로 호출)"""
+        for field, grams in delta.items():
+            field_postings = self.postings[field]
+            for gram, doc_ids in grams.items():
+                field_postings.setdefault(gram, array('i')).extend(doc_ids)
+    
+    def save(self, index_dir):
+        """ngram_postings.bin / ngram_dict.json 저장
+        
+        포스팅은 BLOCK_SIZE개씩 블록으로 나누어 블록 안의 doc_id 간격만 기록하고,
+        블록마다 간격의 최댓값이 들어가는 가장 작은 정수 폭(1/2/4바이트)을 사용함
+        bigram은 정렬 순서로 기록하므로 같은 코퍼스면 실행마다 (hash randomization과 관계없이) 같은 파일이 만들어짐
+        """
+        grams = {}
+        offset = 0
+        block_size = NgramIndex.BLOCK_SIZE
+        
+        with open(os.path.join(index_dir, NgramIndex.POSTINGS_FILE), "wb") as f:
+            for field in self.fields:
+                for gram, doc_ids in sorted(self.postings[field].items()):
+                    blocks = []
+                    entry = {"df": len(doc_ids), "start": offset, "blocks": blocks}
+                    for i in range(0, len(doc_ids), block_size):
+                        block = doc_ids[i:i + block_size]
+                        deltas = [b - a for a, b in zip(block, block[1:])]
+                        width = NgramIndex.delta_width(max(deltas, default=0))
+                        data = array(NgramIndex.TYPECODES[width], deltas).tobytes()
+                        f.write(data)
+                        offset += len(data)
+                        # [첫 doc_id, 마지막 doc_id, 간격 바이트 폭]
+                        blocks.append([block[0], block[-1], width])
+                    grams.setdefault(gram, {})[field] = entry
+        
+        output = {
+            "metadata": {"fields": list(self.fields), "block_size": block_size},
+            "grams": grams
+        }
+        with open(os.path.join(index_dir, NgramIndex.DICT_FILE), 'w', encoding='utf8') as f:
+            json.dump(output, f, ensure_ascii=False)
+        return len(grams)
+
+
+class NgramIndex:
+    """형태소 분석기가 인덱싱하지 못한 term(OOV)을 찾기 위한 문자 bigram 보조 인덱스
+    
+    - 필드별 bigram -> doc_id 포스팅 (Indexer가 본 인덱스와 같은 패스에서 생성)
+    - 포스팅은 블록 단위 delta 압축 (블록별 1/2/4바이트 폭), 블록의 (첫 doc_id, 마지막 doc_id)는 dict에 보관
+    - 교집합은 df가 가장 작은 bigram의 문서들을 후보로 두고, 나머지 bigram은 후보가 들어 있는 블록만 디코딩
+    """
+    
+    DICT_FILE = "ngram_dict.json"
+    POSTINGS_FILE = "ngram_postings.bin"
+    BLOCK_SIZE = 128
+    TYPECODES = {1: 'B', 2: 'H', 4: 'I'}  # 간격 바이트 폭 -> array typecode
+    WORD_PATTERN = re.compile(r'\w+')
+    
+    def __init__(self, index_dir):
+        with open(os.path.join(index_dir, self.DICT_FILE), 'r', encoding='utf8') as f:
+            data = json.load(f)
+        self.metadata = data["metadata"]
+        self.grams = data["grams"]
+        self.fields = self.metadata["fields"]
+        self.block_size = self.metadata["block_size"]
+        self.fp = open(os.path.join(index_dir, self.POSTINGS_FILE), "rb")
+    
+    @classmethod
+    def exists(cls, index_dir):
+        """index_dir에 bigram 보조 인덱스가 있는지 확인"""
+        return os.path.exists(os.path.join(index_dir, cls.DICT_FILE))
+    
+    @staticmethod
+    def delta_width(max_delta):
+        """doc_id 간격 max_delta를 담을 수 있는 최소 바이트 폭"""
+        if max_delta < 1 << 8:
+            return 1
+        if max_delta < 1 << 16:
+            return 2
+        return 4
+    
+    def iter_blocks(self, entry):
+        """포스팅 블록 (첫 doc_id, 마지막 doc_id, 파일 위치, 바이트 폭, doc_id 수) 순회"""
+        offset = entry["start"]
+        remaining = entry["df"]
+        for first, last, width in entry["blocks"]:
+            count = min(self.block_size, remaining)
+            yield first, last, offset, width, count
+            offset += width * (count - 1)
+            remaining -= count
+    
+    def decode_block(self, first, offset, width, count):
+        """블록 하나의 doc_id 리스트 복원 (간격 배열을 누적합)"""
+        size = width * (count - 1)
+        self.fp.seek(offset)
+        data = self.fp.read(size)
+        if len(data) != size:
+            raise ValueError(f"Incomplete data read at offset {offset}")
+        deltas = array(self.TYPECODES[width])
+        deltas.frombytes(data)
+        return list(accumulate(deltas, initial=first))
+    
+    def read_postings(self, entry):
+        """포스팅 전체의 doc_id 리스트"""
+        doc_ids = []
+        for first, last, offset, width, count in self.iter_blocks(entry):
+            doc_ids.extend(self.decode_block(first, offset, width, count))
+        return doc_ids
+    
+    def lookup(self, word, field):
+        """field에 word의 bigram이 모두 등장하는 문서 doc_id 오름차순 리스트
+        
+        bigram이 모두 있지만 연속해서 등장하지 않는 문서도 포함될 수 있음 (2글자 단어는 정확)
+        """
+        grams = text_bigrams(word)
+        if not grams or field not in self.fields:
+            return []
+        
+        entries = []
+        for gram in grams:
+            entry = self.grams.get(gram, {}).get(field)
+            if entry is None:
+                return []
+            entries.append(entry)
+        entries.sort(key=lambda entry: entry["df"])
+        
+        candidates = self.read_postings(entries[0])
+        for entry in entries[1:]:
+            if not candidates:
+                break
+            survivors = []
+            lo = 0
+            for first, last, offset, width, count in self.iter_blocks(entry):
+                lo = bisect_left(candidates, first, lo)
+                if lo >= len(candidates):
+                    break
+                hi = bisect_right(candidates, last, lo)
+                if lo == hi:
+                    continue  # 후보가 없는 블록은 디코딩하지 않음
+                block = set(self.decode_block(first, offset, width, count))
+                survivors.extend(doc_id for doc_id in candidates[lo:hi] if doc_id in block)
+                lo = hi
+            candidates = survivors
+        
+        return candidates
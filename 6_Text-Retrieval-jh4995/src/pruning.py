@@ -0,0 +1,255 @@
+import os
+import json
+import math
+import random
+import shutil
+from array import array
+from .searcher import Searcher
+from .lexicon import Lexicon
+from .ngram import NgramIndex
+from .filters import FilterIndex
+
+
+class IndexPruner:
+    """기존 인덱스에서 BM25F 기여도가 작은 포스팅을 제거하여 더 작은 인덱스를 만드는 정적 pruning 도구
+    
+    method
+    - "term": term-centric. term마다 top_k번째 기여도 z_t를 기준으로 기여도 >= eps * z_t인 포스팅만 남김
+      (각 term의 상위 top_k개 포스팅은 항상 유지, eps는 전체 포스팅 중 keep_ratio만 남도록 결정)
+    - "doc": document-centric. 문서마다 기여도가 큰 순서로 term의 keep_ratio만 남김 (문서당 최소 1개)
+    
+    기여도는 필드 제한 없는 쿼리(T, A, C) 기준이며, 남은 포스팅의 점수가 바뀌지 않도록
+    df와 평균 문서 길이는 원본 값을 그대로 사용함
+    """
+    
+    METHODS = ("term", "doc")
+    FIELDS = ['T', 'A', 'C']
+    HISTOGRAM_BINS = 1000  # term-centric eps 결정용 (기여도 / z_t) 구간 수
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file, output_dir,
+                 method="term", keep_ratio=0.5, top_k=10):
+        if method not in self.METHODS:
+            raise ValueError(f"지원하지 않는 pruning 방식: {method}")
+        if not 0 < keep_ratio <= 1:
+            raise ValueError(f"keep_ratio는 0보다 크고 1 이하여야 합니다: {keep_ratio}")
+        self.index_dir = os.path.abspath(index_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        if self.output_dir == self.index_dir:
+            raise ValueError("pruning 결과는 원본 인덱스와 다른 디렉토리에 저장해야 합니다.")
+        self.doc_table_file = doc_table_file
+        self.term_dict_file = term_dict_file
+        self.postings_file = postings_file
+        self.method = method
+        self.keep_ratio = keep_ratio
+        self.top_k = top_k
+        self.searcher = Searcher(index_dir, doc_table_file, term_dict_file, postings_file,
+                                 use_impacts=False, use_ngrams=False, preload_tagger=False)
+        # 버전별 인덱스 디렉토리이면 CURRENT가 가리키는 버전을 원본으로 사용
+        self.index_dir = self.searcher.index_dir
+    
+    def contributions(self, term):
+        """term의 포스팅별 BM25F 기여도 {doc_id: score}"""
+        contributions = self.searcher.term_contributions(term, self.FIELDS)
+        self.searcher.clear_cache()
+        return contributions
+    
+    def term_threshold_base(self, scores):
+        """term-centric 기준값 z_t: top_k번째로 큰 기여도 (포스팅이 top_k개보다 적으면 최솟값)"""
+        if len(scores) <= self.top_k:
+            return min(scores)
+        return sorted(scores, reverse=True)[self.top_k - 1]
+    
+    def choose_term_epsilon(self, terms):
+        """1차 스캔: (기여도 / z_t)의 분포로 전체 포스팅 중 keep_ratio가 남는 eps 결정"""
+        histogram = [0] * self.HISTOGRAM_BINS
+        always_kept = 0
+        total = 0
+        for term in terms:
+            scores = list(self.contributions(term).values())
+            if not scores:
+                continue
+            base = self.term_threshold_base(scores)
+            total += len(scores)
+            for score in scores:
+                ratio = score / base
+                if ratio >= 1:
+                    always_kept += 1
+                else:
+                    histogram[int(ratio * self.HISTOGRAM_BINS)] += 1
+        
+        # 구간 위쪽부터 누적하여 목표 포스팅 수에 처음 도달하는 구간의 아래 경계를 eps로 사용
+        target = self.keep_ratio * total
+        kept = always_kept
+        for i in range(self.HISTOGRAM_BINS - 1, -1, -1):
+            if kept >= target:
+                return (i + 1) / self.HISTOGRAM_BINS
+            kept += histogram[i]
+        return 0.0
+    
+    def choose_doc_thresholds(self, terms):
+        """1차 스캔: 문서별로 기여도 상위 keep_ratio 경계값 계산 {doc_id: threshold}"""
+        doc_scores = {}
+        for term in terms:
+            for doc_id, score in self.contributions(term).items():
+                scores = doc_scores.get(doc_id)
+                if scores is None:
+                    scores = doc_scores[doc_id] = array('d')
+                scores.append(score)
+        
+        thresholds = {}
+        for doc_id, scores in doc_scores.items():
+            keep = max(1, math.ceil(self.keep_ratio * len(scores)))
+            thresholds[doc_id] = sorted(scores, reverse=True)[keep - 1]
+        return thresholds
+    
+    def kept_docs(self, term, epsilon=None, doc_thresholds=None):
+        """2차 스캔: (term에서 남길 doc_id 집합, 원본 포스팅 수)"""
+        contributions = self.contributions(term)
+        if not contributions:
+            return set(), 0
+        if self.method == "term":
+            threshold = epsilon * self.term_threshold_base(list(contributions.values()))
+            keep = {doc_id for doc_id, score in contributions.items() if score >= threshold}
+        else:
+            keep = {doc_id for doc_id, score in contributions.items() if score >= doc_thresholds[doc_id]}
+        return keep, len(contributions)
+    
+    def write_postings(self, terms, epsilon, doc_thresholds):
+        """남은 포스팅으로 postings.bin / term_dict.json 저장 (원본과 같은 레이아웃)
+        
+        반환값: (원본 포스팅 수, 남은 포스팅 수, 저장된 term_dict)
+        """
+        searcher = self.searcher
+        term_dict = {}
+        offset = 0
+        total_before = 0
+        total_after = 0
+        
+        with open(os.path.join(self.output_dir, self.postings_file), "wb") as pbin:
+            for term in terms:
+                keep, num_postings = self.kept_docs(term, epsilon, doc_thresholds)
+                entry = searcher.term_dict[term]
+                total_before += num_postings
+                total_after += len(keep)
+                if not keep:
+                    continue
+                
+                # df는 원본 값 유지 (idf가 바뀌지 않도록)
+                new_entry = {"df": entry["df"]}
+                if searcher.postings_layout == "merged":
+                    records = array('i')
+                    for posting in searcher.get_merged_postings(term):
+                        if posting[0] in keep:
+                            records.extend(posting)
+                    pbin.write(records.tobytes())
+                    new_entry["M"] = {"start": offset, "length": len(records) // 4}
+                    offset += len(records) * records.itemsize
+                else:
+                    for field in self.FIELDS:
+                        doc_ids, tfs = searcher.get_postings_arrays(term, field)
+                        records = array('i')
+                        for doc_id, tf in zip(doc_ids, tfs):
+                            if doc_id in keep:
+                                records.append(doc_id)
+                                records.append(tf)
+                        if not records:
+                            continue
+                        pbin.write(records.tobytes())
+                        # 남은 포스팅의 max_tf / min_len은 원본 값 이내이므로 원본 상한을 그대로 사용
+                        new_entry[field] = dict(entry[field], start=offset, length=len(records) // 2)
+                        offset += len(records) * records.itemsize
+                
+                term_dict[term] = new_entry
+                searcher.clear_cache()
+        
+        with open(os.path.join(self.output_dir, self.term_dict_file), 'w', encoding='utf8') as f:
+            json.dump(term_dict, f, ensure_ascii=False, indent=4)
+        
+        return total_before, total_after, term_dict
+    
+    def copy_side_files(self, term_dict):
+        """doc_table (pruning 정보 추가), lexicon, 그리고 포스팅과 무관한 보조 인덱스 복사"""
+        metadata = dict(self.searcher.metadata)
+        metadata["pruning"] = {
+            "method": self.method,
+            "keep_ratio": self.keep_ratio,
+            "top_k": self.top_k,
+            "source": self.index_dir
+        }
+        with open(os.path.join(self.output_dir, self.doc_table_file), 'w', encoding='utf8') as f:
+            json.dump({"metadata": metadata, "documents": self.searcher.doc_table}, f, ensure_ascii=False, indent=4)
+        
+        Lexicon.save(term_dict.keys(), os.path.join(self.output_dir, Lexicon.LEXICON_FILE))
+        
+        for name in (NgramIndex.DICT_FILE, NgramIndex.POSTINGS_FILE, FilterIndex.DICT_FILE, FilterIndex.POSTINGS_FILE):
+            path = os.path.join(self.index_dir, name)
+            if os.path.exists(path):
+                shutil.copy2(path, os.path.join(self.output_dir, name))
+    
+    def prune(self, sample_queries=200):
+        """pruning된 인덱스를 output_dir에 저장하고 크기 / 랭킹 품질 변화 보고"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        terms = sorted(self.searcher.term_dict)
+        
+        epsilon = None
+        doc_thresholds = None
+        if self.method == "term":
+            epsilon = self.choose_term_epsilon(terms)
+        else:
+            doc_thresholds = self.choose_doc_thresholds(terms)
+        
+        total_before, total_after, term_dict = self.write_postings(terms, epsilon, doc_thresholds)
+        self.copy_side_files(term_dict)
+        
+        size_before = os.path.getsize(os.path.join(self.index_dir, self.postings_file))
+        size_after = os.path.getsize(os.path.join(self.output_dir, self.postings_file))
+        overlap = self.evaluate(sample_queries)
+        
+        print(f"정적 pruning 완료 ({self.method}-centric, keep_ratio={self.keep_ratio})")
+        if epsilon is not None:
+            print(f"  - eps: {epsilon:.3f} (term별 top-{self.top_k} 기여도 대비)")
+        print(f"  - 포스팅 수: {total_before:,}개 -> {total_after:,}개 ({total_after / max(1, total_before):.2%})")
+        print(f"  - postings.bin: {size_before:,} bytes -> {size_after:,} bytes ({size_after / max(1, size_before):.2%})")
+        print(f"  - term 수: {len(terms):,}개 -> {len(term_dict):,}개")
+        if overlap is not None:
+            for k, value in overlap.items():
+                print(f"  - 샘플 쿼리 {sample_queries}개 top-{k} 일치율 (원본 대비): {value:.2%}")
+        print(f"  - {self.output_dir}")
+        return overlap
+    
+    def evaluate(self, sample_queries=200, top_ks=(5, 10)):
+        """원본과 pruning된 인덱스의 top-k 일치율 {k: 평균 일치율}
+        
+        샘플 쿼리는 df에 비례하여 뽑은 2~3개 term (실제 쿼리처럼 흔한 term이 자주 포함되도록)
+        """
+        original = self.searcher
+        terms = sorted(original.term_dict)
+        if not terms or sample_queries <= 0:
+            return None
+        weights = [original.term_dict[term]["df"] for term in terms]
+        pruned = Searcher(self.output_dir, self.doc_table_file, self.term_dict_file, self.postings_file,
+                          use_impacts=False, use_ngrams=False, preload_tagger=False)
+        
+        rng = random.Random(0)
+        overlaps = {k: [] for k in top_ks}
+        try:
+            for _ in range(sample_queries):
+                query_terms = list(dict.fromkeys(rng.choices(terms, weights, k=rng.randint(2, 3))))
+                rankings = []
+                for searcher in (original, pruned):
+                    candidates = sorted(searcher.get_candidate_docs(query_terms, self.FIELDS, False))
+                    scores = searcher.score_docs_sorted(query_terms, candidates, self.FIELDS)
+                    rankings.append(sorted(scores, key=lambda d: (-scores[d], d)))
+                    searcher.clear_cache()
+                exact, approx = rankings
+                if not exact:
+                    continue
+                for k in top_ks:
+                    exact_top = set(exact[:k])
+                    overlaps[k].append(len(exact_top & set(approx[:k])) / len(exact_top))
+        finally:
+            pruned.close()
+        
+        if not overlaps[top_ks[0]]:
+            return None
+        return {k: sum(values) / len(values) for k, values in overlaps.items()}
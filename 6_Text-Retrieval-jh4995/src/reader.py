@@ -0,0 +1,110 @@
+import re
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FieldReader:
+    """특허 JSON 문서에서 invention_title, abstract, claims 세 필드만 읽는 reader
+    
+    backend
+    - "orjson": orjson(C 구현)으로 파싱 후 세 필드만 사용 (설치된 경우 기본값)
+    - "selective": 표준 json으로 세 필드의 값만 디코딩하고 나머지 메타데이터는 파싱하지 않음
+    - "json": 표준 json.loads로 전체 파싱
+    
+    metadata_fields로 dataset의 다른 키(예: "ipc")를 지정하면 세 필드 뒤에 그 값들도 함께 반환함
+    """
+    
+    BACKENDS = ("orjson", "selective", "json")
+    FIELDS = ('invention_title', 'abstract', 'claims')
+    
+    # JSON 문자열 안의 따옴표는 \"로 escape되므로 [{,] 뒤의 "key": 패턴은 실제 key에서만 매칭됨
+    DATASET_PATTERN = re.compile(r'[{,]\s*"dataset"\s*:\s*\{')
+    KEY_PATTERNS = {field: re.compile(r'[{,]\s*"' + field + r'"\s*:\s*') for field in FIELDS}
+    
+    def __init__(self, backend=None, io_workers=4, prefetch=64, metadata_fields=()):
+        if backend is None:
+            backend = "orjson" if orjson is not None else "selective"
+        if backend not in self.BACKENDS:
+            raise ValueError(f"지원하지 않는 JSON backend: {backend}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("orjson이 설치되어 있지 않습니다.")
+        self.backend = backend
+        self.io_workers = io_workers
+        self.prefetch = prefetch
+        self.decoder = json.JSONDecoder()
+        self.metadata_fields = tuple(metadata_fields)
+        self.key_patterns = dict(self.KEY_PATTERNS)
+        for field in self.metadata_fields:
+            self.key_patterns[field] = re.compile(r'[{,]\s*"' + re.escape(field) + r'"\s*:\s*')
+    
+    def fields_from_data(self, data):
+        """파싱된 문서에서 (title, abstract, claims, 메타데이터 값...) 추출"""
+        dataset = data['dataset']
+        title = dataset.get('invention_title', '')
+        abstract = dataset.get('abstract', '')
+        claims = dataset.get('claims', '')
+        if not self.metadata_fields:
+            return title, abstract, claims
+        return (title, abstract, claims) + tuple(dataset.get(field, '') for field in self.metadata_fields)
+    
+    def extract_selective(self, text):
+        """dataset 안의 세 필드 (및 메타데이터 필드) 값만 raw_decode로 디코딩 (key를 찾지 못하면 None)"""
+        match = self.DATASET_PATTERN.search(text)
+        if match is None:
+            return None
+        
+        values = []
+        dataset_start = match.end() - 1
+        for field in self.FIELDS + self.metadata_fields:
+            key_match = self.key_patterns[field].search(text, dataset_start)
+            if key_match is None:
+                return None
+            value, _ = self.decoder.raw_decode(text, key_match.end())
+            values.append(value)
+        return tuple(values)
+    
+    def read_fields(self, file_path):
+        """파일 하나에서 (title, abstract, claims) 읽기"""
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        
+        if self.backend == "orjson":
+            return self.fields_from_data(orjson.loads(raw))
+        
+        text = raw.decode('utf8')
+        if self.backend == "selective":
+            try:
+                fields = self.extract_selective(text)
+            except ValueError:
+                fields = None
+            if fields is not None:
+                return fields
+        
+        # 필드가 없는 문서 등은 전체 파싱으로 처리 (없는 필드는 '')
+        return self.fields_from_data(json.loads(text))
+    
+    def iter_fields(self, file_paths):
+        """파일들을 백그라운드 I/O 스레드에서 미리 읽어 두고 입력 순서대로 (path, (title, abstract, claims)) 반환
+        
+        호출 측이 앞 문서를 토큰화하는 동안 다음 prefetch개 문서의 읽기/파싱이 진행됨
+        """
+        paths = iter(file_paths)
+        with ThreadPoolExecutor(max_workers=self.io_workers) as executor:
+            window = deque()
+            for file_path in paths:
+                window.append((file_path, executor.submit(self.read_fields, file_path)))
+                if len(window) >= self.prefetch:
+                    break
+            
+            while window:
+                file_path, future = window.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    window.append((next_path, executor.submit(self.read_fields, next_path)))
+                yield file_path, future.result()
@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import random
+from array import array
+from .searcher import Searcher
+from .lexicon import Lexicon
+from .ngram import NgramIndex, NgramBuffer
+from .filters import Bitmap, FilterBuilder, FilterIndex
+from .impact import ImpactBuilder
+
+
+class DocReorderer:
+    """인덱스 구축 후 doc_id를 다시 부여하여 포스팅의 doc_id 간격을 줄이는 후처리 도구
+    
+    os.walk 순서로 부여된 doc_id는 디렉토리 구조를 따르므로 비슷한 문서가 흩어져 있음
+    비슷한 문서에 연속된 doc_id를 주면 포스팅의 doc_id 간격이 작아져서
+    - delta 압축 포스팅(ngram_postings.bin)과 Bitmap 필터(filters.bin)가 작아지고
+    - AND 교집합의 galloping 탐색이 더 많은 구간을 건너뜀
+    
+    method
+    - "title": 제목 문자열 순서 (URL 정렬과 같은 방식의 값싼 기준)
+    - "minhash": 문서별 term 집합의 minhash 서명 순서 (term 집합이 겹치는 문서끼리 인접)
+    
+    새 doc_id -> 원본 doc_id 매핑은 doc_map.bin(array('i'))으로 저장하고, doc_table 메타데이터에 기록함
+    """
+    
+    METHODS = ("title", "minhash")
+    FIELDS = ['T', 'A', 'C']
+    MAP_FILE = "doc_map.bin"
+    NUM_HASHES = 4  # minhash 서명 길이
+    HASH_PRIME = (1 << 61) - 1
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file, output_dir, method="minhash"):
+        if method not in self.METHODS:
+            raise ValueError(f"지원하지 않는 doc_id 재배치 방식: {method}")
+        self.output_dir = os.path.abspath(output_dir)
+        self.doc_table_file = doc_table_file
+        self.term_dict_file = term_dict_file
+        self.postings_file = postings_file
+        self.method = method
+        self.searcher = Searcher(index_dir, doc_table_file, term_dict_file, postings_file,
+                                 use_impacts=False, use_ngrams=False, preload_tagger=False)
+        # 버전별 인덱스 디렉토리이면 CURRENT가 가리키는 버전을 원본으로 사용
+        self.index_dir = self.searcher.index_dir
+        if self.output_dir == self.index_dir:
+            raise ValueError("재배치 결과는 원본 인덱스와 다른 디렉토리에 저장해야 합니다.")
+    
+    def term_doc_ids(self, term):
+        """term이 어느 필드에든 등장하는 문서 doc_id 집합"""
+        doc_ids = self.searcher.get_term_docs(term, self.FIELDS)
+        self.searcher.clear_cache()
+        return doc_ids
+    
+    def title_order(self):
+        """제목(대소문자 무시), 원본 doc_id 순서의 원본 doc_id 리스트"""
+        doc_table = self.searcher.doc_table
+        return sorted(range(self.searcher.N), key=lambda doc_id: (doc_table[str(doc_id)]["T_text"].lower(), doc_id))
+    
+    def minhash_order(self):
+        """문서별 term 집합의 minhash 서명 (사전순), 원본 doc_id 순서의 원본 doc_id 리스트
+        
+        두 문서의 서명 첫 값이 같을 확률은 term 집합의 Jaccard 유사도와 같으므로,
+        서명으로 정렬하면 term을 많이 공유하는 문서끼리 모임
+        """
+        rng = random.Random(0)
+        coefficients = [(rng.randrange(1, self.HASH_PRIME), rng.randrange(self.HASH_PRIME))
+                        for _ in range(self.NUM_HASHES)]
+        # term이 하나도 없는 문서는 맨 뒤로
+        signatures = [[self.HASH_PRIME] * self.NUM_HASHES for _ in range(self.searcher.N)]
+        
+        # df가 1인 term은 문서 사이의 유사도에 기여하지 않으므로 제외
+        terms = [term for term in sorted(self.searcher.term_dict) if self.searcher.term_dict[term]["df"] > 1]
+        for term_id, term in enumerate(terms):
+            hashes = [(a * term_id + b) % self.HASH_PRIME for a, b in coefficients]
+            for doc_id in self.term_doc_ids(term):
+                signature = signatures[doc_id]
+                for i, value in enumerate(hashes):
+                    if value < signature[i]:
+                        signature[i] = value
+        
+        return sorted(range(self.searcher.N), key=lambda doc_id: (signatures[doc_id], doc_id))
+    
+    def compute_order(self):
+        """새 doc_id 순서대로의 원본 doc_id 리스트"""
+        if self.method == "title":
+            return self.title_order()
+        return self.minhash_order()
+    
+    @staticmethod
+    def gap_bits(doc_ids):
+        """doc_id 오름차순 리스트를 간격의 Elias-gamma 부호로 저장할 때의 비트 수 (간격이 작을수록 짧음)"""
+        total = 0
+        prev = -1
+        for doc_id in doc_ids:
+            total += 2 * (doc_id - prev).bit_length() - 1
+            prev = doc_id
+        return total
+    
+    def write_postings(self, new_ids):
+        """doc_id를 바꾼 postings.bin / term_dict.json 저장 (원본과 같은 레이아웃, 포스팅은 새 doc_id 오름차순)
+        
+        반환값: (원본 간격 gamma 비트 수, 재배치 후 간격 gamma 비트 수)
+        """
+        searcher = self.searcher
+        term_dict = {}
+        offset = 0
+        gaps_before = 0
+        gaps_after = 0
+        
+        with open(os.path.join(self.output_dir, self.postings_file), "wb") as pbin:
+            for term in sorted(searcher.term_dict):
+                entry = searcher.term_dict[term]
+                new_entry = {"df": entry["df"]}
+                if searcher.postings_layout == "merged":
+                    postings = searcher.get_merged_postings(term)
+                    remapped = sorted((new_ids[p[0]],) + tuple(p[1:]) for p in postings)
+                    gaps_before += self.gap_bits([p[0] for p in postings])
+                    gaps_after += self.gap_bits([p[0] for p in remapped])
+                    records = array('i', [value for posting in remapped for value in posting])
+                    pbin.write(records.tobytes())
+                    new_entry["M"] = {"start": offset, "length": len(remapped)}
+                    offset += len(records) * records.itemsize
+                else:
+                    for field in self.FIELDS:
+                        if field not in entry:
+                            continue
+                        doc_ids, tfs = searcher.get_postings_arrays(term, field)
+                        remapped = sorted(zip((new_ids[doc_id] for doc_id in doc_ids), tfs))
+                        gaps_before += self.gap_bits(doc_ids)
+                        gaps_after += self.gap_bits([doc_id for doc_id, _ in remapped])
+                        records = array('i', [value for posting in remapped for value in posting])
+                        pbin.write(records.tobytes())
+                        new_entry[field] = dict(entry[field], start=offset, length=len(remapped))
+                        offset += len(records) * records.itemsize
+                term_dict[term] = new_entry
+                searcher.clear_cache()
+        
+        with open(os.path.join(self.output_dir, self.term_dict_file), 'w', encoding='utf8') as f:
+            json.dump(term_dict, f, ensure_ascii=False, indent=4)
+        
+        return gaps_before, gaps_after
+    
+    def write_doc_table(self, order):
+        """새 doc_id 순서의 doc_table과 doc_map.bin (새 doc_id -> 원본 doc_id) 저장"""
+        metadata = dict(self.searcher.metadata)
+        metadata["reorder"] = {
+            "method": self.method,
+            "source": self.index_dir,
+            "map_file": self.MAP_FILE
+        }
+        documents = {}
+        for new_id, old_id in enumerate(order):
+            doc_info = dict(self.searcher.doc_table[str(old_id)])
+            doc_info["doc_id"] = new_id
+            documents[new_id] = doc_info
+        with open(os.path.join(self.output_dir, self.doc_table_file), 'w', encoding='utf8') as f:
+            json.dump({"metadata": metadata, "documents": documents}, f, ensure_ascii=False, indent=4)
+        
+        with open(os.path.join(self.output_dir, self.MAP_FILE), "wb") as f:
+            array('i', order).tofile(f)
+    
+    def write_ngram_index(self, new_ids):
+        """bigram 보조 인덱스를 새 doc_id로 다시 압축하여 저장 (원본에 없으면 생략)"""
+        if not NgramIndex.exists(self.index_dir):
+            return False
+        source = NgramIndex(self.index_dir)
+        buffer = NgramBuffer(source.fields)
+        for gram, field_entries in source.grams.items():
+            for field, entry in field_entries.items():
+                buffer.postings[field][gram] = array('i', sorted(new_ids[doc_id] for doc_id in source.read_postings(entry)))
+        source.fp.close()
+        buffer.save(self.output_dir)
+        return True
+    
+    def write_filter_index(self, new_ids):
+        """메타데이터 필터를 새 doc_id로 다시 저장 (원본에 없으면 생략)"""
+        if not FilterIndex.exists(self.index_dir):
+            return False
+        source = FilterIndex(self.index_dir)
+        builder = FilterBuilder({name: (info["key"], info["kind"]) for name, info in source.metadata.items()})
+        for name, info in source.metadata.items():
+            entry = source.filters[name]
+            if info["kind"] == "category":
+                for value, (offset, length) in entry.items():
+                    bitmap = Bitmap.from_bytes(source.read(offset, length))
+                    builder.categories[name][value] = array('i', sorted(new_ids[doc_id] for doc_id in bitmap))
+            else:
+                length = entry["length"]
+                values = array('i')
+                values.frombytes(source.read(entry["start"], 4 * length))
+                doc_ids = array('i')
+                doc_ids.frombytes(source.read(entry["start"] + 4 * length, 4 * length))
+                builder.columns[name] = [(value, new_ids[doc_id]) for value, doc_id in zip(values, doc_ids)]
+        source.fp.close()
+        builder.save(self.output_dir)
+        return True
+    
+    def write_impact_index(self):
+        """원본에 impact 인덱스가 있으면 같은 설정으로 새 인덱스에서 다시 생성"""
+        impact_dict_path = os.path.join(self.index_dir, Searcher.IMPACT_DICT_FILE)
+        if not os.path.exists(impact_dict_path):
+            return False
+        with open(impact_dict_path, 'r', encoding='utf8') as f:
+            impact_metadata = json.load(f)["metadata"]
+        builder = ImpactBuilder(self.output_dir, self.doc_table_file, self.term_dict_file, self.postings_file,
+                                impact_metadata["bits"], impact_metadata.get("order", "doc"))
+        builder.build()
+        builder.searcher.close()
+        return True
+    
+    def file_size(self, index_dir, name):
+        """index_dir/name의 바이트 수 (없으면 0)"""
+        path = os.path.join(index_dir, name)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+    
+    def benchmark(self, index_dir, queries, repeat=3):
+        """AND 쿼리들의 후보 교집합 + 점수 계산 시간 (ms, repeat회 중 최솟값)"""
+        searcher = Searcher(index_dir, self.doc_table_file, self.term_dict_file, self.postings_file,
+                            use_impacts=False, use_ngrams=False, preload_tagger=False)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for query_terms in queries:
+                candidates = searcher.get_candidate_docs(query_terms, self.FIELDS, True)
+                searcher.score_docs_sorted(query_terms, sorted(candidates), self.FIELDS)
+                searcher.clear_cache()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        searcher.close()
+        return best
+    
+    def sample_queries(self, count):
+        """df에 비례하여 뽑은 2~3개 term AND 쿼리 (원본과 재배치 인덱스에 같은 쿼리 사용)"""
+        terms = sorted(self.searcher.term_dict)
+        if not terms or count <= 0:
+            return []
+        weights = [self.searcher.term_dict[term]["df"] for term in terms]
+        rng = random.Random(0)
+        return [list(dict.fromkeys(rng.choices(terms, weights, k=rng.randint(2, 3)))) for _ in range(count)]
+    
+    def reorder(self, sample_queries=200):
+        """doc_id를 재배치한 인덱스를 output_dir에 저장하고 간격 / 파일 크기 / AND 쿼리 시간 변화 보고"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        order = self.compute_order()
+        new_ids = array('i', bytes(4 * len(order)))
+        for new_id, old_id in enumerate(order):
+            new_ids[old_id] = new_id
+        
+        gaps_before, gaps_after = self.write_postings(new_ids)
+        self.write_doc_table(order)
+        Lexicon.save(self.searcher.term_dict.keys(), os.path.join(self.output_dir, Lexicon.LEXICON_FILE))
+        side_files = []
+        if self.write_ngram_index(new_ids):
+            side_files.append(NgramIndex.POSTINGS_FILE)
+        if self.write_filter_index(new_ids):
+            side_files.append(FilterIndex.POSTINGS_FILE)
+        self.write_impact_index()
+        
+        queries = self.sample_queries(sample_queries)
+        time_before = self.benchmark(self.index_dir, queries)
+        time_after = self.benchmark(self.output_dir, queries)
+        
+        print(f"doc_id 재배치 완료 ({self.method}, 문서 {len(order):,}개)")
+        print(f"  - 포스팅 doc_id 간격 (Elias-gamma 기준): {gaps_before // 8:,} bytes -> {gaps_after // 8:,} bytes ({gaps_after / max(1, gaps_before):.2%})")
+        for name in side_files:
+            size_before = self.file_size(self.index_dir, name)
+            size_after = self.file_size(self.output_dir, name)
+            print(f"  - {name}: {size_before:,} bytes -> {size_after:,} bytes ({size_after / max(1, size_before):.2%})")
+        if queries:
+            print(f"  - 샘플 AND 쿼리 {len(queries)}개: {time_before:.1f} ms -> {time_after:.1f} ms")
+        print(f"  - {self.output_dir}")
+        return order
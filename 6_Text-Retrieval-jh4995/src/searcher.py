@@ -3,7 +3,62 @@ import json
 import struct
 import math
 import re
-from .tokenizer import extract_terms
+import time
+import heapq
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from bisect import bisect_left
+from .tokenizer import extract_terms, start_tagger, startup_times as tagger_startup_times
+from .reader import FieldReader
+from .lexicon import Lexicon
+from .ngram import NgramIndex
+from .filters import FilterIndex
+from .versions import IndexVersions
+
+
+def gallop(arr, target, lo):
+    """정렬된 arr[lo:]에서 target 이상인 첫 위치를 galloping(지수) 탐색으로 찾기"""
+    n = len(arr)
+    if lo >= n or arr[lo] >= target:
+        return lo
+    
+    # arr[lo + step] >= target이 될 때까지 step을 두 배씩 늘린 뒤 그 구간에서 이진 탐색
+    step = 1
+    while lo + step < n and arr[lo + step] < target:
+        lo += step
+        step *= 2
+    return bisect_left(arr, target, lo + 1, min(n, lo + step + 1))
+
+
+class QueryError(ValueError):
+    """형식이 잘못되어 검색할 수 없는 쿼리 (메시지를 그대로 사용자에게 출력)"""
+
+
+@dataclass
+class SearchResult:
+    """검색 결과 문서 하나"""
+    rank: int  # 1부터 시작하는 전체 순위
+    doc_id: int
+    filename: str
+    score: float
+    snippets: list = None  # [(필드, 강조 표시된 snippet), ...] (snippet을 요청한 경우만)
+
+
+@dataclass
+class SearchResponse:
+    """search()의 결과 페이지"""
+    query: str
+    total: int  # 점수가 있는 전체 문서 수
+    offset: int
+    results: list  # SearchResult 리스트
+    verbose: bool = False  # results에 snippet 포함 여부
+    exact: bool = True  # anytime 검색 예산이 소진되어 근사 결과이면 False
+    filter_count: int = None  # 메타데이터 필터를 통과한 문서 수 (필터가 없으면 None)
+    total_exact: bool = True  # False면 total은 하한 (tiered 평가에서 디스크 tier만 읽어야 찾을 수 있는 문서는 세지 않음)
+    notices: list = field(default_factory=list)  # 오타 보정 / 와일드카드 / n-gram 보조 검색 / 인덱스 교체 안내 메시지
+
 
 class Searcher:
     
@@ -12,32 +67,370 @@ class Searcher:
     FIELD_WEIGHTS = {'T': 2.5, 'A': 1.5, 'C': 1.1}
     FIELD_B = {'T': 0.3, 'A': 0.75, 'C': 0.8}
     FIELD_NAMES = {'T': 'TITLE', 'A': 'ABSTRACT', 'C': 'CLAIMS'}
+    # merged 레이아웃 포스팅 (doc_id, tf_T, tf_A, tf_C)에서 필드별 tf 위치
+    FIELD_INDEX = {'T': 1, 'A': 2, 'C': 3}
     WINDOW_SIZE = 80
+    DISPLAY_TOP_K = 5  # process_query()가 출력하는 결과 수
+    
+    # 양자화 BM25F impact 인덱스 (ImpactBuilder가 생성, 선택 사항)
+    IMPACT_DICT_FILE = "impact_dict.json"
+    IMPACT_POSTINGS_FILE = "impacts.bin"
+    IMPACT_FORMATS = {8: "<iB", 16: "<iH"}  # 비트 수별 (doc_id, impact) 포맷
+    
+    # 와일드카드 term 하나가 확장될 수 있는 최대 term 수
+    MAX_WILDCARD_EXPANSIONS = 50
+    
+    # 새 인덱스 버전으로 교체하기 전에 미리 읽어 둘 자주 검색된 term 수
+    WARM_TERMS = 100
     
-    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file):
-        self.index_dir = os.path.abspath(index_dir)
+    # 포스팅 warmup 방식과 term access log 설정
+    WARMUP_MODES = ("preload", "prefetch")
+    ACCESS_LOG_FLUSH = 20  # 쿼리 수
+    ACCESS_LOG_MAX_TERMS = 100000
+    
+    # tiered 평가 (tier_fields 포스팅은 메모리, 나머지 필드 포스팅은 디스크)
+    TIER_EPSILON = 1e-9  # 점수 상한 / 하한 비교의 부동소수점 오차 여유
+    TIER_PROBE_BYTES = 4096  # 디스크 포스팅 이진 탐색 한 단계의 비용 추정 (바이트, 페이지 하나)
+    
+    def __init__(self, index_dir, doc_table_file, term_dict_file, postings_file, use_impacts=True,
+                 time_budget=None, postings_budget=None, fuzzy=False, use_ngrams=True, ngram_untagged_words=False,
+                 auto_reload=False, reload_interval=1.0, access_log=None, warmup_terms=0,
+                 warmup_budget=64 * 1024 * 1024, warmup_mode="preload", preload_tagger=True,
+                 tier_fields=None):
+        # 시작 시간 내역 (print_startup_times()), 인덱스 파일별 시간은 load_times
+        start = time.perf_counter()
+        self.startup_times = {}
+        
+        # 형태소 분석기(JVM)는 인덱스를 읽는 동안 백그라운드에서 생성 (False면 첫 쿼리에서 생성)
+        if preload_tagger:
+            start_tagger()
+        
+        self.doc_table_file = doc_table_file
+        self.term_dict_file = term_dict_file
+        self.postings_file = postings_file
+        self.use_impacts = use_impacts
+        self.use_ngrams = use_ngrams
+        # True면 인덱스에 없는 query term 외에 형태소 분석에서 term이 하나도 나오지 않은 검색어 단어도 bigram 보조 검색
+        # (조사 / 용언 / 부사만으로 된 단어도 해당되어 일반 쿼리의 결과가 바뀔 수 있으므로 기본값은 False)
+        self.ngram_untagged_words = ngram_untagged_words
         
-        term_dict_path = os.path.join(self.index_dir, term_dict_file)
+        self.virtual_terms = []  # 현재 쿼리에서 term_dict에 임시 등록한 가상 term (와일드카드, n-gram 보조 검색)
+        self.fuzzy = fuzzy  # True면 [FUZZY] 없이도 모든 쿼리에서 오타 보정
+        
+        # impact-ordered 인덱스의 anytime 검색 예산 (쿼리당 초 / 포스팅 수, None이면 제한 없음)
+        self.time_budget = time_budget
+        self.postings_budget = postings_budget
+        
+        # index_dir이 버전별 인덱스 root(CURRENT 포인터가 있음)이면 현재 버전을 로드하고,
+        # auto_reload=True이면 쿼리 사이에 새 버전을 확인하여 백그라운드에서 로드한 뒤 교체
+        self.versions = IndexVersions(index_dir) if IndexVersions.is_versioned(index_dir) else None
+        self.version = self.versions.current() if self.versions is not None else None
+        self.auto_reload = auto_reload and self.versions is not None
+        self.reload_interval = reload_interval
+        self.next_reload_check = 0.0
+        self.reload_lock = threading.Lock()
+        self.reload_thread = None
+        self.pending_index = None  # 백그라운드에서 로드가 끝난 (버전, 인덱스 상태)
+        self.failed_version = None
+        self.reload_error = None  # 백그라운드 로드 실패 메시지 (다음 쿼리의 notices로 전달)
+        
+        # query term별 사용 횟수 (warmup 대상 선정), access_log 파일이 주어지면 이전 실행의 기록부터 이어서 누적
+        if access_log is not None and not os.path.isabs(access_log):
+            access_log = os.path.join(index_dir, access_log)
+        self.access_log = access_log
+        mark = time.perf_counter()
+        self.term_access = self.load_access_log()
+        self.startup_times["access_log"] = time.perf_counter() - mark
+        self.queries_since_flush = 0
+        
+        # warmup: 자주 검색된 상위 warmup_terms개 term의 포스팅을 warmup_budget 바이트 이내에서 미리 읽기
+        # - "preload": 포스팅 바이트를 메모리(resident_postings)에 올려 두고 파일 대신 사용
+        # - "prefetch": OS에 해당 구간을 미리 읽도록 요청 (posix_fadvise, 없으면 한 번 읽어서 페이지 캐시에 올림)
+        if warmup_mode not in self.WARMUP_MODES:
+            raise ValueError(f"지원하지 않는 warmup mode: {warmup_mode}")
+        self.warmup_terms = warmup_terms
+        self.warmup_budget = warmup_budget
+        self.warmup_mode = warmup_mode
+        self.warmup_thread = None
+        
+        # tiered 평가: tier_fields(예: ('T', 'A'))의 포스팅을 시작 시 모두 메모리에 올리고,
+        # 나머지 필드는 메모리 tier만으로 top-k가 확정되지 않는 경우에만 디스크에서 조회 (field 레이아웃만)
+        for field in tier_fields or ():
+            if field not in self.FIELD_WEIGHTS:
+                raise ValueError(f"지원하지 않는 tier 필드: {field}")
+        self.tier_fields = tuple(tier_fields or ())
+        # {"tiered" / "fallback": tiered / 전체 평가한 쿼리 수, "disk_read" / "disk_skipped": 디스크 포스팅을 읽은 / 읽지 않은 term 수,
+        #  "candidates": 점수를 계산한 후보 문서 수}
+        self.tier_counts = Counter()
+        
+        if self.versions is not None:
+            if self.version is None:
+                raise ValueError(f"CURRENT 포인터를 읽을 수 없습니다: {self.versions.current_path}")
+            index_dir = self.versions.path(self.version)
+        mark = time.perf_counter()
+        self.swap_index(self.load_index(index_dir))
+        self.startup_times["load_index"] = time.perf_counter() - mark
+        
+        # 시작 직후부터 검색할 수 있도록 warmup은 백그라운드 스레드에서 진행
+        if self.warmup_terms and self.term_access:
+            hot_terms = [term for term, _ in self.term_access.most_common(self.warmup_terms)]
+            self.warmup_thread = threading.Thread(target=self.warm_postings,
+                                                  args=(self.current_state(), hot_terms), daemon=True)
+            self.warmup_thread.start()
+        
+        # VERBOSE 출력 시 원본 문서에서 세 필드만 읽기
+        self.reader = FieldReader()
+        self.startup_times["total"] = time.perf_counter() - start
+    
+    def load_index(self, index_dir):
+        """index_dir의 인덱스 파일들을 읽어서 인덱스 상태 {속성 이름: 값} 반환 (Searcher 속성은 바꾸지 않음)"""
+        state = {"index_dir": os.path.abspath(index_dir)}
+        index_dir = state["index_dir"]
+        
+        # 단계별 소요 시간 {단계: 초} (state["load_times"])
+        load_times = {}
+        last = time.perf_counter()
+        
+        def lap(name):
+            nonlocal last
+            now = time.perf_counter()
+            load_times[name] = now - last
+            last = now
+        
+        term_dict_path = os.path.join(index_dir, self.term_dict_file)
         with open(term_dict_path, 'r', encoding='utf8') as f:
-            self.term_dict = json.load(f)
+            state["term_dict"] = json.load(f)
+        lap("term_dict")
         
-        doc_table_path = os.path.join(self.index_dir, doc_table_file)
+        doc_table_path = os.path.join(index_dir, self.doc_table_file)
         with open(doc_table_path, 'r', encoding='utf8') as f:
             doc_data = json.load(f)
-            self.metadata = doc_data["metadata"]
-            self.doc_table = doc_data["documents"]
-        
-        self.N = len(self.doc_table)
-        self.avgdl = {
-            'T': self.metadata["avgdl_T"],
-            'A': self.metadata["avgdl_A"],
-            'C': self.metadata["avgdl_C"]
+            metadata = doc_data["metadata"]
+            state["metadata"] = metadata
+            state["doc_table"] = doc_data["documents"]
+        lap("doc_table")
+        
+        state["N"] = len(state["doc_table"])
+        state["postings_layout"] = metadata.get("postings_layout", "field")
+        
+        # 와일드카드 확장용 정렬된 lexicon (Indexer가 저장한 파일이 없으면 term_dict로 생성)
+        lexicon_path = os.path.join(index_dir, Lexicon.LEXICON_FILE)
+        if os.path.exists(lexicon_path):
+            state["lexicon"] = Lexicon.load(lexicon_path)
+        else:
+            state["lexicon"] = Lexicon(sorted(state["term_dict"]))
+        lap("lexicon")
+        state["avgdl"] = {
+            'T': metadata["avgdl_T"],
+            'A': metadata["avgdl_A"],
+            'C': metadata["avgdl_C"]
         }
         
-        postings_path = os.path.join(self.index_dir, postings_file)
-        self.fp = open(postings_path, "rb")
+        postings_path = os.path.join(index_dir, self.postings_file)
+        state["fp"] = open(postings_path, "rb")
+        state["resident_postings"] = {}  # warmup으로 메모리에 올린 포스팅 구간 {시작 위치: bytes}
+        
+        # tier_fields 포스팅은 warmup과 같은 resident_postings에 모두 올려 둠
+        state["tier_bytes"] = 0
+        if self.tier_fields and state["postings_layout"] == "field":
+            ranges = sorted((entry[field]["start"], 8 * entry[field]["length"])
+                            for entry in state["term_dict"].values() for field in self.tier_fields if field in entry)
+            for start, size in ranges:
+                state["fp"].seek(start)
+                state["resident_postings"][start] = state["fp"].read(size)
+            state["tier_bytes"] = sum(size for _, size in ranges)
+        lap("tiers")
         
+        # impact 인덱스가 있으면 함께 로드
+        state["impact_dict"] = None
+        state["impact_metadata"] = None
+        state["impact_fp"] = None
+        impact_dict_path = os.path.join(index_dir, self.IMPACT_DICT_FILE)
+        if self.use_impacts and os.path.exists(impact_dict_path):
+            with open(impact_dict_path, 'r', encoding='utf8') as f:
+                impact_data = json.load(f)
+                state["impact_metadata"] = impact_data["metadata"]
+                state["impact_dict"] = impact_data["terms"]
+            state["impact_fp"] = open(os.path.join(index_dir, self.IMPACT_POSTINGS_FILE), "rb")
+        lap("impacts")
+        
+        # 문자 bigram 보조 인덱스가 있으면 인덱스에 없는 query term을 bigram 교집합으로 검색
+        state["ngram_index"] = None
+        if self.use_ngrams and NgramIndex.exists(index_dir):
+            state["ngram_index"] = NgramIndex(index_dir)
+        lap("ngrams")
+        
+        # 메타데이터 필터 인덱스가 있으면 [CLASS=...], [YEAR>=...] 같은 필터 prefix 사용 가능
+        state["filter_index"] = None
+        if FilterIndex.exists(index_dir):
+            state["filter_index"] = FilterIndex(index_dir)
+        lap("filters")
+        
+        state["load_times"] = load_times
+        return state
+    
+    def swap_index(self, state):
+        """load_index()로 읽은 인덱스 상태로 교체하고 이전 인덱스의 파일을 닫음 (쿼리 사이에만 호출)"""
+        old_files = self.index_files() if hasattr(self, "fp") else []
+        
+        for name, value in state.items():
+            setattr(self, name, value)
         self.postings_cache = {}
+        
+        for fp in old_files:
+            fp.close()
+    
+    def index_files(self):
+        """현재 인덱스가 열어 둔 파일 목록"""
+        files = [self.fp, self.impact_fp]
+        files += [index.fp for index in (self.ngram_index, self.filter_index) if index is not None]
+        return [fp for fp in files if fp is not None]
+    
+    def postings_ranges(self, term_dict, postings_layout, term):
+        """term의 포스팅이 postings.bin에서 차지하는 (시작 위치, 바이트 수) 리스트"""
+        entry = term_dict.get(term)
+        if entry is None:
+            return []
+        if postings_layout == "merged":
+            return [(entry["M"]["start"], 16 * entry["M"]["length"])]
+        return [(entry[field]["start"], 8 * entry[field]["length"]) for field in ['T', 'A', 'C'] if field in entry]
+    
+    def current_state(self):
+        """warm_postings()에 넘길 현재 인덱스 상태"""
+        return {
+            "index_dir": self.index_dir,
+            "term_dict": self.term_dict,
+            "postings_layout": self.postings_layout,
+            "resident_postings": self.resident_postings
+        }
+    
+    def warm_postings(self, state, terms):
+        """terms의 포스팅 구간을 warmup_budget 바이트 이내에서 미리 읽기 (백그라운드 스레드에서 호출)
+        
+        검색 스레드와 파일 위치를 공유하지 않도록 postings.bin을 따로 열어서 읽음
+        예산을 넘는 term은 건너뛰고 다음 (더 작은) term을 계속 시도함
+        반환값: (warmup한 term 수, 사용한 바이트 수)
+        """
+        resident = state["resident_postings"]
+        used = 0
+        warmed = 0
+        with open(os.path.join(state["index_dir"], self.postings_file), "rb") as fp:
+            for term in terms:
+                ranges = self.postings_ranges(state["term_dict"], state["postings_layout"], term)
+                total = sum(size for _, size in ranges)
+                if not ranges or used + total > self.warmup_budget:
+                    continue
+                for start, size in ranges:
+                    if self.warmup_mode == "preload":
+                        fp.seek(start)
+                        resident[start] = fp.read(size)
+                    elif hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fp.fileno(), start, size, os.POSIX_FADV_WILLNEED)
+                    else:
+                        fp.seek(start)
+                        fp.read(size)
+                used += total
+                warmed += 1
+        return warmed, used
+    
+    def print_startup_times(self):
+        """시작 시간 내역 출력 (인덱스 파일별 로드 시간, 형태소 분석기 생성 시간)"""
+        print(f"Searcher 시작: {self.startup_times['total'] * 1000:.1f} ms")
+        print(f"  - access log: {self.startup_times['access_log'] * 1000:.1f} ms")
+        print(f"  - 인덱스 로드: {self.startup_times['load_index'] * 1000:.1f} ms")
+        for name, seconds in self.load_times.items():
+            print(f"    - {name}: {seconds * 1000:.1f} ms")
+        if self.tier_fields:
+            print(f"  - 메모리 tier ({', '.join(self.tier_fields)}): {self.tier_bytes:,} bytes")
+        if "komoran_init" in tagger_startup_times:
+            print(f"  - 형태소 분석기 (백그라운드 또는 첫 쿼리): konlpy import {tagger_startup_times['konlpy_import'] * 1000:.1f} ms, "
+                  f"Komoran / JVM 시작 {tagger_startup_times['komoran_init'] * 1000:.1f} ms")
+            if "first_use_wait" in tagger_startup_times:
+                print(f"  - 첫 쿼리의 형태소 분석기 대기: {tagger_startup_times['first_use_wait'] * 1000:.1f} ms")
+        else:
+            print("  - 형태소 분석기: 아직 생성하지 않음")
+    
+    def load_access_log(self):
+        """access_log 파일의 term별 사용 횟수 로드 (파일이 없으면 빈 Counter)"""
+        if self.access_log is None or not os.path.exists(self.access_log):
+            return Counter()
+        with open(self.access_log, 'r', encoding='utf8') as f:
+            return Counter(json.load(f))
+    
+    def save_access_log(self):
+        """term별 사용 횟수를 access_log 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if self.access_log is None:
+            return
+        tmp_path = self.access_log + ".tmp"
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump(dict(self.term_access.most_common(self.ACCESS_LOG_MAX_TERMS)), f, ensure_ascii=False)
+        os.replace(tmp_path, self.access_log)
+        self.queries_since_flush = 0
+    
+    def log_term_access(self, query_terms):
+        """query term 사용 횟수 누적 (ACCESS_LOG_FLUSH개 쿼리마다 파일에 저장)"""
+        self.term_access.update(query_terms)
+        self.queries_since_flush += 1
+        if self.queries_since_flush >= self.ACCESS_LOG_FLUSH:
+            self.save_access_log()
+    
+    def close(self):
+        """access log 저장 후 인덱스 파일 닫기"""
+        if self.queries_since_flush:
+            self.save_access_log()
+        for fp in self.index_files():
+            fp.close()
+    
+    def load_in_background(self, version, hot_terms):
+        """백그라운드 스레드: 새 버전 로드 및 warmup 후 교체 대기 상태로 등록"""
+        try:
+            state = self.load_index(self.versions.path(version))
+            self.warm_postings(state, hot_terms)
+        except (OSError, ValueError, KeyError) as e:
+            with self.reload_lock:
+                self.failed_version = version
+                self.reload_error = f"(인덱스 {version} 로드 실패: {e})"
+            return
+        with self.reload_lock:
+            self.pending_index = (version, state)
+    
+    def check_reload(self, notices):
+        """새 인덱스 버전이 있으면 백그라운드 로드를 시작하고, 로드가 끝난 버전이 있으면 교체 (쿼리 시작 시 호출)
+        
+        교체 / 로드 실패 안내 메시지는 notices 리스트에 추가
+        """
+        if not self.auto_reload:
+            return
+        
+        with self.reload_lock:
+            pending = self.pending_index
+            self.pending_index = None
+            if self.reload_error is not None:
+                notices.append(self.reload_error)
+                self.reload_error = None
+        if pending is not None:
+            version, state = pending
+            self.swap_index(state)
+            self.version = version
+            notices.append(f"(인덱스 교체: {version})")
+            return
+        
+        now = time.monotonic()
+        if now < self.next_reload_check:
+            return
+        if self.reload_thread is not None and self.reload_thread.is_alive():
+            return
+        self.next_reload_check = now + self.reload_interval
+        
+        version = self.versions.current()
+        if version is None or version == self.version or version == self.failed_version:
+            return
+        
+        # 지금까지 자주 검색된 term들을 새 버전에서 미리 읽어 둠
+        hot_terms = [term for term, _ in self.term_access.most_common(self.warmup_terms or self.WARM_TERMS)]
+        self.reload_thread = threading.Thread(target=self.load_in_background, args=(version, hot_terms),
+                                              daemon=True)
+        self.reload_thread.start()
     
     def get_postings(self, term, field):
         """특정 term의 특정 field 포스팅을 Dictionary로 반환 (캐싱 적용)"""
@@ -49,6 +442,12 @@ class Searcher:
             self.postings_cache[cache_key] = {}
             return {}
         
+        if self.postings_layout == "merged":
+            idx = self.FIELD_INDEX[field]
+            postings = {p[0]: p[idx] for p in self.get_merged_postings(term) if p[idx] > 0}
+            self.postings_cache[cache_key] = postings
+            return postings
+        
         entry = self.term_dict[term]
         if field not in entry:
             self.postings_cache[cache_key] = {}
@@ -59,27 +458,295 @@ class Searcher:
         length = field_entry["length"]
         
         postings = {}
-        self.fp.seek(start_offset)
-        for _ in range(length):
-            data = self.fp.read(8)
-            if len(data) != 8:
-                raise ValueError(f"Incomplete data read at offset {start_offset}")
-            doc_id, freq = struct.unpack("ii", data)
+        data = self.read_postings_bytes(start_offset, 8 * length)
+        for doc_id, freq in struct.iter_unpack("ii", data):
             postings[doc_id] = freq
         
         self.postings_cache[cache_key] = postings
         return postings
     
+    def read_postings_bytes(self, start, size):
+        """postings.bin의 [start, start + size) 구간 (warmup으로 메모리에 올린 구간이면 파일을 읽지 않음)"""
+        data = self.resident_postings.get(start)
+        if data is not None:
+            return data
+        self.fp.seek(start)
+        data = self.fp.read(size)
+        if len(data) != size:
+            raise ValueError(f"Incomplete data read at offset {start}")
+        return data
+    
+    def get_merged_postings(self, term):
+        """merged 레이아웃: term의 포스팅 리스트 [(doc_id, tf_T, tf_A, tf_C), ...] 반환 (캐싱 적용)"""
+        cache_key = (term, 'M')
+        if cache_key in self.postings_cache:
+            return self.postings_cache[cache_key]
+        
+        entry = self.term_dict.get(term)
+        if entry is None or 'M' not in entry:
+            self.postings_cache[cache_key] = []
+            return []
+        
+        start_offset = entry['M']["start"]
+        length = entry['M']["length"]
+        
+        # 포스팅 전체를 한 번에 읽고 순차적으로 unpack
+        data = self.read_postings_bytes(start_offset, 16 * length)
+        postings = list(struct.iter_unpack("iiii", data))
+        
+        self.postings_cache[cache_key] = postings
+        return postings
+    
+    def get_impact_postings(self, term):
+        """term의 양자화 impact 포스팅 [(doc_id, impact), ...] 반환 (캐싱 적용)"""
+        cache_key = (term, 'I')
+        if cache_key in self.postings_cache:
+            return self.postings_cache[cache_key]
+        
+        entry = self.impact_dict.get(term)
+        if entry is None:
+            self.postings_cache[cache_key] = []
+            return []
+        
+        if self.impact_metadata.get("order", "doc") == "impact":
+            postings = []
+            for impact, start, count in self.get_impact_segments(term):
+                postings.extend((doc_id, impact) for doc_id in self.read_impact_segment(start, count))
+            self.postings_cache[cache_key] = postings
+            return postings
+        
+        fmt = self.IMPACT_FORMATS[self.impact_metadata["bits"]]
+        record_size = struct.calcsize(fmt)
+        
+        self.impact_fp.seek(entry["start"])
+        data = self.impact_fp.read(record_size * entry["length"])
+        if len(data) != record_size * entry["length"]:
+            raise ValueError(f"Incomplete data read at offset {entry['start']}")
+        postings = list(struct.iter_unpack(fmt, data))
+        
+        self.postings_cache[cache_key] = postings
+        return postings
+    
+    def get_impact_segments(self, term):
+        """impact-ordered 인덱스: term의 segment 목록 [(impact, start, count), ...] (impact 내림차순)"""
+        entry = self.impact_dict.get(term)
+        if entry is None:
+            return []
+        
+        segments = []
+        offset = entry["start"]
+        for impact, count in entry["segments"]:
+            segments.append((impact, offset, count))
+            offset += 4 * count
+        return segments
+    
+    def read_impact_segment(self, start, count):
+        """impact-ordered 인덱스: 한 segment의 doc_id들을 읽어서 반환"""
+        self.impact_fp.seek(start)
+        data = self.impact_fp.read(4 * count)
+        if len(data) != 4 * count:
+            raise ValueError(f"Incomplete data read at offset {start}")
+        return struct.unpack(f"<{count}i", data)
+    
+    def accumulate_anytime(self, query_terms, time_budget=None, postings_budget=None, doc_filter=None):
+        """score-at-a-time 평가: 모든 query term의 segment를 impact 내림차순으로 처리하다가 예산 소진 시 중단
+        
+        doc_filter가 주어지면 그 안의 문서만 누적함
+        쿼리에 여러 번 나온 term은 score_docs_impact와 같이 횟수만큼 impact를 더함 (segment 순서도 곱한 값 기준)
+        
+        반환값: ({doc_id: 정수 impact 합}, 모든 segment를 처리하여 exact한 결과인지 여부)
+        """
+        segments = []
+        for term, query_tf in Counter(query_terms).items():
+            segments.extend((impact * query_tf, start, count)
+                            for impact, start, count in self.get_impact_segments(term))
+        segments.sort(key=lambda x: x[0], reverse=True)
+        
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        doc_impacts = {}
+        processed = 0
+        
+        for i, (impact, start, count) in enumerate(segments):
+            if postings_budget is not None and processed + count > postings_budget and processed > 0:
+                return doc_impacts, False
+            if deadline is not None and i > 0 and time.perf_counter() >= deadline:
+                return doc_impacts, False
+            
+            for doc_id in self.read_impact_segment(start, count):
+                if doc_filter is not None and doc_id not in doc_filter:
+                    continue
+                doc_impacts[doc_id] = doc_impacts.get(doc_id, 0) + impact
+            processed += count
+        
+        return doc_impacts, True
+    
+    def get_postings_arrays(self, term, field):
+        """term의 field 포스팅을 doc_id 오름차순 배열 (doc_ids, tfs)로 반환 (캐싱 적용)"""
+        cache_key = (term, field, 'arrays')
+        if cache_key in self.postings_cache:
+            return self.postings_cache[cache_key]
+        
+        entry = self.term_dict.get(term)
+        if entry is None:
+            arrays = (array('i'), array('i'))
+        elif self.postings_layout == "merged":
+            idx = self.FIELD_INDEX[field]
+            merged = [p for p in self.get_merged_postings(term) if p[idx] > 0]
+            arrays = (array('i', [p[0] for p in merged]), array('i', [p[idx] for p in merged]))
+        elif field not in entry:
+            arrays = (array('i'), array('i'))
+        else:
+            # (doc_id, tf) 레코드를 통째로 읽어서 int 배열로 변환 후 분리 (Python 객체 생성 없음)
+            start_offset = entry[field]["start"]
+            length = entry[field]["length"]
+            data = self.read_postings_bytes(start_offset, 8 * length)
+            records = array('i')
+            records.frombytes(data)
+            arrays = (records[0::2], records[1::2])
+        
+        self.postings_cache[cache_key] = arrays
+        return arrays
+    
     def clear_cache(self):
-        """포스팅 캐시 초기화"""
+        """포스팅 캐시 초기화 (임시 등록한 가상 term도 제거)"""
         self.postings_cache = {}
+        for term in self.virtual_terms:
+            del self.term_dict[term]
+        self.virtual_terms = []
+    
+    def merge_field_postings(self, terms, field):
+        """여러 term의 field 포스팅 배열을 doc_id 순으로 k-way merge하여 문서별 tf 합산"""
+        streams = [zip(*self.get_postings_arrays(term, field)) for term in terms]
+        doc_ids = array('i')
+        tfs = array('i')
+        for doc_id, tf in heapq.merge(*streams):
+            if doc_ids and doc_ids[-1] == doc_id:
+                tfs[-1] += tf
+            else:
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+        return doc_ids, tfs
+    
+    def register_virtual_term(self, name, field_arrays):
+        """필드별 포스팅 배열 {field: (doc_ids, tfs)}을 가상 term으로 현재 쿼리 동안 term_dict/캐시에 등록
+        
+        df는 어느 필드에든 등장한 문서 수로 계산하므로 BM25F 점수 계산에서 일반 term과 똑같이 처리됨
+        """
+        entry = {}
+        all_docs = set()
+        for field, (doc_ids, tfs) in field_arrays.items():
+            self.postings_cache[(name, field, 'arrays')] = (doc_ids, tfs)
+            self.postings_cache[(name, field)] = dict(zip(doc_ids, tfs))
+            all_docs.update(doc_ids)
+            if doc_ids:
+                entry[field] = {"length": len(doc_ids)}
+        
+        if self.postings_layout == "merged":
+            merged = {doc_id: [doc_id, 0, 0, 0] for doc_id in all_docs}
+            for field, (doc_ids, tfs) in field_arrays.items():
+                idx = self.FIELD_INDEX[field]
+                for doc_id, tf in zip(doc_ids, tfs):
+                    merged[doc_id][idx] = tf
+            self.postings_cache[(name, 'M')] = [tuple(merged[doc_id]) for doc_id in sorted(merged)]
+        
+        entry["df"] = len(all_docs)
+        self.term_dict[name] = entry
+        self.virtual_terms.append(name)
+    
+    def register_wildcard(self, pattern, terms):
+        """확장된 term들의 포스팅을 필드별로 합친 (tf 합산) 가상 term 등록"""
+        field_arrays = {field: self.merge_field_postings(terms, field) for field in ['T', 'A', 'C']}
+        self.register_virtual_term(pattern, field_arrays)
+    
+    def register_ngram_fallback(self, word):
+        """bigram 보조 인덱스로 찾은 문서들을 tf=1인 가상 term으로 등록하고 문서 수 반환
+        
+        Title은 doc_table의 원문으로 실제 포함 여부를 확인하여 bigram만 흩어져 있는 문서를 제외함
+        """
+        field_arrays = {}
+        for field in ['T', 'A', 'C']:
+            doc_ids = self.ngram_index.lookup(word, field)
+            if field == 'T':
+                doc_ids = [doc_id for doc_id in doc_ids
+                           if word in self.doc_table[str(doc_id)]["T_text"].lower()]
+            field_arrays[field] = (array('i', doc_ids), array('i', [1]) * len(doc_ids))
+        self.register_virtual_term(word, field_arrays)
+        return self.term_dict[word]["df"]
+    
+    def find_fallback_words(self, query_text, query_terms, corrected_words=()):
+        """bigram 보조 검색 대상: 인덱스에 없는 query term (+ ngram_untagged_words이면 형태소 분석에서 term이 하나도 나오지 않은 단어)
+        
+        corrected_words: [FUZZY] 오타 보정으로 이미 인덱스 term으로 바뀐 원래 term (보조 검색하지 않음)
+        """
+        words = [term for term in query_terms if term not in self.term_dict]
+        if self.ngram_untagged_words:
+            for word in query_text.lower().split():
+                word = ''.join(NgramIndex.WORD_PATTERN.findall(word))
+                if (not word or word in self.term_dict
+                        or any(original in word for original in corrected_words) or extract_terms(word)):
+                    continue
+                words.append(word)
+        return [word for word in dict.fromkeys(words) if len(word) >= 2]
+    
+    def apply_ngram_fallback(self, query_text, query_terms, notices, corrected_words=()):
+        """인덱스에서 찾을 수 없는 단어들을 bigram 보조 인덱스로 검색하여 가상 term으로 추가
+        
+        반환값: 새로 query에 추가할 단어 리스트 (이미 query_terms에 있는 term은 같은 이름으로 등록되어 그대로 사용)
+        검색한 단어별 안내 메시지는 notices 리스트에 추가
+        """
+        added = []
+        for word in self.find_fallback_words(query_text, query_terms, corrected_words):
+            num_docs = self.register_ngram_fallback(word)
+            notices.append(f"(n-gram 보조 검색: {word} -> {num_docs}개 문서)")
+            if word not in query_terms:
+                added.append(word)
+        return added
+    
+    def expand_wildcards(self, patterns, notices):
+        """와일드카드 pattern들을 lexicon으로 확장하여 가상 term으로 등록
+        
+        반환값: (쿼리에 추가할 가상 term 리스트, 하이라이팅용 확장 term 리스트)
+        확장 term 수를 제한한 경우의 안내 메시지는 notices 리스트에 추가
+        """
+        virtual_terms = []
+        expanded_terms = []
+        for pattern in patterns:
+            terms, truncated = self.lexicon.expand(pattern, lambda term: self.term_dict[term]["df"],
+                                                   self.MAX_WILDCARD_EXPANSIONS)
+            if truncated:
+                notices.append(f"({pattern}: 매칭 term이 많아 df 상위 {len(terms)}개 term만 사용)")
+            if not terms:
+                continue
+            self.register_wildcard(pattern, terms)
+            virtual_terms.append(pattern)
+            expanded_terms.extend(terms)
+        return virtual_terms, expanded_terms
+    
+    def correct_terms(self, query_terms, notices):
+        """인덱스에 없는 query term을 편집 거리 1~2 이내의 가장 가까운 인덱스 term으로 보정
+        
+        반환값: (보정된 query term 리스트, 보정된 원래 term 집합), 보정 안내 메시지는 notices 리스트에 추가
+        """
+        corrected = []
+        originals = set()
+        for term in query_terms:
+            if term not in self.term_dict:
+                match = self.lexicon.fuzzy_lookup(term, lambda t: self.term_dict[t]["df"])
+                if match is not None:
+                    notices.append(f"(오타 보정: {term} -> {match})")
+                    originals.add(term)
+                    term = match
+            corrected.append(term)
+        return corrected, originals
     
     def parse_query(self, user_query):
         """쿼리 파싱: Prefix와 Field 추출"""
         verbose = False
         and_mode = False
         phrase_mode = False
+        fuzzy = self.fuzzy
         explicit_fields = []
+        filters = []
         invalid_prefixes = []
         
         ## valid_prefixes = {'VERBOSE', 'V', 'AND', 'A', 'PHRASE', 'P'}
@@ -95,6 +762,8 @@ class Searcher:
                 and_mode = True
             elif match_upper in ('PHRASE', 'P'):
                 phrase_mode = True
+            elif match_upper in ('FUZZY', 'F'):
+                fuzzy = True
             elif match_upper.startswith('FIELD='):
                 field_char = match_upper[6:]
                 if field_char in ['T', 'A', 'C']:
@@ -102,10 +771,20 @@ class Searcher:
                 else:
                     invalid_prefixes.append(f"[{match}]")
             else:
-                invalid_prefixes.append(f"[{match}]")
+                # 메타데이터 필터 (예: [CLASS=H04W], [YEAR>=2015])
+                spec = self.filter_index.parse(match_upper) if self.filter_index is not None else None
+                if spec is not None:
+                    filters.append(spec)
+                else:
+                    invalid_prefixes.append(f"[{match}]")
         
         pure_query = re.sub(pattern, '', user_query).strip()
         
+        # 와일드카드(*, ?)가 포함된 token은 형태소 분석 전에 분리 (영문 term은 소문자로 인덱싱됨)
+        wildcards = [token.lower() for token in pure_query.split() if Lexicon.is_wildcard(token)]
+        if wildcards:
+            pure_query = ' '.join(token for token in pure_query.split() if not Lexicon.is_wildcard(token))
+        
         if not explicit_fields:
             fields = ['T', 'A', 'C']
         else:
@@ -115,11 +794,14 @@ class Searcher:
             'verbose': verbose,
             'and_mode': and_mode,
             'phrase_mode': phrase_mode,
+            'fuzzy': fuzzy,
             'fields': fields,
             'explicit_fields': explicit_fields,
+            'filters': filters,
             'query_text': pure_query,
             'original_query': user_query,
-            'invalid_prefixes': invalid_prefixes
+            'invalid_prefixes': invalid_prefixes,
+            'wildcards': wildcards
         }
     
     def validate_query(self, parsed):
@@ -130,12 +812,49 @@ class Searcher:
             explicit = parsed['explicit_fields']
             if 'A' in explicit or 'C' in explicit:
                 return "오류: [PHRASE]는 Title에서만 검색하므로 [FIELD=A] 또는 [FIELD=C]와 함께 사용할 수 없습니다."
+            if parsed['wildcards']:
+                return "오류: [PHRASE]와 와일드카드(*, ?)는 동시에 사용할 수 없습니다."
+            if parsed['fuzzy'] and not self.fuzzy:
+                return "오류: [PHRASE]와 [FUZZY]는 동시에 사용할 수 없습니다."
+        for pattern in parsed['wildcards']:
+            if not Lexicon.wildcard_prefix(pattern):
+                return f"오류: 와일드카드 검색어는 와일드카드 앞에 한 글자 이상이 필요합니다: {pattern}"
         return None
     
     def calculate_idf(self, df):
         """BM25 IDF 계산"""
         return math.log((self.N - df + 0.5) / (df + 0.5) + 1)
     
+    def calculate_field_tf(self, tf, field, doc_info):
+        """필드 가중치와 길이 정규화를 적용한 필드별 tf (w_f * tf / B_f)"""
+        dl = doc_info[f"len_{field}"]
+        avgdl = self.avgdl[field]
+        b_f = self.FIELD_B[field]
+        w_f = self.FIELD_WEIGHTS[field]
+        
+        if avgdl > 0:
+            normalized_tf = tf / ((1 - b_f) + b_f * (dl / avgdl))
+        else:
+            normalized_tf = tf
+        
+        return w_f * normalized_tf
+    
+    def calculate_term_score(self, idf, tf_tilde):
+        """BM25F term 점수 (tf saturation 적용)"""
+        return idf * ((self.K1 + 1) * tf_tilde) / (self.K1 + tf_tilde)
+    
+    def term_contributions(self, term, fields):
+        """term의 문서별 BM25F 기여도 {doc_id: score} (doc_id 오름차순, impact 계산 / 정적 pruning용)"""
+        idf = self.calculate_idf(self.term_dict[term]["df"])
+        tf_tildes = {}
+        for field in fields:
+            doc_ids, tfs = self.get_postings_arrays(term, field)
+            for doc_id, tf in zip(doc_ids, tfs):
+                if tf > 0:
+                    doc_info = self.doc_table[str(doc_id)]
+                    tf_tildes[doc_id] = tf_tildes.get(doc_id, 0.0) + self.calculate_field_tf(tf, field, doc_info)
+        return {doc_id: self.calculate_term_score(idf, tf_tildes[doc_id]) for doc_id in sorted(tf_tildes)}
+    
     def calculate_bm25f_score(self, query_terms, doc_id, fields):
         """BM25F 점수 계산"""
         score = 0.0
@@ -155,62 +874,352 @@ class Searcher:
                 tf = postings.get(doc_id, 0)
                 
                 if tf > 0:
-                    dl = doc_info[f"len_{field}"]
-                    avgdl = self.avgdl[field]
-                    b_f = self.FIELD_B[field]
-                    w_f = self.FIELD_WEIGHTS[field]
-                    
-                    if avgdl > 0:
-                        normalized_tf = tf / ((1 - b_f) + b_f * (dl / avgdl))
-                    else:
-                        normalized_tf = tf
-                    
-                    tf_tilde += w_f * normalized_tf
+                    tf_tilde += self.calculate_field_tf(tf, field, doc_info)
             
             if tf_tilde > 0:
-                term_score = idf * ((self.K1 + 1) * tf_tilde) / (self.K1 + tf_tilde)
-                score += term_score
+                score += self.calculate_term_score(idf, tf_tilde)
         
         return score
     
-    def get_candidate_docs(self, query_terms, fields, and_mode):
-        """검색 대상 문서 ID 집합 반환"""
-        if and_mode:
-            doc_sets = []
-            for term in query_terms:
-                if term not in self.term_dict:
-                    return set()
-                
-                term_docs = set()
-                for field in fields:
-                    postings = self.get_postings(term, field)
-                    term_docs.update(postings.keys())
+    def score_docs_merged(self, query_terms, candidate_docs, fields):
+        """merged 레이아웃: term마다 포스팅을 한 번 순차 스캔하며 후보 문서 점수 누적 (term-at-a-time)"""
+        doc_scores = {}
+        field_indexes = [(field, self.FIELD_INDEX[field]) for field in fields]
+        
+        for term in query_terms:
+            if term not in self.term_dict:
+                continue
+            
+            idf = self.calculate_idf(self.term_dict[term]["df"])
+            
+            for posting in self.get_merged_postings(term):
+                doc_id = posting[0]
+                if doc_id not in candidate_docs:
+                    continue
                 
-                if not term_docs:
-                    return set()
+                doc_info = self.doc_table[str(doc_id)]
+                tf_tilde = 0.0
+                for field, idx in field_indexes:
+                    tf = posting[idx]
+                    if tf > 0:
+                        tf_tilde += self.calculate_field_tf(tf, field, doc_info)
                 
-                doc_sets.append(term_docs)
+                if tf_tilde > 0:
+                    doc_scores[doc_id] = doc_scores.get(doc_id, 0.0) + self.calculate_term_score(idf, tf_tilde)
+        
+        return doc_scores
+    
+    def can_use_impacts(self, parsed):
+        """impact 인덱스로 점수 계산이 가능한 쿼리인지 확인 (impact는 전체 필드 기준으로 계산됨)"""
+        if self.impact_dict is None or parsed['phrase_mode'] or self.virtual_terms:
+            return False
+        return set(parsed['fields']) == set(self.impact_metadata["fields"])
+    
+    def score_docs_impact(self, query_terms, candidate_docs=None):
+        """impact 인덱스: 포스팅의 정수 impact 합산만으로 점수 계산 (candidate_docs가 None이면 모든 문서)"""
+        doc_impacts = {}
+        for term in query_terms:
+            for doc_id, impact in self.get_impact_postings(term):
+                if candidate_docs is not None and doc_id not in candidate_docs:
+                    continue
+                doc_impacts[doc_id] = doc_impacts.get(doc_id, 0) + impact
+        
+        # 출력용 점수로 환산 (정렬 순서는 정수 합과 동일)
+        scale = self.impact_metadata["scale"]
+        return {doc_id: total * scale for doc_id, total in doc_impacts.items()}
+    
+    def can_use_tiers(self, parsed, top_k):
+        """tiered 평가가 가능한 쿼리인지 확인 (field 레이아웃의 OR 쿼리이고 필요한 결과 수가 정해진 경우)"""
+        if not self.tier_fields or self.postings_layout != "field" or not top_k:
+            return False
+        return not (parsed['phrase_mode'] or parsed['and_mode'] or self.virtual_terms)
+    
+    def field_tf_bound(self, term, field):
+        """term의 field 포스팅 전체에 대한 calculate_field_tf 상한 (term_dict에 Indexer가 저장한 통계가 없으면 None)
+        
+        정규화된 tf = tf / ((1 - b) + b * dl / avgdl)의 상한 두 가지 중 작은 값
+        - 분모는 dl에 대해 증가하므로 max_tf와 min_len으로 계산한 값
+        - b에 대해 볼록 함수이므로 b=0 (max_tf)과 b=1 (avgdl * max_tf_ratio) 값의 선형 보간
+        """
+        entry = self.term_dict[term].get(field)
+        if entry is None:
+            return 0.0
+        if "max_tf_ratio" not in entry:
+            return None
+        
+        normalized_tf = entry["max_tf"]
+        avgdl = self.avgdl[field]
+        if avgdl > 0:
+            b_f = self.FIELD_B[field]
+            by_length = entry["max_tf"] / ((1 - b_f) + b_f * (entry["min_len"] / avgdl))
+            by_ratio = (1 - b_f) * entry["max_tf"] + b_f * avgdl * entry["max_tf_ratio"]
+            normalized_tf = min(by_length, by_ratio)
+        return self.FIELD_WEIGHTS[field] * normalized_tf
+    
+    def lookup_postings(self, term, field, sorted_docs):
+        """doc_id 오름차순 sorted_docs의 term / field tf {doc_id: tf}
+        
+        메모리에 있거나 조회할 문서가 많으면 포스팅 배열을 galloping 탐색하고,
+        그렇지 않으면 디스크의 (doc_id, tf) 레코드를 문서마다 이진 탐색하여 포스팅 전체를 읽지 않음
+        """
+        entry = self.term_dict[term].get(field)
+        if entry is None or not sorted_docs:
+            return {}
+        start = entry["start"]
+        length = entry["length"]
+        found = {}
+        
+        if ((term, field, 'arrays') in self.postings_cache or start in self.resident_postings
+                or len(sorted_docs) * length.bit_length() * self.TIER_PROBE_BYTES >= 8 * length):
+            doc_ids, tfs = self.get_postings_arrays(term, field)
+            cursor = 0
+            for doc_id in sorted_docs:
+                cursor = gallop(doc_ids, doc_id, cursor)
+                if cursor >= length:
+                    break
+                if doc_ids[cursor] == doc_id:
+                    found[doc_id] = tfs[cursor]
+            return found
+        
+        lo = 0
+        for doc_id in sorted_docs:
+            hi = length
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if struct.unpack_from("i", self.read_postings_bytes(start + 8 * mid, 8))[0] < doc_id:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo >= length:
+                break
+            posting_doc, tf = struct.unpack_from("ii", self.read_postings_bytes(start + 8 * lo, 8))
+            if posting_doc == doc_id:
+                found[doc_id] = tf
+        return found
+    
+    def score_docs_tiered(self, query_terms, fields, top_k, doc_filter=None):
+        """tiered 평가: 메모리 tier 포스팅으로 top_k 기준 점수를 정하고, 디스크 tier는 순위를 바꿀 수 있는 부분만 읽기
+        
+        1. 메모리 tier 필드만으로 문서별 점수 하한을 계산하고, 하한 기준 top_k번째 점수를 θ로 둠
+           (디스크 tier 필드 tf를 term별 상한 field_tf_bound()로 두면 점수 상한, tf saturation은 증가 함수)
+        2. 디스크 tier 상한 점수가 작은 term부터 상한 합이 θ보다 작은 동안은 포스팅을 읽지 않는 term으로 둠 (MaxScore)
+           -> 메모리 tier에도, 나머지 term의 디스크 포스팅에도 없는 문서는 θ를 넘을 수 없음
+        3. 나머지 term의 디스크 포스팅만 전체를 읽고, 상한이 θ 이상인 후보 문서만 calculate_bm25f_score와 같은 순서로 점수 계산
+           (읽지 않은 포스팅은 후보 문서 위치만 이진 탐색)
+        후보가 아닌 문서는 상한이 θ보다 작으므로 top_k 결과(순서 포함)는 전체 평가와 동일함
+        
+        반환값: ({doc_id: 점수}, 찾은 문서 수, 그 수가 전체 검색 문서 수와 같은지) 또는 None (term_dict에 상한 통계가 없음)
+        """
+        disk_fields = [field for field in fields if field not in self.tier_fields]
+        terms = [term for term in query_terms if term in self.term_dict]
+        unique_terms = list(dict.fromkeys(terms))
+        counts = Counter(terms)
+        
+        idfs = {}
+        bounds = {}
+        partial_tfs = {}
+        for term in unique_terms:
+            idfs[term] = self.calculate_idf(self.term_dict[term]["df"])
+            bound = 0.0
+            for field in disk_fields:
+                field_bound = self.field_tf_bound(term, field)
+                if field_bound is None:
+                    return None
+                bound += field_bound
+            bounds[term] = bound
             
-            if not doc_sets:
-                return set()
+            tf_tildes = {}
+            for field in fields:
+                if field not in self.tier_fields:
+                    continue
+                for doc_id, tf in zip(*self.get_postings_arrays(term, field)):
+                    if tf > 0 and (doc_filter is None or doc_id in doc_filter):
+                        doc_info = self.doc_table[str(doc_id)]
+                        tf_tildes[doc_id] = tf_tildes.get(doc_id, 0.0) + self.calculate_field_tf(tf, field, doc_info)
+            partial_tfs[term] = tf_tildes
+        
+        # 디스크 tier에서만 term이 등장하는 경우의 term 점수 상한
+        disk_scores = {term: self.calculate_term_score(idfs[term], bounds[term]) if bounds[term] > 0 else 0.0
+                       for term in unique_terms}
+        
+        lower = {}
+        upper = {}
+        for term in terms:
+            idf = idfs[term]
+            bound = bounds[term]
+            for doc_id, tf_tilde in partial_tfs[term].items():
+                lower[doc_id] = lower.get(doc_id, 0.0) + self.calculate_term_score(idf, tf_tilde)
+                extra = self.calculate_term_score(idf, tf_tilde + bound) - disk_scores[term]
+                upper[doc_id] = upper.get(doc_id, 0.0) + extra
+        
+        threshold = 0.0
+        if len(lower) >= top_k:
+            threshold = heapq.nlargest(top_k, lower.values())[-1] - self.TIER_EPSILON
+        
+        # 디스크 포스팅을 읽지 않을 term: 상한 점수 오름차순으로 합이 θ보다 작은 동안
+        skipped_bound = 0.0
+        disk_terms = []
+        for term in sorted((term for term in unique_terms if disk_scores[term] > 0), key=lambda term: disk_scores[term]):
+            term_bound = counts[term] * disk_scores[term]
+            if not disk_terms and skipped_bound + term_bound < threshold:
+                skipped_bound += term_bound
+            else:
+                disk_terms.append(term)
+        
+        # 메모리 tier에 없던 문서는 읽은 디스크 포스팅의 점수 + 읽지 않은 term의 상한
+        disk_only = {}
+        for term in disk_terms:
+            tf_tildes = {}
+            for field in disk_fields:
+                for doc_id, tf in zip(*self.get_postings_arrays(term, field)):
+                    if tf > 0 and doc_id not in lower and (doc_filter is None or doc_id in doc_filter):
+                        doc_info = self.doc_table[str(doc_id)]
+                        tf_tildes[doc_id] = tf_tildes.get(doc_id, 0.0) + self.calculate_field_tf(tf, field, doc_info)
+            for doc_id, tf_tilde in tf_tildes.items():
+                disk_only[doc_id] = disk_only.get(doc_id, 0.0) + counts[term] * self.calculate_term_score(idfs[term], tf_tilde)
+        
+        unseen_bound = sum(counts[term] * disk_scores[term] for term in unique_terms)
+        candidates = [doc_id for doc_id, extra in upper.items() if unseen_bound + extra >= threshold]
+        candidates += [doc_id for doc_id, score in disk_only.items() if score + skipped_bound >= threshold]
+        candidates.sort()
+        field_tfs = {(term, field): self.lookup_postings(term, field, candidates)
+                     for term in unique_terms for field in fields}
+        
+        doc_scores = {}
+        for doc_id in candidates:
+            doc_info = self.doc_table[str(doc_id)]
+            score = 0.0
+            for term in terms:
+                tf_tilde = 0.0
+                for field in fields:
+                    tf = field_tfs[(term, field)].get(doc_id, 0)
+                    if tf > 0:
+                        tf_tilde += self.calculate_field_tf(tf, field, doc_info)
+                if tf_tilde > 0:
+                    score += self.calculate_term_score(idfs[term], tf_tilde)
+            if score > 0:
+                doc_scores[doc_id] = score
+        
+        num_skipped = sum(1 for term in unique_terms if disk_scores[term] > 0) - len(disk_terms)
+        self.tier_counts["disk_read"] += len(disk_terms)
+        self.tier_counts["disk_skipped"] += num_skipped
+        self.tier_counts["candidates"] += len(candidates)
+        return doc_scores, len(lower) + len(disk_only), num_skipped == 0
+    
+    def get_term_docs(self, term, fields):
+        """term이 지정된 필드 중 하나라도 등장하는 문서 ID 집합 반환"""
+        if self.postings_layout == "merged":
+            field_indexes = [self.FIELD_INDEX[field] for field in fields]
+            return {p[0] for p in self.get_merged_postings(term)
+                    if any(p[idx] > 0 for idx in field_indexes)}
+        
+        term_docs = set()
+        for field in fields:
+            postings = self.get_postings(term, field)
+            term_docs.update(postings.keys())
+        return term_docs
+    
+    def get_field_df(self, term, fields):
+        """term_dict만으로 계산한 지정 필드들의 포스팅 길이 합 (포스팅을 읽지 않음)"""
+        entry = self.term_dict[term]
+        if self.postings_layout == "merged":
+            return entry["df"]
+        return sum(entry[field]["length"] for field in fields if field in entry)
+    
+    def intersect_sorted(self, query_terms, fields, doc_filter=None):
+        """AND 검색: df가 작은 term부터 정렬된 doc_id 배열을 galloping 탐색으로 교집합 (doc_id 오름차순 리스트 반환)
+        
+        가장 드문 term의 문서들만 후보로 두고 나머지 term의 배열에서는 후보 doc_id 위치로 건너뛰므로
+        비용이 가장 흔한 term의 포스팅 길이가 아닌 가장 드문 term의 포스팅 길이에 비례함
+        doc_filter가 주어지면 초기 후보를 먼저 필터링함
+        """
+        unique_terms = list(dict.fromkeys(query_terms))
+        if not unique_terms:
+            return []
+        for term in unique_terms:
+            if term not in self.term_dict:
+                return []
+        
+        unique_terms.sort(key=lambda term: self.get_field_df(term, fields))
+        
+        # 가장 드문 term: 필드별 배열의 합집합이 초기 후보
+        rarest = unique_terms[0]
+        candidates = set()
+        for field in fields:
+            candidates.update(self.get_postings_arrays(rarest, field)[0])
+        candidates = sorted(candidates)
+        if doc_filter is not None:
+            candidates = [doc_id for doc_id in candidates if doc_id in doc_filter]
+        
+        for term in unique_terms[1:]:
+            if not candidates:
+                break
             
-            result = doc_sets[0]
-            for doc_set in doc_sets[1:]:
-                result = result & doc_set
-            return result
+            field_arrays = [self.get_postings_arrays(term, field)[0] for field in fields]
+            field_arrays = [doc_ids for doc_ids in field_arrays if doc_ids]
+            cursors = [0] * len(field_arrays)
+            
+            survivors = []
+            for doc_id in candidates:
+                for i, doc_ids in enumerate(field_arrays):
+                    cursors[i] = gallop(doc_ids, doc_id, cursors[i])
+                    if cursors[i] < len(doc_ids) and doc_ids[cursors[i]] == doc_id:
+                        survivors.append(doc_id)
+                        break
+            candidates = survivors
+        
+        return candidates
+    
+    def score_docs_sorted(self, query_terms, sorted_docs, fields):
+        """doc_id 오름차순 후보 리스트의 BM25F 점수를 포스팅 배열 galloping 탐색으로 계산
+        
+        calculate_bm25f_score와 같은 순서로 합산하므로 점수가 동일함
+        """
+        doc_infos = [self.doc_table[str(doc_id)] for doc_id in sorted_docs]
+        scores = [0.0] * len(sorted_docs)
+        
+        for term in query_terms:
+            if term not in self.term_dict:
+                continue
+            
+            idf = self.calculate_idf(self.term_dict[term]["df"])
+            tf_tildes = [0.0] * len(sorted_docs)
+            
+            for field in fields:
+                doc_ids, tfs = self.get_postings_arrays(term, field)
+                if not doc_ids:
+                    continue
+                cursor = 0
+                for i, doc_id in enumerate(sorted_docs):
+                    cursor = gallop(doc_ids, doc_id, cursor)
+                    if cursor >= len(doc_ids):
+                        break
+                    if doc_ids[cursor] == doc_id and tfs[cursor] > 0:
+                        tf_tildes[i] += self.calculate_field_tf(tfs[cursor], field, doc_infos[i])
+            
+            for i, tf_tilde in enumerate(tf_tildes):
+                if tf_tilde > 0:
+                    scores[i] += self.calculate_term_score(idf, tf_tilde)
+        
+        return {doc_id: score for doc_id, score in zip(sorted_docs, scores) if score > 0}
+    
+    def get_candidate_docs(self, query_terms, fields, and_mode, doc_filter=None):
+        """검색 대상 문서 ID 집합 반환 (doc_filter가 주어지면 그 안의 문서만)"""
+        if and_mode:
+            return set(self.intersect_sorted(query_terms, fields, doc_filter))
         else:
             result = set()
             for term in query_terms:
                 if term not in self.term_dict:
                     continue
-                for field in fields:
-                    postings = self.get_postings(term, field)
-                    result.update(postings.keys())
+                result.update(self.get_term_docs(term, fields))
+            if doc_filter is not None:
+                result = {doc_id for doc_id in result if doc_id in doc_filter}
             return result
     
-    def phrase_search(self, query_text, query_terms):
+    def phrase_search(self, query_text, query_terms, doc_filter=None):
         """PHRASE 검색: Title에서 exact matching"""
-        candidate_docs = self.get_candidate_docs(query_terms, ['T'], and_mode=True)
+        candidate_docs = self.intersect_sorted(query_terms, ['T'], doc_filter)
         
         matched_docs = []
         for doc_id in candidate_docs:
@@ -228,13 +1237,7 @@ class Searcher:
         doc_info = self.doc_table[str(doc_id)]
         file_path = doc_info["path"]
         
-        with open(file_path, 'r', encoding='utf8') as f:
-            data = json.load(f)
-        
-        dataset = data['dataset']
-        title = dataset.get('invention_title', '')
-        abstract = dataset.get('abstract', '')
-        claims = dataset.get('claims', '')
+        title, abstract, claims = self.reader.read_fields(file_path)
         
         return {'T': title, 'A': abstract, 'C': claims}
     
@@ -359,14 +1362,10 @@ class Searcher:
         
         return snippets
     
-    def print_verbose_or(self, doc_id, score, query_terms, fields):
-        """OR/일반 검색의 VERBOSE 출력"""
-        doc_info = self.doc_table[str(doc_id)]
-        filename = doc_info["filename"]
+    def snippets_or(self, doc_id, query_terms, fields):
+        """OR/일반 검색의 snippet: 검색어가 가장 다양하게 등장하는 필드 하나 [(field, snippet)]"""
         doc_fields = self.get_document_fields(doc_id)
         
-        print(f"파일명: {filename}, 점수: {score:.2f}")
-        
         best_field = None
         best_snippet = None
         best_unique_count = 0
@@ -385,101 +1384,206 @@ class Searcher:
                 best_snippet = snippet
         
         if best_field and best_snippet:
-            print(f"[{self.FIELD_NAMES[best_field]}] {best_snippet}")
+            return [(best_field, best_snippet)]
+        return []
     
-    def print_verbose_phrase(self, doc_id, score, query_text):
-        """PHRASE 검색의 VERBOSE 출력"""
-        doc_info = self.doc_table[str(doc_id)]
-        filename = doc_info["filename"]
-        title_text = doc_info.get("T_text", "")
-        
-        print(f"파일명: {filename}, 점수: {score:.2f}")
-        
+    def snippets_phrase(self, doc_id, query_text):
+        """PHRASE 검색의 snippet: Title에서 검색어 전체를 가운데에 둔 window [('T', snippet)]"""
+        title_text = self.doc_table[str(doc_id)].get("T_text", "")
         snippet = self.create_snippet_phrase(title_text, query_text)
-        if snippet:
-            print(f"[{self.FIELD_NAMES['T']}] {snippet}")
+        return [('T', snippet)] if snippet else []
     
-    def print_verbose_and(self, doc_id, score, query_terms, fields):
-        """AND 검색의 VERBOSE 출력"""
-        doc_info = self.doc_table[str(doc_id)]
-        filename = doc_info["filename"]
-        doc_fields = self.get_document_fields(doc_id)
-        
-        print(f"파일명: {filename}, 점수: {score:.2f}")
-        
-        snippets = self.find_snippets_and(doc_fields, query_terms, fields)
-        for field, snippet in snippets:
-            print(f"[{self.FIELD_NAMES[field]}] {snippet}")
+    def snippets_and(self, doc_id, query_terms, fields):
+        """AND 검색의 snippet: 모든 검색어가 나올 때까지 여러 필드 [(field, snippet), ...]"""
+        return self.find_snippets_and(self.get_document_fields(doc_id), query_terms, fields)
+    
+    def get_snippets(self, doc_id, query):
+        """execute_query() 결과의 쿼리 종류에 맞는 snippet 리스트"""
+        parsed = query['parsed']
+        if parsed['phrase_mode']:
+            return self.snippets_phrase(doc_id, parsed['query_text'])
+        if parsed['and_mode']:
+            return self.snippets_and(doc_id, query['highlight_terms'], parsed['fields'])
+        return self.snippets_or(doc_id, query['highlight_terms'], parsed['fields'])
     
-    def print_verbose_results(self, ranked_docs, query_terms, query_text, parsed):
+    def print_verbose_results(self, results):
         """VERBOSE 모드 결과 출력"""
         print("-" * 50)
         
-        top_k = min(5, len(ranked_docs))
-        
-        for doc_id, score in ranked_docs[:top_k]:
-            if parsed['phrase_mode']:
-                self.print_verbose_phrase(doc_id, score, query_text)
-            elif parsed['and_mode']:
-                self.print_verbose_and(doc_id, score, query_terms, parsed['fields'])
-            else:
-                self.print_verbose_or(doc_id, score, query_terms, parsed['fields'])
+        for result in results:
+            print(f"파일명: {result.filename}, 점수: {result.score:.2f}")
+            for field, snippet in result.snippets or []:
+                print(f"[{self.FIELD_NAMES[field]}] {snippet}")
             print()
     
-    def process_query(self, user_query):
-        """쿼리 처리 메인 함수"""
+    # ========== 검색 API ==========
+    
+    def execute_query(self, user_query, top_k=None):
+        """쿼리 파싱부터 점수 계산까지 (출력 없음)
+        
+        반환값: {'parsed', 'highlight_terms', 'doc_scores': {doc_id: score}, 'exact', 'filter_count', 'total', 'total_exact', 'notices'}
+        top_k가 주어지면 tiered 평가를 사용할 수 있으며, 이때 doc_scores에는 상위 top_k개가 될 수 있는 문서만 있음
+        ('total'은 None이 아니면 len(doc_scores) 대신 사용할 검색 문서 수)
+        형식이 잘못된 쿼리는 QueryError
+        """
         self.clear_cache()
+        notices = []
+        self.check_reload(notices)
         
         parsed = self.parse_query(user_query)
         
         if parsed['invalid_prefixes']:
             invalid_str = ', '.join(parsed['invalid_prefixes'])
-            print(f"잘못된 형식이 입력되었습니다: {invalid_str}")
-            return
+            raise QueryError(f"잘못된 형식이 입력되었습니다: {invalid_str}")
         
         error_msg = self.validate_query(parsed)
         if error_msg:
-            print(error_msg)
-            return
+            raise QueryError(error_msg)
         
         query_terms = extract_terms(parsed['query_text'])
+        corrected_words = set()
+        if parsed['fuzzy'] and not parsed['phrase_mode']:
+            query_terms, corrected_words = self.correct_terms(query_terms, notices)
+        self.log_term_access(query_terms)
+        highlight_terms = list(query_terms)
+        
+        if parsed['wildcards']:
+            virtual_terms, expanded_terms = self.expand_wildcards(parsed['wildcards'], notices)
+            query_terms.extend(virtual_terms)
+            highlight_terms.extend(expanded_terms)
+        
+        if self.ngram_index is not None and not parsed['phrase_mode']:
+            fallback_words = self.apply_ngram_fallback(parsed['query_text'], query_terms, notices, corrected_words)
+            query_terms.extend(fallback_words)
+            highlight_terms.extend(fallback_words)
         
+        doc_filter = None
+        if parsed['filters']:
+            doc_filter = self.filter_index.evaluate(parsed['filters'])
+        
+        query = {
+            'parsed': parsed,
+            'highlight_terms': highlight_terms,
+            'doc_scores': {},
+            'exact': True,
+            'filter_count': len(doc_filter) if doc_filter is not None else None,
+            'total': None,
+            'total_exact': True,
+            'notices': notices
+        }
         if not query_terms:
-            print("\nRESULT:")
-            print(f"검색어 입력: {user_query}")
-            print("총 0개 문서 검색")
-            return
+            return query
         
-        if parsed['phrase_mode']:
-            matched_docs = self.phrase_search(parsed['query_text'], query_terms)
-            
-            doc_scores = {}
-            for doc_id in matched_docs:
-                score = self.calculate_bm25f_score(query_terms, doc_id, ['T'])
-                if score > 0:
-                    doc_scores[doc_id] = score
+        tiered = None
+        if self.can_use_tiers(parsed, top_k):
+            tiered = self.score_docs_tiered(query_terms, parsed['fields'], top_k, doc_filter)
+            self.tier_counts["tiered" if tiered is not None else "fallback"] += 1
+        
+        if tiered is not None:
+            doc_scores, query['total'], query['total_exact'] = tiered
+        elif parsed['phrase_mode']:
+            matched_docs = self.phrase_search(parsed['query_text'], query_terms, doc_filter)
+            doc_scores = self.score_docs_sorted(query_terms, matched_docs, ['T'])
+        elif (self.can_use_impacts(parsed) and not parsed['and_mode']
+              and self.impact_metadata.get("order") == "impact"
+              and (self.time_budget is not None or self.postings_budget is not None)):
+            doc_impacts, exact = self.accumulate_anytime(query_terms, self.time_budget, self.postings_budget,
+                                                         doc_filter)
+            scale = self.impact_metadata["scale"]
+            doc_scores = {doc_id: total * scale for doc_id, total in doc_impacts.items()}
+            query['exact'] = exact
+        elif self.can_use_impacts(parsed):
+            candidate_docs = doc_filter
+            if parsed['and_mode']:
+                candidate_docs = self.get_candidate_docs(query_terms, parsed['fields'], True, doc_filter)
+            doc_scores = self.score_docs_impact(query_terms, candidate_docs)
+        elif parsed['and_mode']:
+            candidate_docs = self.intersect_sorted(query_terms, parsed['fields'], doc_filter)
+            doc_scores = self.score_docs_sorted(query_terms, candidate_docs, parsed['fields'])
         else:
-            candidate_docs = self.get_candidate_docs(query_terms, parsed['fields'], parsed['and_mode'])
+            candidate_docs = self.get_candidate_docs(query_terms, parsed['fields'], parsed['and_mode'], doc_filter)
             
-            doc_scores = {}
-            for doc_id in candidate_docs:
-                score = self.calculate_bm25f_score(query_terms, doc_id, parsed['fields'])
-                if score > 0:
-                    doc_scores[doc_id] = score
+            if self.postings_layout == "merged":
+                doc_scores = self.score_docs_merged(query_terms, candidate_docs, parsed['fields'])
+            else:
+                doc_scores = {}
+                for doc_id in candidate_docs:
+                    score = self.calculate_bm25f_score(query_terms, doc_id, parsed['fields'])
+                    if score > 0:
+                        doc_scores[doc_id] = score
+        
+        query['doc_scores'] = doc_scores
+        return query
+    
+    def make_result(self, rank, doc_id, score, query=None):
+        """SearchResult 생성 (query가 주어지면 snippet 포함)"""
+        filename = self.doc_table[str(doc_id)]["filename"]
+        snippets = self.get_snippets(doc_id, query) if query is not None else None
+        return SearchResult(rank, doc_id, filename, score, snippets)
+    
+    def search(self, user_query, offset=0, limit=10, snippets=None):
+        """검색 결과 중 offset번째부터 limit개를 SearchResponse로 반환 (점수 내림차순, 동점은 doc_id 오름차순)
+        
+        전체를 정렬하지 않고 힙으로 상위 offset + limit개만 선택함
+        snippets=None이면 [VERBOSE] prefix가 있을 때만 snippet 포함
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError(f"offset과 limit은 0 이상이어야 합니다: offset={offset}, limit={limit}")
+        query = self.execute_query(user_query, offset + limit)
+        verbose = query['parsed']['verbose'] if snippets is None else snippets
         
-        ranked_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
+        doc_scores = query['doc_scores']
+        top = heapq.nsmallest(offset + limit, doc_scores.items(), key=lambda item: (-item[1], item[0]))
+        results = [self.make_result(rank, doc_id, score, query if verbose else None)
+                   for rank, (doc_id, score) in enumerate(top[offset:], offset + 1)]
+        
+        total = query['total'] if query['total'] is not None else len(doc_scores)
+        return SearchResponse(user_query, total, offset, results, verbose,
+                              query['exact'], query['filter_count'], query['total_exact'], query['notices'])
+    
+    def iter_search(self, user_query, snippets=False, notices=None):
+        """검색 결과를 순위 순서로 하나씩 yield하는 generator
+        
+        힙을 한 번 만든 뒤(O(n)) 꺼낼 때마다 다음 문서를 선택하므로, 소비한 결과만큼만 정렬 / snippet 비용이 듦
+        notices 리스트가 주어지면 첫 결과 전에 안내 메시지를 추가
+        """
+        query = self.execute_query(user_query)
+        if notices is not None:
+            notices.extend(query['notices'])
+        heap = [(-score, doc_id) for doc_id, score in query['doc_scores'].items()]
+        heapq.heapify(heap)
+        rank = 0
+        while heap:
+            neg_score, doc_id = heapq.heappop(heap)
+            rank += 1
+            yield self.make_result(rank, doc_id, -neg_score, query if snippets else None)
+    
+    def process_query(self, user_query):
+        """쿼리 처리 메인 함수 (search() 결과 출력)"""
+        try:
+            response = self.search(user_query, limit=self.DISPLAY_TOP_K)
+        except QueryError as e:
+            print(e)
+            return
+        
+        for notice in response.notices:
+            print(notice)
+        if response.filter_count is not None:
+            filters = self.parse_query(user_query)['filters']
+            filter_str = ', '.join(f"{name}{op}{value}" for name, op, value in filters)
+            print(f"(필터: {filter_str} -> {response.filter_count}개 문서)")
+        if not response.exact:
+            print("(검색 예산 소진: 예산 내에서 찾은 근사 결과)")
         
         print("\nRESULT:")
         print(f"검색어 입력: {user_query}")
-        print(f"총 {len(ranked_docs)}개 문서 검색")
+        total_str = f"{response.total}개" if response.total_exact else f"{response.total}개 이상"
+        print(f"총 {total_str} 문서 검색")
         
-        top_k = min(5, len(ranked_docs))
-        if top_k > 0:
-            print(f"상위 {top_k}개 문서:")
-            for doc_id, score in ranked_docs[:top_k]:
-                doc_info = self.doc_table[str(doc_id)]
-                filename = doc_info["filename"]
-                print(f"  {filename}  {score:.2f}")
+        if response.results:
+            print(f"상위 {len(response.results)}개 문서:")
+            for result in response.results:
+                print(f"  {result.filename}  {result.score:.2f}")
         
-        if parsed['verbose'] and top_k > 0:
-            self.print_verbose_results(ranked_docs, query_terms, parsed['query_text'], parsed)
\ No newline at end of file
+        if response.verbose and response.results:
+            self.print_verbose_results(response.results)
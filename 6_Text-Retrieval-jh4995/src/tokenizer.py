@@ -1,8 +1,43 @@
-from konlpy.tag import Komoran
+import time
+import threading
 
-tagger = Komoran()
+# Komoran은 생성할 때 JVM을 시작하므로 import 시점이 아니라 처음 형태소 분석할 때 생성
+# (stats처럼 형태소 분석을 하지 않는 작업은 JVM을 시작하지 않음)
+tagger = None
+tagger_lock = threading.Lock()
+tagger_thread = None
+startup_times = {}  # {"konlpy_import", "komoran_init", "first_use_wait"}: 초
+
+def load_tagger():
+    """konlpy import와 Komoran 생성 (여러 스레드에서 호출해도 한 번만 실행)"""
+    global tagger
+    with tagger_lock:
+        if tagger is None:
+            start = time.perf_counter()
+            from konlpy.tag import Komoran
+            imported = time.perf_counter()
+            instance = Komoran()
+            startup_times["konlpy_import"] = imported - start
+            startup_times["komoran_init"] = time.perf_counter() - imported
+            tagger = instance
+    return tagger
+
+def start_tagger():
+    """백그라운드 스레드에서 Komoran 생성 시작 (인덱스 로드와 JVM 시작을 겹쳐서 첫 쿼리 대기 시간 단축)"""
+    global tagger_thread
+    if tagger is None and tagger_thread is None:
+        tagger_thread = threading.Thread(target=load_tagger, daemon=True)
+        tagger_thread.start()
+
+def get_tagger():
+    """Komoran 인스턴스 (없으면 생성, 백그라운드 생성 중이면 끝날 때까지 대기)"""
+    if tagger is None:
+        start = time.perf_counter()
+        load_tagger()
+        startup_times["first_use_wait"] = time.perf_counter() - start
+    return tagger
 
 def extract_terms(text):
-    tokens = tagger.pos(text)
+    tokens = get_tagger().pos(text)
     return [w.lower() if t == 'SL' else w for w, t in tokens
             if t in {'NNG', 'NNP', 'SL'}]
\ No newline at end of file
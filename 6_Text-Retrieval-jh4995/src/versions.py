@@ -0,0 +1,84 @@
+import os
+import re
+import json
+import time
+import shutil
+
+
+class IndexVersions:
+    """버전별 인덱스 디렉토리와 현재 버전 포인터(CURRENT) 관리
+    
+    index root/
+    ├── CURRENT      # {"version": "v0003", ...}
+    ├── v0002/       # 이전 버전 (실행 중인 Searcher가 아직 사용 중일 수 있음)
+    └── v0003/       # 현재 버전
+    
+    새 인덱스는 항상 새 디렉토리에 만들고 모든 파일 저장이 끝난 뒤 CURRENT를 교체하므로,
+    검색 측은 만들어지는 중인 인덱스를 보지 않음
+    """
+    
+    CURRENT_FILE = "CURRENT"
+    VERSION_PATTERN = re.compile(r'^v(\d+)$')
+    
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.current_path = os.path.join(self.root, self.CURRENT_FILE)
+    
+    @classmethod
+    def is_versioned(cls, root):
+        """root가 버전별 인덱스 디렉토리(CURRENT 포인터가 있음)인지 확인"""
+        return os.path.exists(os.path.join(root, cls.CURRENT_FILE))
+    
+    def versions(self):
+        """root 아래 버전 이름 목록 (번호 오름차순)"""
+        if not os.path.isdir(self.root):
+            return []
+        names = [name for name in os.listdir(self.root)
+                 if self.VERSION_PATTERN.match(name) and os.path.isdir(os.path.join(self.root, name))]
+        return sorted(names, key=lambda name: int(self.VERSION_PATTERN.match(name).group(1)))
+    
+    def path(self, version):
+        """버전 디렉토리 경로"""
+        return os.path.join(self.root, version)
+    
+    def create(self):
+        """다음 번호의 빈 버전 디렉토리를 만들고 (버전 이름, 경로) 반환"""
+        os.makedirs(self.root, exist_ok=True)
+        existing = self.versions()
+        number = int(self.VERSION_PATTERN.match(existing[-1]).group(1)) + 1 if existing else 1
+        version = f"v{number:04d}"
+        os.makedirs(self.path(version))
+        return version, self.path(version)
+    
+    def current(self):
+        """CURRENT가 가리키는 버전 이름 (없으면 None)"""
+        try:
+            with open(self.current_path, 'r', encoding='utf8') as f:
+                return json.load(f)["version"]
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def publish(self, version):
+        """CURRENT를 version으로 원자적으로 교체 (임시 파일에 쓴 뒤 os.replace)"""
+        tmp_path = self.current_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump({"version": version, "published": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.current_path)
+    
+    def cleanup(self, keep=2):
+        """현재 버전을 포함해 CURRENT 이하의 최근 keep개 버전만 남기고 삭제 (사용 중이라 지울 수 없는 파일은 남겨 둠)
+        
+        CURRENT보다 번호가 큰 버전은 다른 인덱서가 만들고 있거나 아직 게시하지 않은 것이므로 세지도 지우지도 않음
+        CURRENT가 없으면 아무것도 삭제하지 않음
+        """
+        current = self.current()
+        versions = self.versions()
+        if current not in versions:
+            return []
+        published = versions[:versions.index(current) + 1]
+        removed = published[:-max(1, keep)]
+        for version in removed:
+            shutil.rmtree(self.path(version), ignore_errors=True)
+        return removed
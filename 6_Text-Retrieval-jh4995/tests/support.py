@@ -0,0 +1,96 @@
+import os
+import re
+import json
+import random
+import tempfile
+import contextlib
+from unittest import mock
+from src import tokenizer
+from src.indexer import Indexer
+
+DOC_TABLE_FILE = "doc_table.json"
+TERM_DICT_FILE = "term_dict.json"
+POSTINGS_FILE = "postings.bin"
+MANIFEST_FILE = "manifest.json"
+METADATA_FILTERS = {"CLASS": ("ipc", "category"), "YEAR": ("application_date", "year")}
+
+VOCABULARY = ["위성", "서버", "컴퓨터", "반도체", "데이터", "보안", "통신", "무선", "터빈", "증기",
+              "전극", "기판", "신호", "모듈", "장치", "방법", "시스템", "제어", "검출", "센서",
+              "laser", "led", "nano", "sensor", "wireless", "protocol", "battery", "display"]
+
+
+class FakeTagger:
+    """Komoran 대신 사용하는 형태소 분석기 (한글 -> NNG, 영문 -> SL, 숫자 -> SN, JVM 없이 테스트)
+    
+    STOP_WORDS는 Komoran이 명사로 분석하지 않는 단어처럼 VV로 태깅 (term이 나오지 않음)
+    """
+    
+    STOP_WORDS = {"위한", "하는", "및"}
+    
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after  # 이 횟수만큼 분석한 뒤에는 KeyboardInterrupt (인덱싱 중단 재현용)
+    
+    def pos(self, text):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise KeyboardInterrupt
+        tags = []
+        for match in re.finditer(r'[가-힣]+|[A-Za-z]+|\d+', text):
+            word = match.group()
+            if word.isdigit():
+                tags.append((word, 'SN'))
+            elif word in self.STOP_WORDS:
+                tags.append((word, 'VV'))
+            elif word.isascii():
+                tags.append((word, 'SL'))
+            else:
+                tags.append((word, 'NNG'))
+        return tags
+
+
+def use_tagger(tagger=None):
+    """tokenizer.tagger를 FakeTagger로 교체하는 patch"""
+    return mock.patch.object(tokenizer, "tagger", tagger or FakeTagger())
+
+
+def make_corpus(data_dir, num_docs, seed=0):
+    """앞쪽 단어가 자주 나오는 (Zipf 분포) 임의의 특허 JSON 문서 num_docs개를 하위 디렉토리에 나눠 생성"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    
+    def text(min_len, max_len):
+        return " ".join(rng.choices(VOCABULARY, weights, k=rng.randint(min_len, max_len)))
+    
+    for i in range(num_docs):
+        sub_dir = os.path.join(data_dir, f"d{i % 4}")
+        os.makedirs(sub_dir, exist_ok=True)
+        document = {"dataset": {
+            "invention_title": text(1, 6),
+            "abstract": text(5, 30),
+            "claims": text(10, 80),
+            "ipc": rng.choice(["H01L 21/00", "G06F 17/30", "H04W 4/00"]),
+            "application_date": f"20{rng.randint(10, 23):02d}0{rng.randint(1, 9)}15"
+        }}
+        with open(os.path.join(sub_dir, f"doc_{i:05d}.json"), 'w', encoding='utf8') as f:
+            json.dump(document, f, ensure_ascii=False)
+
+
+def make_indexer(data_dir, index_dir, **kwargs):
+    """테스트용 Indexer (bigram / 메타데이터 필터 포함)"""
+    return Indexer(data_dir, index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                   manifest_file=MANIFEST_FILE, ngram_fields=('T', 'A'),
+                   metadata_filters=METADATA_FILTERS, **kwargs)
+
+
+def build_index(data_dir, index_dir, **kwargs):
+    """인덱스 구축 (진행 상황 출력은 버림)"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        make_indexer(data_dir, index_dir, **kwargs).build_index()
+
+
+def temp_dir(add_cleanup):
+    """테스트가 끝나면 삭제되는 임시 디렉토리 (add_cleanup: addCleanup 또는 addClassCleanup)"""
+    tmp = tempfile.TemporaryDirectory()
+    add_cleanup(tmp.cleanup)
+    return tmp.name
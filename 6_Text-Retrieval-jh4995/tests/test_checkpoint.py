@@ -0,0 +1,66 @@
+import os
+import filecmp
+import unittest
+from .support import FakeTagger, use_tagger, make_corpus, build_index, temp_dir
+
+
+class CheckpointResumeTest(unittest.TestCase):
+    """중간에 중단한 뒤 checkpoint부터 재개한 인덱스가 중단 없이 구축한 인덱스와 바이트 단위로 같은지 확인"""
+    
+    NUM_DOCS = 600
+    
+    @classmethod
+    def setUpClass(cls):
+        root = temp_dir(cls.addClassCleanup)
+        cls.root = root
+        cls.data_dir = os.path.join(root, "data")
+        make_corpus(cls.data_dir, cls.NUM_DOCS)
+    
+    def build_reference(self, index_dir, **kwargs):
+        with use_tagger():
+            build_index(self.data_dir, index_dir, **kwargs)
+    
+    def build_interrupted(self, index_dir, stop_after_docs, **kwargs):
+        """문서 stop_after_docs개를 처리하던 중 중단 (문서당 필드 3개를 토큰화)"""
+        with use_tagger(FakeTagger(fail_after=stop_after_docs * 3)):
+            with self.assertRaises(KeyboardInterrupt):
+                build_index(self.data_dir, index_dir, **kwargs)
+    
+    def assert_same_index(self, expected_dir, actual_dir):
+        names = sorted(name for name in os.listdir(expected_dir) if name != "manifest.json")
+        self.assertEqual(sorted(name for name in os.listdir(actual_dir) if name != "manifest.json"), names)
+        match, mismatch, errors = filecmp.cmpfiles(expected_dir, actual_dir, names, shallow=False)
+        self.assertEqual((mismatch, errors), ([], []))
+    
+    def test_resume_equals_uninterrupted_build(self):
+        for layout in ["field", "merged"]:
+            reference = os.path.join(self.root, f"reference_{layout}")
+            self.build_reference(reference, postings_layout=layout, memory_budget=50000)
+            
+            for stops in [(1,), (150,), (200, 250), (401, 10, 100)]:
+                with self.subTest(layout=layout, stops=stops):
+                    index_dir = os.path.join(self.root, f"resumed_{layout}_{'_'.join(map(str, stops))}")
+                    options = dict(postings_layout=layout, memory_budget=50000, checkpoint_interval=100)
+                    for i, stop in enumerate(stops):
+                        self.build_interrupted(index_dir, stop, resume=i > 0, **options)
+                    with use_tagger():
+                        build_index(self.data_dir, index_dir, resume=True, **options)
+                    self.assert_same_index(reference, index_dir)
+    
+    def test_checkpoints_do_not_create_runs(self):
+        # 메모리 예산이 없으면 run 파일 없이 버퍼 포스팅을 tail 파일에 이어서 기록
+        index_dir = os.path.join(self.root, "no_budget")
+        self.build_interrupted(index_dir, 350, checkpoint_interval=50)
+        names = os.listdir(index_dir)
+        self.assertFalse([name for name in names if name.startswith("postings_run_")])
+        self.assertEqual([name for name in names if name.startswith("checkpoint_tail_")], ["checkpoint_tail_0000.bin"])
+        
+        reference = os.path.join(self.root, "no_budget_reference")
+        self.build_reference(reference)
+        with use_tagger():
+            build_index(self.data_dir, index_dir, checkpoint_interval=50, resume=True)
+        self.assert_same_index(reference, index_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import io
+import json
+import unittest
+import contextlib
+import main
+from unittest import mock
+from src.searcher import Searcher
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+def run_main(argv, stdin=""):
+    """main.main(argv) 실행 후 (종료 코드, stdout, stderr) 반환"""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), \
+            mock.patch("sys.stdin", io.StringIO(stdin)):
+        exit_code = main.main(argv)
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+class SearchJsonOutputTest(unittest.TestCase):
+    """search --format json의 stdout이 쿼리당 JSON 한 줄로만 이루어지는지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.index_dir = os.path.join(root, "index")
+        cls.data_dir = os.path.join(root, "data")
+        make_corpus(cls.data_dir, 100)
+        build_index(cls.data_dir, cls.index_dir)
+    
+    def run_search(self, queries, *options):
+        query_file = os.path.join(self.index_dir, "queries.txt")
+        with open(query_file, 'w', encoding='utf8') as f:
+            f.write("\n".join(queries) + "\n")
+        exit_code, stdout, _ = run_main(["--index-dir", self.index_dir, "search", "--query-file", query_file,
+                                         "--format", "json", *options])
+        return exit_code, stdout
+    
+    def test_json_output_parses_line_by_line(self):
+        # 오타 보정 / 와일드카드 / n-gram 보조 검색 안내는 stdout이 아니라 notices에 포함
+        queries = ["반도체 기판", "[FUZZY] 반도채 기판", "반도* 기판", "반도체기판", "[CLASS=H04] laser",
+                   "[VERBOSE] 서버 보안"]
+        exit_code, output = self.run_search(queries, "--snippets", "--timings")
+        self.assertEqual(exit_code, main.EXIT_OK)
+        
+        lines = output.splitlines()
+        self.assertEqual(len(lines), len(queries))
+        for query, line in zip(queries, lines):
+            with self.subTest(query=query):
+                record = json.loads(line)
+                self.assertEqual(record["query"], query)
+                self.assertEqual(set(record), {"query", "total", "total_exact", "exact", "elapsed_ms",
+                                               "notices", "results"})
+                self.assertIsInstance(record["notices"], list)
+                self.assertLessEqual(len(record["results"]), 10)
+        self.assertTrue(any(json.loads(line)["notices"] for line in lines))
+
+
+
+class SubcommandTest(unittest.TestCase):
+    """index / search / bench subcommand의 출력과 종료 코드 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.index_dir = os.path.join(root, "index")
+        cls.missing_dir = os.path.join(root, "missing")
+        make_corpus(cls.data_dir, 100)
+        exit_code, _, _ = run_main(["--index-dir", cls.index_dir, "index", "--data-dir", cls.data_dir,
+                                    "--layout", "merged", "--workers", "2"])
+        assert exit_code == main.EXIT_OK
+    
+    def search_json(self, *argv, stdin=""):
+        exit_code, stdout, stderr = run_main(["--index-dir", self.index_dir, "search", "--format", "json", *argv],
+                                             stdin)
+        return exit_code, [json.loads(line) for line in stdout.splitlines()], stderr
+    
+    def test_index_builds_searchable_index(self):
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, preload_tagger=False)
+        self.addCleanup(searcher.close)
+        self.assertEqual(searcher.postings_layout, "merged")
+        self.assertEqual(len(searcher.doc_table), 100)
+        
+        exit_code, _, stderr = run_main(["--index-dir", self.index_dir, "index", "--data-dir", self.missing_dir])
+        self.assertEqual(exit_code, main.EXIT_FAILURE)
+        self.assertIn(self.missing_dir, stderr)
+    
+    def test_search_pages_match_search_api(self):
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, preload_tagger=False)
+        self.addCleanup(searcher.close)
+        expected = searcher.search("반도체 기판", 5, 3)
+        
+        exit_code, records, _ = self.search_json("반도체 기판", "--offset", "5", "--limit", "3")
+        self.assertEqual(exit_code, main.EXIT_OK)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["total"], expected.total)
+        self.assertEqual([(r["rank"], r["doc_id"], r["filename"], r["score"]) for r in records[0]["results"]],
+                         [(r.rank, r.doc_id, r.filename, r.score) for r in expected.results])
+        
+        exit_code, stdout, _ = run_main(["--index-dir", self.index_dir, "search", "반도체 기판", "--limit", "3"])
+        self.assertEqual(exit_code, main.EXIT_OK)
+        self.assertIn("RESULT: 반도체 기판", stdout)
+        self.assertIn(f"총 {expected.total}개 문서 검색", stdout)
+        self.assertEqual(sum(1 for line in stdout.splitlines() if line.startswith("  ")), 3)
+    
+    def test_search_reads_queries_from_stdin(self):
+        exit_code, records, _ = self.search_json("-", stdin="반도체\n\n서버 보안\n")
+        self.assertEqual(exit_code, main.EXIT_OK)
+        self.assertEqual([record["query"] for record in records], ["반도체", "서버 보안"])
+    
+    def test_query_error_keeps_processing(self):
+        exit_code, records, stderr = self.search_json("-", stdin="*\n반도체\n")
+        self.assertEqual(exit_code, main.EXIT_QUERY_ERROR)
+        self.assertEqual([record["query"] for record in records], ["반도체"])
+        self.assertIn("(*)", stderr)
+    
+    def test_missing_index(self):
+        for command in (["search", "반도체"], ["bench", "반도체"]):
+            with self.subTest(command=command[0]):
+                exit_code, stdout, _ = run_main(["--index-dir", self.missing_dir, *command])
+                self.assertEqual(exit_code, main.EXIT_NO_INDEX)
+                self.assertEqual(stdout, "")
+    
+    def test_bench_reports_latency(self):
+        exit_code, stdout, _ = run_main(["--index-dir", self.index_dir, "bench", "-", "--repeat", "2",
+                                         "--warmup-runs", "0", "--tiers", "T"], "반도체\n서버 보안\n")
+        self.assertEqual(exit_code, main.EXIT_OK)
+        self.assertIn("쿼리 2개 x 2회", stdout)
+        self.assertIn("p95:", stdout)
+        self.assertIn("tiered 평가 (T)", stdout)
+        
+        exit_code, _, _ = run_main(["--index-dir", self.index_dir, "bench", "-"], "")
+        self.assertEqual(exit_code, main.EXIT_FAILURE)
+    
+    def test_usage_errors(self):
+        exit_code, stdout, _ = run_main(["--index-dir", self.index_dir])
+        self.assertEqual(exit_code, main.EXIT_USAGE)
+        self.assertIn("usage", stdout)
+        with self.assertRaises(SystemExit) as raised:
+            run_main(["--index-dir", self.index_dir, "search", "반도체", "--tiers", "X"])
+        self.assertEqual(raised.exception.code, main.EXIT_USAGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
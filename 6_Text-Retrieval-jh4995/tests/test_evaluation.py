@@ -0,0 +1,111 @@
+import os
+import math
+import unittest
+from src import evaluation
+from src.evaluation import ParameterSweep
+from src.searcher import Searcher
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+QUERIES = ["반도체 기판", "[AND] 위성 서버", "[FIELD=T] laser", "[CLASS=H01] 센서 전극", "없는단어"]
+PARAMS = [{}, {"K1": 1.6, "B_C": 0.3}, {"W_T": 1.0, "W_A": 3.0, "B_T": 0.9}, {"K1": 0.5, "W_C": 0.2, "B_A": 0.0}]
+
+
+class ParameterSweepTest(unittest.TestCase):
+    """캐시된 배열로 다시 계산한 점수 / 지표가 같은 파라미터의 Searcher 점수로 계산한 값과 같은지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.index_dir = os.path.join(root, "index")
+        make_corpus(cls.data_dir, 200)
+        build_index(cls.data_dir, cls.index_dir)
+    
+    def open(self, params=None):
+        """params를 인스턴스 속성으로 적용한 Searcher"""
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, use_ngrams=False, preload_tagger=False)
+        self.addCleanup(searcher.close)
+        params = params or {}
+        searcher.K1 = params.get("K1", searcher.K1)
+        searcher.FIELD_WEIGHTS = {field: params.get(f"W_{field}", weight) for field, weight in searcher.FIELD_WEIGHTS.items()}
+        searcher.FIELD_B = {field: params.get(f"B_{field}", b) for field, b in searcher.FIELD_B.items()}
+        return searcher
+    
+    def judgments(self):
+        """결과가 3개 이상인 쿼리는 기본 파라미터 검색의 1번째 (등급 2), 3번째 (등급 1) 문서를 정답으로 지정
+        
+        모든 쿼리에 인덱스에 없는 문서도 정답으로 넣음 (doc_table에 없으므로 평가에서 제외됨)
+        """
+        searcher = self.open()
+        judgments = []
+        for query in QUERIES:
+            results = searcher.search(query, 0, 10).results
+            relevant = {"없는문서.json": 1}
+            if len(results) >= 3:
+                relevant.update({results[0].filename: 2, results[2].filename: 1})
+            judgments.append({"query": query, "relevant": relevant})
+        return judgments
+    
+    def sweeps(self, judgments):
+        backends = [False] + ([True] if evaluation.np is not None else [])
+        sweeps = []
+        for use_numpy in backends:
+            sweep = ParameterSweep(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, judgments,
+                                   use_numpy=use_numpy)
+            self.addCleanup(sweep.searcher.close)
+            sweeps.append(sweep)
+        return sweeps
+    
+    def test_rescore_equals_bm25f(self):
+        judgments = self.judgments()
+        for sweep in self.sweeps(judgments):
+            for params in PARAMS:
+                searcher = self.open(params)
+                full_params = sweep.default_params()
+                full_params.update(params)
+                for judgment, entry in zip(judgments, sweep.cache):
+                    with self.subTest(numpy=sweep.use_numpy, params=params, query=judgment["query"]):
+                        expected = searcher.search(judgment["query"], 0, 1000)
+                        scores = sweep.rescore(entry, full_params)
+                        ranked = sorted(((doc_id, score) for doc_id, score in zip(entry["docs"], scores) if score > 0),
+                                        key=lambda item: (-item[1], item[0]))
+                        self.assertEqual(len(ranked), expected.total)
+                        for (_, score), result in zip(ranked, expected.results):
+                            self.assertAlmostEqual(score, result.score)
+    
+    def test_metrics(self):
+        judgments = self.judgments()
+        sweep = self.sweeps(judgments)[0]
+        # 기본 파라미터의 순위가 그대로이므로 정답이 있는 쿼리는 1, 3번째가 정답
+        ap = (1 / 1 + 2 / 3) / 2
+        dcg = (2 ** 2 - 1) / math.log2(2) + (2 ** 1 - 1) / math.log2(4)
+        idcg = (2 ** 2 - 1) / math.log2(2) + (2 ** 1 - 1) / math.log2(3)
+        metrics = sweep.evaluate()
+        judged = [judgment for judgment in judgments if len(judgment["relevant"]) == 3]
+        self.assertGreaterEqual(len(judged), 3)
+        self.assertAlmostEqual(metrics["map"], ap * len(judged) / len(judgments))
+        self.assertAlmostEqual(metrics["ndcg@10"], dcg / idcg * len(judged) / len(judgments))
+        self.assertAlmostEqual(metrics["recall@10"], len(judged) / len(judgments))
+    
+    def test_grid_search(self):
+        sweep = self.sweeps(self.judgments())[0]
+        grid = {"K1": [0.5, 1.1, 2.0], "B_C": [0.3, 0.8]}
+        results = sweep.grid_search(grid, metric="ndcg")
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sorted((params["K1"], params["B_C"]) for params, _ in results),
+                         sorted((k1, b) for k1 in grid["K1"] for b in grid["B_C"]))
+        values = [metrics["ndcg@10"] for _, metrics in results]
+        self.assertEqual(values, sorted(values, reverse=True))
+        for params, metrics in results:
+            self.assertEqual(metrics, sweep.evaluate(params))
+        with self.assertRaises(ValueError):
+            sweep.grid_search({"K2": [1.0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import json
+import random
+import unittest
+from src.filters import Bitmap
+from src.searcher import Searcher
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+class BitmapTest(unittest.TestCase):
+    """Bitmap 집합 연산 / 직렬화가 Python set과 같은지 확인 (array container와 bitset container 모두)"""
+    
+    def random_set(self, rng):
+        doc_ids = set()
+        for key in rng.sample(range(4), rng.randint(1, 3)):
+            # ARRAY_LIMIT보다 많으면 bitset container
+            count = rng.choice([1, 100, Bitmap.ARRAY_LIMIT, Bitmap.ARRAY_LIMIT + 1, 10000])
+            doc_ids.update((key << 16) + low for low in rng.sample(range(1 << 16), count))
+        return doc_ids
+    
+    def test_set_operations(self):
+        rng = random.Random(0)
+        for _ in range(8):
+            a, b = self.random_set(rng), self.random_set(rng)
+            bitmap_a, bitmap_b = Bitmap.from_sorted(sorted(a)), Bitmap.from_sorted(sorted(b))
+            for bitmap, expected in [(bitmap_a, a), (bitmap_a & bitmap_b, a & b), (bitmap_a | bitmap_b, a | b)]:
+                self.assertEqual(list(bitmap), sorted(expected))
+                self.assertEqual(len(bitmap), len(expected))
+                self.assertEqual(list(Bitmap.from_bytes(bitmap.to_bytes())), sorted(expected))
+                for doc_id in rng.sample(range(4 << 16), 200):
+                    self.assertEqual(doc_id in bitmap, doc_id in expected)
+
+
+class FilterQueryTest(unittest.TestCase):
+    """필터 prefix를 붙인 검색 결과가 필터 없는 결과에서 메타데이터 조건을 만족하는 문서만 남긴 것과 같은지 확인"""
+    
+    def test_filtered_search(self):
+        with use_tagger():
+            root = temp_dir(self.addCleanup)
+            data_dir = os.path.join(root, "data")
+            make_corpus(data_dir, 300)
+            build_index(data_dir, os.path.join(root, "index"))
+            searcher = Searcher(os.path.join(root, "index"), DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                use_impacts=False, preload_tagger=False)
+            self.addCleanup(searcher.close)
+            
+            metadata = {}
+            for doc_id, entry in searcher.doc_table.items():
+                with open(entry["path"], encoding='utf8') as f:
+                    dataset = json.load(f)["dataset"]
+                metadata[int(doc_id)] = (dataset["ipc"], int(dataset["application_date"][:4]))
+            
+            conditions = {
+                "[CLASS=H01]": lambda ipc, year: ipc.startswith("H01"),
+                "[CLASS=g06f]": lambda ipc, year: ipc.startswith("G06F"),
+                "[YEAR>=2018]": lambda ipc, year: year >= 2018,
+                "[YEAR<2012]": lambda ipc, year: year < 2012,
+                "[YEAR=2015]": lambda ipc, year: year == 2015,
+                "[CLASS=H][YEAR>2020]": lambda ipc, year: ipc.startswith("H") and year > 2020,
+            }
+            for query in ["반도체", "위성 서버", "laser"]:
+                unfiltered = searcher.search(query, 0, 1000)
+                for prefix, condition in conditions.items():
+                    with self.subTest(query=prefix + query):
+                        expected = [(r.doc_id, r.score) for r in unfiltered.results if condition(*metadata[r.doc_id])]
+                        actual = searcher.search(prefix + query, 0, 1000)
+                        self.assertEqual(actual.total, len(expected))
+                        self.assertEqual([(r.doc_id, r.score) for r in actual.results], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
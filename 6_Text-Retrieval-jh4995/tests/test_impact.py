@@ -0,0 +1,139 @@
+import os
+import random
+import contextlib
+import unittest
+from collections import Counter
+from unittest import mock
+from src.searcher import Searcher
+from src.impact import ImpactBuilder
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, VOCABULARY,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+def build_impacts(index_dir, sample_queries=0, **kwargs):
+    """impact 인덱스 생성 후 top-k 일치율 반환 (진행 상황 출력은 버림)"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        builder = ImpactBuilder(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, **kwargs)
+        return builder.build(sample_queries)
+
+
+class AnytimeTest(unittest.TestCase):
+    """impact-ordered 인덱스의 score-at-a-time 누적이 예산 제한이 없을 때 impact 합산과 같은지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.index_dir = os.path.join(root, "index")
+        make_corpus(cls.data_dir, 300)
+        build_index(cls.data_dir, cls.index_dir)
+        build_impacts(cls.index_dir, order="impact")
+        
+        # 같은 term이 여러 번 나오는 쿼리 포함
+        rng = random.Random(3)
+        cls.queries = [[term.lower() for term in rng.choices(VOCABULARY, k=rng.randint(1, 4))] for _ in range(50)]
+        cls.queries += [["위성", "위성"], ["반도체", "반도체", "반도체", "기판"]]
+    
+    def open(self, **kwargs):
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_unlimited_anytime_equals_impact_sum(self):
+        searcher = self.open()
+        scale = searcher.impact_metadata["scale"]
+        for query_terms in self.queries:
+            with self.subTest(terms=query_terms):
+                doc_impacts, exact = searcher.accumulate_anytime(query_terms)
+                self.assertTrue(exact)
+                self.assertEqual({doc_id: total * scale for doc_id, total in doc_impacts.items()},
+                                 searcher.score_docs_impact(query_terms))
+    
+    def test_repeated_terms_search(self):
+        exhaustive = self.open()
+        anytime = self.open(postings_budget=10 ** 9)
+        for query in ["위성 위성", "반도체 반도체 기판", "기판 반도체 기판"]:
+            with self.subTest(query=query):
+                expected = exhaustive.search(query, 0, 10)
+                actual = anytime.search(query, 0, 10)
+                self.assertTrue(actual.exact)
+                self.assertEqual([(r.doc_id, r.score) for r in actual.results],
+                                 [(r.doc_id, r.score) for r in expected.results])
+
+
+
+class ImpactBuilderTest(unittest.TestCase):
+    """양자화된 impact가 exact BM25F 기여도와 scale 이내로 일치하고 정렬 순서와 무관한지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        make_corpus(cls.data_dir, 300)
+        cls.index_dirs = {}
+        cls.overlaps = {}
+        for order in ImpactBuilder.ORDERS:
+            cls.index_dirs[order] = os.path.join(root, order)
+            build_index(cls.data_dir, cls.index_dirs[order])
+            cls.overlaps[order] = build_impacts(cls.index_dirs[order], sample_queries=50, order=order)
+    
+    def open(self, order, **kwargs):
+        searcher = Searcher(self.index_dirs[order], DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_impacts_match_exact_contributions(self):
+        exact = self.open("doc", use_impacts=False)
+        for order in ImpactBuilder.ORDERS:
+            searcher = self.open(order)
+            scale = searcher.impact_metadata["scale"]
+            for term in exact.term_dict:
+                with self.subTest(order=order, term=term):
+                    contributions = exact.term_contributions(term, ImpactBuilder.FIELDS)
+                    impacts = dict(searcher.get_impact_postings(term))
+                    self.assertEqual(sorted(impacts), sorted(contributions))
+                    for doc_id, score in contributions.items():
+                        self.assertLessEqual(abs(impacts[doc_id] * scale - score), scale)
+    
+    def test_orders_give_same_scores(self):
+        doc_order = self.open("doc")
+        impact_order = self.open("impact")
+        rng = random.Random(4)
+        for _ in range(50):
+            query_terms = [term.lower() for term in rng.sample(VOCABULARY, rng.randint(1, 4))]
+            with self.subTest(terms=query_terms):
+                self.assertEqual(impact_order.score_docs_impact(query_terms), doc_order.score_docs_impact(query_terms))
+        self.assertEqual(self.overlaps["impact"], self.overlaps["doc"])
+        self.assertGreater(self.overlaps["doc"], 0.5)
+    
+    def test_ranking_loss_samples_by_df(self):
+        builder = ImpactBuilder(self.index_dirs["doc"], DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE)
+        self.addCleanup(builder.searcher.close)
+        sampled = Counter()
+        original = builder.exact_term_contributions
+        
+        def record(term):
+            sampled[term] += 1
+            return original(term)
+        
+        terms = sorted(builder.searcher.term_dict)
+        with mock.patch.object(builder, "exact_term_contributions", record):
+            builder.evaluate_ranking_loss(terms, 1.0, 300, 10)
+        
+        # df가 큰 term일수록 자주 뽑힘 (df 상위 4개 term과 하위 4개 term의 df 합은 두 배 이상 차이, 균등 추출이면 비슷함)
+        by_df = sorted(terms, key=lambda term: builder.searcher.term_dict[term]["df"])
+        self.assertGreater(sum(sampled[term] for term in by_df[-4:]), 1.5 * sum(sampled[term] for term in by_df[:4]))
+
+
+if __name__ == "__main__":
+    unittest.main()
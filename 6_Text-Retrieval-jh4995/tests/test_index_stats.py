@@ -0,0 +1,159 @@
+import io
+import os
+import json
+import random
+import unittest
+import contextlib
+from src.index_stats import IndexStats, JsonObjectReader, iter_json_items, read_json_key
+from src.versions import IndexVersions
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+class JsonStreamTest(unittest.TestCase):
+    """작은 chunk로 읽어도 JsonObjectReader가 json.load와 같은 값을 내는지 확인"""
+    
+    def setUp(self):
+        rng = random.Random(3)
+        self.data = {
+            "metadata": {"avgdl": 12.25, "layout": "field", "escaped": "따옴표 \" 역슬래시 \\ 줄바꿈 \n"},
+            "documents": {str(i): {"len_T": rng.randint(0, 10 ** rng.randint(1, 7)), "name": f"문서_{i}",
+                                   "values": [rng.random() for _ in range(rng.randint(0, 3))], "flag": None}
+                          for i in range(200)},
+            "empty": {},
+            "last": -1e-7
+        }
+        self.path = os.path.join(temp_dir(self.addCleanup), "data.json")
+        with open(self.path, 'w', encoding='utf8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=1)
+    
+    def test_values_match_json_load(self):
+        for chunk_size in (1, 3, 7, 64, 1 << 20):
+            with self.subTest(chunk_size=chunk_size), open(self.path, 'r', encoding='utf8') as f:
+                reader = JsonObjectReader(f, chunk_size)
+                self.assertEqual({key: reader.value() for key in reader.keys()}, self.data)
+    
+    def test_nested_items_and_single_key(self):
+        self.assertEqual(list(iter_json_items(self.path)), list(self.data.items()))
+        self.assertEqual(list(iter_json_items(self.path, "documents")), list(self.data["documents"].items()))
+        self.assertEqual(list(iter_json_items(self.path, "empty")), [])
+        self.assertEqual(read_json_key(self.path, "last"), -1e-7)
+        self.assertIsNone(read_json_key(self.path, "missing"))
+    
+    def test_malformed_json_raises_value_error(self):
+        with open(self.path, 'w', encoding='utf8') as f:
+            f.write('{"a": 1 "b": 2}')
+        with self.assertRaises(ValueError):
+            list(iter_json_items(self.path))
+
+
+class IndexStatsTest(unittest.TestCase):
+    """collect() 통계가 term_dict.json / doc_table.json을 통째로 읽어 계산한 값과 같은지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        data_dir = os.path.join(root, "data")
+        cls.field_dir = os.path.join(root, "field")
+        cls.merged_dir = os.path.join(root, "merged")
+        cls.versioned_dir = os.path.join(root, "versioned")
+        make_corpus(data_dir, 120)
+        build_index(data_dir, cls.field_dir, impact_bits=8)
+        build_index(data_dir, cls.merged_dir, postings_layout="merged")
+        build_index(data_dir, cls.versioned_dir, versioned=True)
+    
+    def collect(self, index_dir, **kwargs):
+        return IndexStats(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, **kwargs).collect()
+    
+    def load(self, index_dir, file_name):
+        with open(os.path.join(index_dir, file_name), 'r', encoding='utf8') as f:
+            return json.load(f)
+    
+    def test_term_stats_match_term_dict(self):
+        for index_dir, layout, fields, record_size in [(self.field_dir, "field", ('T', 'A', 'C'), 8),
+                                                       (self.merged_dir, "merged", ('M',), 16)]:
+            with self.subTest(layout=layout):
+                report = self.collect(index_dir, top_n=5, high_df_ratio=0.5)
+                term_dict = self.load(index_dir, TERM_DICT_FILE)
+                terms = report["terms"]
+                self.assertEqual(report["postings_layout"], layout)
+                self.assertEqual(terms["num_terms"], len(term_dict))
+                self.assertEqual(list(terms["postings"]), list(fields))
+                for field in fields:
+                    lengths = [entry[field]["length"] for entry in term_dict.values() if field in entry]
+                    self.assertEqual(terms["postings"][field]["sum"], sum(lengths))
+                    self.assertEqual(terms["postings"][field]["bytes"], sum(lengths) * record_size)
+                    self.assertEqual(sum(count for _, _, count in terms["postings"][field]["histogram"]),
+                                     len(lengths))
+                
+                dfs = sorted(entry["df"] for entry in term_dict.values())
+                self.assertEqual((terms["df"]["min"], terms["df"]["max"]), (dfs[0], dfs[-1]))
+                
+                term_bytes = sorted(((sum(entry[field]["length"] for field in fields if field in entry) * record_size,
+                                      term) for term, entry in term_dict.items()), reverse=True)
+                self.assertEqual([(item["bytes"], item["term"]) for item in terms["largest_terms"]], term_bytes[:5])
+                
+                high_df = sorted(((entry["df"], term) for term, entry in term_dict.items()
+                                  if entry["df"] / report["num_docs"] >= 0.5), reverse=True)
+                self.assertEqual(terms["num_high_df_terms"], len(high_df))
+                self.assertEqual([(item["df"], item["term"]) for item in terms["high_df_terms"]], high_df[:5])
+                
+                self.assertEqual(terms["postings_file_bytes"], os.path.getsize(os.path.join(index_dir, POSTINGS_FILE)))
+                self.assertEqual(terms["unreferenced_bytes"], 0)
+    
+    def test_document_stats_and_components(self):
+        report = self.collect(self.field_dir)
+        doc_table = self.load(self.field_dir, DOC_TABLE_FILE)
+        self.assertEqual(report["num_docs"], 120)
+        for field in ('T', 'A', 'C'):
+            lengths = sorted(doc[f"len_{field}"] for doc in doc_table["documents"].values())
+            self.assertEqual(report["doc_lengths"][field]["sum"], sum(lengths))
+            self.assertEqual(report["doc_lengths"][field]["p50"], lengths[60])
+            self.assertAlmostEqual(report["avgdl"][field], doc_table["metadata"][f"avgdl_{field}"])
+        
+        names = [file["file"] for component in report["components"] for file in component["files"]]
+        self.assertEqual(sorted(names), sorted(name for name in os.listdir(self.field_dir)
+                                               if os.path.isfile(os.path.join(self.field_dir, name))))
+        self.assertEqual(report["total_bytes"], sum(os.path.getsize(os.path.join(self.field_dir, name))
+                                                     for name in names))
+        self.assertIn("포스팅", [component["name"] for component in report["components"]])
+        
+        self.assertEqual(report["impacts"]["bits"], 8)
+        self.assertEqual(report["impacts"]["num_terms"], report["terms"]["num_terms"])
+        self.assertGreater(report["ngrams"]["num_grams"], 0)
+        self.assertIsNone(self.collect(self.merged_dir)["impacts"])
+        json.dumps(report)
+    
+    def test_versioned_index_uses_current(self):
+        report = self.collect(self.versioned_dir)
+        current = IndexVersions(self.versioned_dir).current()
+        self.assertEqual(report["version"], current)
+        self.assertEqual(report["index_dir"], IndexVersions(self.versioned_dir).path(current))
+        self.assertEqual(report["num_docs"], 120)
+    
+    def test_print_report(self):
+        stats = IndexStats(self.field_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, top_n=3)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            stats.print_report()
+        output = stdout.getvalue()
+        self.assertIn("문서 수: 120", output)
+        self.assertIn("[포스팅 바이트 상위 3개 term]", output)
+        self.assertIn("[impact 인덱스] 8비트", output)
+    
+    def test_distribution_and_histogram(self):
+        self.assertEqual(IndexStats.distribution([]), {"count": 0, "sum": 0, "mean": 0, "min": 0, "max": 0})
+        values = list(range(100, 0, -1))
+        self.assertEqual(IndexStats.distribution(values),
+                         {"count": 100, "sum": 5050, "mean": 50.5, "min": 1, "p50": 51, "p90": 91, "p99": 100,
+                          "max": 100})
+        self.assertEqual(IndexStats.log2_histogram([0, 1, 2, 3, 4, 7, 8]),
+                         [(0, 0, 1), (1, 1, 1), (2, 3, 2), (4, 7, 2), (8, 15, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import random
+import unittest
+from array import array
+from collections import Counter
+from unittest import mock
+from src.indexer import PostingsBuffer
+from .support import TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+def random_documents(num_docs, seed=0):
+    """[{field: Counter}, ...] 임의의 문서별 필드 term 빈도"""
+    rng = random.Random(seed)
+    vocabulary = [f"t{i}" for i in range(300)]
+    return [{field: Counter(rng.choices(vocabulary, k=rng.randint(0, 20))) for field in PostingsBuffer.FIELDS}
+            for _ in range(num_docs)]
+
+
+class PostingsBufferTest(unittest.TestCase):
+    
+    def collect(self, buffer):
+        return {(buffer.terms[term_id], field): buf.tolist()
+                for term_id, field_postings in buffer.iter_postings() for field, buf in field_postings.items()}
+    
+    def build(self, documents, memory_budget=None):
+        buffer = PostingsBuffer(temp_dir(self.addCleanup), memory_budget)
+        for doc_id, field_freqs in enumerate(documents):
+            buffer.add_document(doc_id, field_freqs)
+        return buffer
+    
+    def test_postings_match_documents(self):
+        documents = random_documents(300)
+        expected = {}
+        doc_freqs = Counter()
+        for doc_id, field_freqs in enumerate(documents):
+            for field, counts in field_freqs.items():
+                for term, tf in counts.items():
+                    expected.setdefault((term, field), []).extend((doc_id, tf))
+            doc_freqs.update(set().union(*field_freqs.values()))
+        
+        buffer = self.build(documents)
+        self.assertEqual(self.collect(buffer), expected)
+        self.assertEqual({term: buffer.doc_freqs[term_id] for term_id, term in enumerate(buffer.terms)}, doc_freqs)
+        # term id는 처음 나온 순서, iter_postings는 term id 순서
+        self.assertEqual([term_id for term_id, _ in buffer.iter_postings()], list(range(len(buffer.terms))))
+    
+    def test_spilled_runs_merge_to_in_memory_postings(self):
+        documents = random_documents(500)
+        expected = self.collect(self.build(documents))
+        for max_open_runs in [PostingsBuffer.MAX_OPEN_RUNS, 4, 2]:
+            with self.subTest(max_open_runs=max_open_runs), mock.patch.object(PostingsBuffer, "MAX_OPEN_RUNS", max_open_runs):
+                buffer = self.build(documents, memory_budget=2000)
+                self.assertGreater(len(buffer.runs), 4)
+                self.assertEqual(self.collect(buffer), expected)
+                # run이 MAX_OPEN_RUNS개를 넘으면 중간 병합 파일을 거쳐 병합
+                self.assertEqual(bool(buffer.merge_files), len(buffer.runs) > max_open_runs)
+                buffer.remove_runs()
+                self.assertEqual(os.listdir(buffer.spill_dir), [])
+    
+    def test_checkpoint_delta_round_trip(self):
+        documents = random_documents(200, seed=1)
+        buffer = self.build(documents[:120])
+        restored = PostingsBuffer()
+        restored.restore(list(buffer.terms), array('i', buffer.doc_freqs), [])
+        restored.apply_checkpoint_delta(buffer.checkpoint_delta(0))
+        self.assertEqual(self.collect(restored), self.collect(buffer))
+        self.assertEqual(restored.buffered_bytes, buffer.buffered_bytes)
+        
+        # since_doc_id 이후의 포스팅만 포함
+        delta = buffer.checkpoint_delta(100)
+        partial = PostingsBuffer()
+        partial.restore(list(buffer.terms), array('i', buffer.doc_freqs), [])
+        partial.apply_checkpoint_delta(delta)
+        expected = {key: [value for i in range(0, len(postings), 2) if postings[i] >= 100
+                          for value in postings[i:i + 2]]
+                    for key, postings in self.collect(buffer).items()}
+        self.assertEqual(self.collect(partial), {key: postings for key, postings in expected.items() if postings})
+
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    """메모리 예산으로 run 파일을 내보내며 구축한 인덱스가 예산 없이 구축한 인덱스와 같은지 확인"""
+    
+    def test_memory_budget_gives_identical_index(self):
+        patcher = use_tagger()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        root = temp_dir(self.addCleanup)
+        data_dir = os.path.join(root, "data")
+        make_corpus(data_dir, 200)
+        for layout in ["field", "merged"]:
+            with self.subTest(layout=layout):
+                outputs = []
+                for name, memory_budget in [("memory", None), ("spilled", 5000)]:
+                    index_dir = os.path.join(root, f"{layout}_{name}")
+                    build_index(data_dir, index_dir, postings_layout=layout, memory_budget=memory_budget)
+                    outputs.append([])
+                    for file_name in [TERM_DICT_FILE, POSTINGS_FILE]:
+                        with open(os.path.join(index_dir, file_name), 'rb') as f:
+                            outputs[-1].append(f.read())
+                    # 구축이 끝나면 run 파일은 남지 않음
+                    self.assertFalse([name for name in os.listdir(index_dir) if name.endswith(".tmp")])
+                self.assertEqual(outputs[1], outputs[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
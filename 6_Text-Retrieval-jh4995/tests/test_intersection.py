@@ -0,0 +1,81 @@
+import os
+import json
+import random
+import unittest
+from bisect import bisect_left
+from src.searcher import Searcher, gallop
+from src.tokenizer import extract_terms
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, VOCABULARY,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+class GallopTest(unittest.TestCase):
+    
+    def test_gallop_equals_bisect(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            arr = sorted(rng.sample(range(1000), rng.randint(0, 100)))
+            lo = rng.randint(0, len(arr))
+            target = rng.randint(-5, 1005)
+            with self.subTest(arr=arr, lo=lo, target=target):
+                expected = lo if lo < len(arr) and arr[lo] >= target else bisect_left(arr, target, lo)
+                self.assertEqual(gallop(arr, target, lo), expected)
+
+
+class IntersectionTest(unittest.TestCase):
+    """galloping AND 교집합과 정렬된 후보의 점수 계산이 기준 계산과 같은지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.index_dir = os.path.join(root, "index")
+        make_corpus(cls.data_dir, 400)
+        build_index(cls.data_dir, cls.index_dir)
+    
+    def open(self):
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, preload_tagger=False)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_galloping_and_equals_set_intersection(self):
+        searcher = self.open()
+        
+        # 코퍼스 문서를 직접 토큰화한 필드별 term 집합으로 기대 결과 계산
+        field_keys = {'T': "invention_title", 'A': "abstract", 'C': "claims"}
+        doc_terms = {}
+        for doc_id, entry in searcher.doc_table.items():
+            with open(entry["path"], encoding='utf8') as f:
+                dataset = json.load(f)["dataset"]
+            doc_terms[int(doc_id)] = {field: set(extract_terms(dataset[key])) for field, key in field_keys.items()}
+        
+        rng = random.Random(2)
+        for _ in range(100):
+            query_terms = [term.lower() for term in rng.sample(VOCABULARY, rng.randint(2, 4))]
+            fields = rng.choice([['T'], ['T', 'A'], ['T', 'A', 'C'], ['A', 'C']])
+            with self.subTest(terms=query_terms, fields=fields):
+                expected = sorted(doc_id for doc_id, terms in doc_terms.items()
+                                  if all(any(term in terms[field] for field in fields) for term in query_terms))
+                self.assertEqual(searcher.intersect_sorted(query_terms, fields), expected)
+    
+    
+    def test_sorted_scores_equal_bm25f(self):
+        searcher = self.open()
+        rng = random.Random(3)
+        for _ in range(50):
+            query_terms = [term.lower() for term in rng.sample(VOCABULARY, rng.randint(1, 4))]
+            fields = rng.choice([['T'], ['T', 'A', 'C'], ['A', 'C']])
+            candidates = sorted(searcher.get_candidate_docs(query_terms, fields, False))
+            with self.subTest(terms=query_terms, fields=fields):
+                scores = searcher.score_docs_sorted(query_terms, candidates, fields)
+                self.assertEqual(scores, {doc_id: searcher.calculate_bm25f_score(query_terms, doc_id, fields)
+                                          for doc_id in candidates})
+
+
+if __name__ == "__main__":
+    unittest.main()
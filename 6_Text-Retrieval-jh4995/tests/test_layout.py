@@ -0,0 +1,57 @@
+import os
+import random
+import unittest
+from src.searcher import Searcher
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, VOCABULARY,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+class MergedLayoutTest(unittest.TestCase):
+    """같은 코퍼스의 merged 인덱스가 field 인덱스와 같은 포스팅 / 검색 결과를 내는지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.field_dir = os.path.join(root, "field")
+        cls.merged_dir = os.path.join(root, "merged")
+        make_corpus(cls.data_dir, 400)
+        build_index(cls.data_dir, cls.field_dir, postings_layout="field")
+        build_index(cls.data_dir, cls.merged_dir, postings_layout="merged")
+        
+        rng = random.Random(1)
+        cls.queries = [" ".join(rng.sample(VOCABULARY, rng.randint(1, 4))) for _ in range(60)]
+    
+    def open(self, index_dir, **kwargs):
+        searcher = Searcher(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_merged_postings_equal_field_postings(self):
+        field_searcher = self.open(self.field_dir)
+        merged_searcher = self.open(self.merged_dir)
+        self.assertEqual(sorted(merged_searcher.term_dict), sorted(field_searcher.term_dict))
+        for term in field_searcher.term_dict:
+            for field in ['T', 'A', 'C']:
+                with self.subTest(term=term, field=field):
+                    self.assertEqual(merged_searcher.get_postings_arrays(term, field),
+                                     field_searcher.get_postings_arrays(term, field))
+        
+        for query in self.queries:
+            for prefix in ["", "[AND] ", "[FIELD=T][FIELD=A] "]:
+                with self.subTest(query=prefix + query):
+                    expected = field_searcher.search(prefix + query, 0, 10)
+                    actual = merged_searcher.search(prefix + query, 0, 10)
+                    self.assertEqual(actual.total, expected.total)
+                    self.assertEqual([r.doc_id for r in actual.results], [r.doc_id for r in expected.results])
+                    for result, expected_result in zip(actual.results, expected.results):
+                        self.assertAlmostEqual(result.score, expected_result.score)
+
+
+if __name__ == "__main__":
+    unittest.main()
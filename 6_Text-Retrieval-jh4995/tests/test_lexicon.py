@@ -0,0 +1,144 @@
+import os
+import random
+import fnmatch
+import unittest
+from src.lexicon import Lexicon, bounded_levenshtein
+from src.searcher import Searcher, QueryError
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+def random_terms(num_terms, seed=0):
+    """같은 prefix를 공유하는 term이 많은 임의의 term 목록과 df"""
+    rng = random.Random(seed)
+    alphabet = "가나다라마abc"
+    terms = sorted({"".join(rng.choices(alphabet, k=rng.randint(1, 6))) for _ in range(num_terms)})
+    return terms, {term: rng.randint(1, 50) for term in terms}
+
+
+class LexiconWildcardTest(unittest.TestCase):
+    """prefix 구간 / df segment tree를 이용한 와일드카드 확장이 전체 term 검사와 같은지 확인"""
+    
+    def setUp(self):
+        self.terms, self.doc_freqs = random_terms(3000)
+        self.lexicon = Lexicon(self.terms)
+    
+    def expected_expand(self, pattern, max_terms):
+        matches = [term_no for term_no, term in enumerate(self.terms) if fnmatch.fnmatchcase(term, pattern)]
+        if len(matches) <= max_terms:
+            return [self.terms[term_no] for term_no in matches], False
+        matches.sort(key=lambda term_no: (-self.doc_freqs[self.terms[term_no]], term_no))
+        return [self.terms[term_no] for term_no in matches[:max_terms]], True
+    
+    def test_prefix_range(self):
+        for prefix in ["", "가", "가나", "ab", "라라라", "없음"]:
+            with self.subTest(prefix=prefix):
+                lo, hi = self.lexicon.prefix_range(prefix)
+                self.assertEqual(self.terms[lo:hi], [term for term in self.terms if term.startswith(prefix)])
+    
+    def test_expand_equals_full_scan(self):
+        patterns = ["가*", "가나*", "a*", "*", "가?다*", "*나", "?b*c", "다라마", "없*", "a?"]
+        for pattern in patterns:
+            for max_terms in [1, 5, 50, 10000]:
+                with self.subTest(pattern=pattern, max_terms=max_terms):
+                    self.assertEqual(self.lexicon.expand(pattern, self.doc_freqs.get, max_terms),
+                                     self.expected_expand(pattern, max_terms))
+    
+    def test_wildcard_query(self):
+        with use_tagger():
+            root = temp_dir(self.addCleanup)
+            make_corpus(os.path.join(root, "data"), 200)
+            build_index(os.path.join(root, "data"), os.path.join(root, "index"))
+            searcher = Searcher(os.path.join(root, "index"), DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                use_impacts=False, preload_tagger=False)
+            self.addCleanup(searcher.close)
+            
+            # 매칭 term이 하나뿐인 pattern은 그 term으로 검색한 결과와 같음
+            expected = searcher.search("반도체 기판", 0, 10)
+            actual = searcher.search("반도* 기판", 0, 10)
+            self.assertEqual(actual.total, expected.total)
+            self.assertEqual([(r.doc_id, r.score) for r in actual.results],
+                             [(r.doc_id, r.score) for r in expected.results])
+            # 여러 term에 매칭되면 매칭 term 중 하나라도 포함된 문서 (laser, led)
+            self.assertEqual(searcher.search("l*", 0, 10).total, searcher.search("laser led", 0, 10).total)
+            with self.assertRaises(QueryError):
+                searcher.search("*", 0, 10)
+
+
+
+def levenshtein(a, b):
+    """전체 DP 편집 거리 (기준 계산)"""
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+class FuzzyLookupTest(unittest.TestCase):
+    """bigram prefix filtering으로 찾은 오타 보정 결과가 전체 term의 편집 거리 비교와 같은지 확인"""
+    
+    def setUp(self):
+        self.terms, self.doc_freqs = random_terms(1500, seed=1)
+        self.lexicon = Lexicon(self.terms)
+        
+        # lexicon term을 한두 번 편집한 query (2글자 이상, 1글자는 공유 bigram이 없을 수 있어 근사)
+        rng = random.Random(2)
+        alphabet = "가나다라마바abcd"
+        self.queries = []
+        for term in rng.sample(self.terms, 150):
+            chars = list(term)
+            for _ in range(rng.randint(1, 2)):
+                op = rng.randrange(3)
+                pos = rng.randrange(len(chars) + (op == 1))
+                if op == 0 and chars:
+                    chars[pos] = rng.choice(alphabet)
+                elif op == 1:
+                    chars.insert(pos, rng.choice(alphabet))
+                elif len(chars) > 1:
+                    del chars[pos]
+            if len(chars) >= 2:
+                self.queries.append("".join(chars))
+    
+    def expected_lookup(self, term, max_distance):
+        best = min(((levenshtein(term, candidate), -self.doc_freqs[candidate], candidate)
+                    for candidate in self.terms), default=None)
+        return best[2] if best is not None and best[0] <= max_distance else None
+    
+    def test_bounded_levenshtein(self):
+        for a, b in zip(self.queries, reversed(self.queries)):
+            for max_distance in [0, 1, 2, 3]:
+                with self.subTest(a=a, b=b, max_distance=max_distance):
+                    self.assertEqual(bounded_levenshtein(a, b, max_distance), min(levenshtein(a, b), max_distance + 1))
+    
+    def test_fuzzy_lookup_equals_full_scan(self):
+        found = 0
+        for term in self.queries:
+            max_distance = 1 if len(term) <= 4 else 2
+            with self.subTest(term=term):
+                match = self.lexicon.fuzzy_lookup(term, self.doc_freqs.get)
+                self.assertEqual(match, self.expected_lookup(term, max_distance))
+                found += match is not None
+        self.assertGreater(found, len(self.queries) // 2)
+    
+    def test_fuzzy_query(self):
+        with use_tagger():
+            root = temp_dir(self.addCleanup)
+            make_corpus(os.path.join(root, "data"), 200)
+            build_index(os.path.join(root, "data"), os.path.join(root, "index"))
+            searcher = Searcher(os.path.join(root, "index"), DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                use_impacts=False, use_ngrams=False, preload_tagger=False)
+            self.addCleanup(searcher.close)
+            
+            expected = searcher.search("반도체 wireless", 0, 10)
+            actual = searcher.search("[FUZZY] 반도채 wirelss", 0, 10)
+            self.assertIn("(오타 보정: 반도채 -> 반도체)", actual.notices)
+            self.assertIn("(오타 보정: wirelss -> wireless)", actual.notices)
+            self.assertEqual([(r.doc_id, r.score) for r in actual.results],
+                             [(r.doc_id, r.score) for r in expected.results])
+            self.assertEqual(searcher.search("반도채 wirelss", 0, 10).total, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
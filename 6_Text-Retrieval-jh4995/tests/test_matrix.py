@@ -0,0 +1,70 @@
+import os
+import random
+import contextlib
+import unittest
+from src import matrix
+from src.matrix import MatrixExporter, BatchScorer
+from src.searcher import Searcher
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, VOCABULARY,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+class BatchScorerTest(unittest.TestCase):
+    """export한 행렬로 계산한 배치 점수가 calculate_bm25f_score와 같은지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.index_dir = os.path.join(root, "index")
+        make_corpus(cls.data_dir, 200)
+        build_index(cls.data_dir, cls.index_dir)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            MatrixExporter(cls.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE).export()
+        
+        # 반복 term과 인덱스에 없는 term이 섞인 쿼리 포함
+        rng = random.Random(5)
+        cls.queries = [[term.lower() for term in rng.choices(VOCABULARY, k=rng.randint(1, 4))] for _ in range(40)]
+        cls.queries += [["반도체", "반도체", "기판"], ["없는단어"], [], ["없는단어", "위성"]]
+    
+    def backends(self):
+        return [backend for backend in BatchScorer.BACKENDS if backend != "scipy" or matrix.sparse is not None]
+    
+    def test_scores_equal_bm25f(self):
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, preload_tagger=False)
+        self.addCleanup(searcher.close)
+        for backend in self.backends():
+            scorer = BatchScorer(self.index_dir, backend)
+            for fields in [('T', 'A', 'C'), ('T',), ('A', 'C')]:
+                batch = scorer.score_batch(self.queries, top_k=10, fields=fields)
+                for query_terms, ranked in zip(self.queries, batch):
+                    with self.subTest(backend=backend, fields=fields, terms=query_terms):
+                        candidates = searcher.get_candidate_docs(query_terms, list(fields), False)
+                        expected = sorted(((doc_id, searcher.calculate_bm25f_score(query_terms, doc_id, list(fields)))
+                                           for doc_id in candidates), key=lambda item: -item[1])[:10]
+                        expected = [item for item in expected if item[1] > 0]
+                        self.assertEqual(len(ranked), len(expected))
+                        for (doc_id, score), (_, expected_score) in zip(ranked, expected):
+                            self.assertAlmostEqual(score, expected_score)
+                            self.assertAlmostEqual(score, searcher.calculate_bm25f_score(query_terms, doc_id, list(fields)))
+    
+    def test_backends_agree(self):
+        backends = self.backends()
+        if len(backends) < 2:
+            self.skipTest("numpy / scipy 없음")
+        batches = [BatchScorer(self.index_dir, backend).score_batch(self.queries, top_k=20) for backend in backends]
+        for query_terms, rankings in zip(self.queries, zip(*batches)):
+            with self.subTest(terms=query_terms):
+                # 부동소수점 합산 순서가 달라 동점 문서의 순서는 다를 수 있으므로 점수 목록 비교
+                self.assertEqual(len(rankings[0]), len(rankings[1]))
+                for (_, score), (_, other_score) in zip(*rankings):
+                    self.assertAlmostEqual(score, other_score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import unittest
+from src.searcher import Searcher
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+class NgramFallbackTest(unittest.TestCase):
+    """문자 bigram 보조 검색은 인덱스에 없는 단어에만 사용되어야 함"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.index_dir = os.path.join(root, "index")
+        make_corpus(os.path.join(root, "data"), 200)
+        build_index(os.path.join(root, "data"), cls.index_dir)
+    
+    def open(self, **kwargs):
+        searcher = Searcher(self.index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_in_vocabulary_query_unchanged_by_fallback(self):
+        with_ngrams = self.open()
+        without_ngrams = self.open(use_ngrams=False)
+        self.assertIsNotNone(with_ngrams.ngram_index)
+        # "위한", "및"은 형태소 분석에서 term이 나오지 않는 단어
+        for query in ["[AND] 반도체 위한 기판", "[AND] 서버 및 보안", "반도체 위한 기판", "[AND] laser 센서"]:
+            with self.subTest(query=query):
+                expected = without_ngrams.search(query, 0, 50)
+                actual = with_ngrams.search(query, 0, 50)
+                self.assertEqual([(r.doc_id, r.score) for r in actual.results],
+                                 [(r.doc_id, r.score) for r in expected.results])
+                self.assertEqual(actual.total, expected.total)
+                self.assertEqual(actual.notices, [])
+        self.assertGreater(with_ngrams.search("[AND] 반도체 위한 기판").total, 0)
+    
+    def test_out_of_vocabulary_term_uses_bigram_index(self):
+        searcher = self.open()
+        self.assertNotIn("반도", searcher.term_dict)
+        response = searcher.search("반도", 0, 10)
+        self.assertTrue(any("n-gram" in notice for notice in response.notices))
+        self.assertGreater(response.total, 0)
+    
+    def test_untagged_words_are_opt_in(self):
+        searcher = self.open(ngram_untagged_words=True)
+        self.assertEqual(searcher.find_fallback_words("반도체 위한 기판", ["반도체", "기판"]), ["위한"])
+        self.assertEqual(self.open().find_fallback_words("반도체 위한 기판", ["반도체", "기판"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import contextlib
+import unittest
+from unittest import mock
+from src import pruning
+from src.searcher import Searcher
+from src.pruning import IndexPruner
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+class IndexPrunerTest(unittest.TestCase):
+    """pruning된 인덱스가 방식별 보존 규칙을 지키고, 남은 포스팅의 BM25F 기여도가 원본과 같은지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        cls.root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(cls.root, "data")
+        cls.index_dirs = {}
+        make_corpus(cls.data_dir, 300)
+        for layout in ["field", "merged"]:
+            cls.index_dirs[layout] = os.path.join(cls.root, layout)
+            build_index(cls.data_dir, cls.index_dirs[layout], postings_layout=layout)
+    
+    def pruner(self, layout, name, **kwargs):
+        pruner = IndexPruner(self.index_dirs[layout], DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                             os.path.join(self.root, name), **kwargs)
+        self.addCleanup(pruner.searcher.close)
+        return pruner
+    
+    def prune(self, pruner, sample_queries=20):
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return pruner.prune(sample_queries)
+    
+    def open(self, index_dir):
+        searcher = Searcher(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, use_ngrams=False, preload_tagger=False)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def pruned_contributions(self, pruner):
+        """{term: (원본 기여도, pruning된 인덱스의 기여도)} (포스팅이 모두 제거된 term은 pruning된 인덱스에 없음)"""
+        pruned = self.open(pruner.output_dir)
+        return {term: (pruner.contributions(term),
+                       pruned.term_contributions(term, IndexPruner.FIELDS) if term in pruned.term_dict else {})
+                for term in pruner.searcher.term_dict}
+    
+    def test_term_centric_keeps_top_postings(self):
+        for layout in ["field", "merged"]:
+            pruner = self.pruner(layout, f"term_{layout}", method="term", keep_ratio=0.5, top_k=10)
+            self.prune(pruner)
+            total_before = total_after = 0
+            for term, (original, kept) in self.pruned_contributions(pruner).items():
+                with self.subTest(layout=layout, term=term):
+                    for doc_id, score in kept.items():
+                        self.assertAlmostEqual(score, original[doc_id])
+                    top = sorted(original, key=lambda d: (-original[d], d))[:pruner.top_k]
+                    self.assertLessEqual({doc_id for doc_id in top if original[doc_id] > original[top[-1]]}, set(kept))
+                total_before += len(original)
+                total_after += len(kept)
+            self.assertLess(total_after, total_before)
+    
+    def test_doc_centric_keeps_every_document(self):
+        pruner = self.pruner("field", "doc_field", method="doc", keep_ratio=0.3)
+        self.prune(pruner)
+        original_docs = set()
+        kept_docs = set()
+        for term, (original, kept) in self.pruned_contributions(pruner).items():
+            original_docs.update(original)
+            kept_docs.update(kept)
+        self.assertEqual(kept_docs, original_docs)
+    
+    def test_keep_all_is_lossless(self):
+        for layout in ["field", "merged"]:
+            with self.subTest(layout=layout):
+                overlap = self.prune(self.pruner(layout, f"all_{layout}", keep_ratio=1.0))
+                self.assertEqual(overlap, {5: 1.0, 10: 1.0})
+    
+    def test_evaluate_closes_pruned_searcher(self):
+        pruner = self.pruner("field", "close_field", keep_ratio=0.5)
+        self.prune(pruner, sample_queries=0)
+        opened = []
+        
+        class RecordingSearcher(Searcher):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.closed = False
+                opened.append(self)
+            
+            def close(self):
+                super().close()
+                self.closed = True
+        
+        with mock.patch.object(pruning, "Searcher", RecordingSearcher):
+            # 샘플 쿼리가 없으면 pruning된 인덱스를 열지 않음
+            self.assertIsNone(pruner.evaluate(0))
+            self.assertEqual(opened, [])
+            
+            self.assertIsNotNone(pruner.evaluate(5))
+            with mock.patch.object(RecordingSearcher, "score_docs_sorted", side_effect=OSError):
+                with self.assertRaises(OSError):
+                    pruner.evaluate(5)
+        self.assertEqual([searcher.closed for searcher in opened], [True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
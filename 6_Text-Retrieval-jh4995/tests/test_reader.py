@@ -0,0 +1,62 @@
+import os
+import json
+import unittest
+from src import reader
+from src.reader import FieldReader
+from .support import make_corpus, temp_dir
+
+# selective backend가 잘못 매칭하기 쉬운 문서들 (dataset 밖의 같은 key, 문자열 안의 key 패턴, escape, 빠진 필드)
+TRICKY_DOCUMENTS = [
+    {"dataset": {"invention_title": "반도체 \"기판\"", "abstract": "요약, \"claims\": 가짜", "claims": "청구항",
+                 "ipc": "H01L 21/00"}},
+    {"invention_title": "바깥 제목", "meta": {"claims": "바깥"},
+     "dataset": {"abstract": "{\"invention_title\": 1}", "invention_title": "안쪽 제목", "claims": "c\\n"}},
+    {"dataset": {"invention_title": "제목만", "ipc": ""}},
+    {"dataset": {"claims": ["목록", "값"], "abstract": "", "invention_title": "유니코드 é"}},
+]
+
+
+class FieldReaderTest(unittest.TestCase):
+    """backend마다 세 필드와 메타데이터 값을 같게 읽고 iter_fields가 입력 순서를 지키는지 확인"""
+    
+    def setUp(self):
+        self.root = temp_dir(self.addCleanup)
+        self.paths = []
+        for i, document in enumerate(TRICKY_DOCUMENTS):
+            path = os.path.join(self.root, f"tricky_{i}.json")
+            with open(path, 'w', encoding='utf8') as f:
+                json.dump(document, f, ensure_ascii=i % 2 == 0, indent=i % 2 or None)
+            self.paths.append(path)
+    
+    def expected(self, path, metadata_fields=()):
+        with open(path, encoding='utf8') as f:
+            dataset = json.load(f)["dataset"]
+        return tuple(dataset.get(field, '') for field in FieldReader.FIELDS + tuple(metadata_fields))
+    
+    def backends(self):
+        return [backend for backend in FieldReader.BACKENDS if backend != "orjson" or reader.orjson is not None]
+    
+    def test_backends_read_same_fields(self):
+        for backend in self.backends():
+            for metadata_fields in [(), ("ipc",)]:
+                field_reader = FieldReader(backend, metadata_fields=metadata_fields)
+                for path in self.paths:
+                    with self.subTest(backend=backend, metadata=metadata_fields, path=os.path.basename(path)):
+                        self.assertEqual(field_reader.read_fields(path), self.expected(path, metadata_fields))
+    
+    def test_iter_fields_keeps_input_order(self):
+        make_corpus(os.path.join(self.root, "data"), 50)
+        paths = sorted(os.path.join(dir_path, name) for dir_path, _, names in os.walk(self.root) for name in names)
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                field_reader = FieldReader(backend, io_workers=3, prefetch=4)
+                self.assertEqual(list(field_reader.iter_fields(paths)),
+                                 [(path, self.expected(path)) for path in paths])
+    
+    def test_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            FieldReader("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
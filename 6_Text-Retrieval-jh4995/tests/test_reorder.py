@@ -0,0 +1,83 @@
+import os
+import contextlib
+import unittest
+from array import array
+from src.searcher import Searcher
+from src.reorder import DocReorderer
+from src.impact import ImpactBuilder
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+QUERIES = ["반도체 기판", "[AND] 위성 서버", "[CLASS=H01] 반도체", "[YEAR>=2018] laser led", "반도", "[FIELD=T] 센서"]
+
+
+class DocReordererTest(unittest.TestCase):
+    """doc_id를 재배치한 인덱스가 doc_map.bin으로 원본 doc_id로 되돌리면 원본과 같은 포스팅 / 검색 결과를 내는지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        cls.root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(cls.root, "data")
+        cls.index_dirs = {}
+        make_corpus(cls.data_dir, 200)
+        for layout in ["field", "merged"]:
+            cls.index_dirs[layout] = os.path.join(cls.root, layout)
+            build_index(cls.data_dir, cls.index_dirs[layout], postings_layout=layout)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            ImpactBuilder(cls.index_dirs["field"], DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE).build(0)
+    
+    def open(self, index_dir, **kwargs):
+        searcher = Searcher(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def reorder(self, layout, method):
+        output_dir = os.path.join(self.root, f"{layout}_{method}")
+        reorderer = DocReorderer(self.index_dirs[layout], DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                 output_dir, method)
+        self.addCleanup(reorderer.searcher.close)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            order = reorderer.reorder(sample_queries=5)
+        with open(os.path.join(output_dir, DocReorderer.MAP_FILE), "rb") as f:
+            doc_map = array('i', f.read())
+        self.assertEqual(list(doc_map), order)
+        self.assertEqual(sorted(order), list(range(len(order))))
+        return output_dir, doc_map
+    
+    def test_round_trip(self):
+        for layout in ["field", "merged"]:
+            for method in DocReorderer.METHODS:
+                with self.subTest(layout=layout, method=method):
+                    output_dir, doc_map = self.reorder(layout, method)
+                    original = self.open(self.index_dirs[layout], use_impacts=False)
+                    reordered = self.open(output_dir, use_impacts=False)
+                    
+                    for term in original.term_dict:
+                        for field in ['T', 'A', 'C']:
+                            doc_ids, tfs = reordered.get_postings_arrays(term, field)
+                            self.assertEqual(sorted((doc_map[doc_id], tf) for doc_id, tf in zip(doc_ids, tfs)),
+                                             list(zip(*original.get_postings_arrays(term, field))))
+                    
+                    for query in QUERIES:
+                        expected = original.search(query, 0, 1000)
+                        actual = reordered.search(query, 0, 1000)
+                        self.assertGreater(expected.total, 0)
+                        self.assertEqual({doc_map[r.doc_id]: r.score for r in actual.results},
+                                         {r.doc_id: r.score for r in expected.results})
+                        self.assertEqual(actual.total, expected.total)
+    
+    def test_impact_index_rebuilt(self):
+        output_dir, doc_map = self.reorder("field", "minhash")
+        original = self.open(self.index_dirs["field"])
+        reordered = self.open(output_dir)
+        for term in original.term_dict:
+            with self.subTest(term=term):
+                self.assertEqual(sorted((doc_map[doc_id], impact) for doc_id, impact in reordered.get_impact_postings(term)),
+                                 sorted(original.get_impact_postings(term)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import unittest
+from src import scanner
+from src.scanner import CorpusScanner
+from .support import make_corpus, temp_dir
+
+# 1_welcometogithub-jh4995에 둔 scanner.py 사본 (과제 폴더별 단독 실행용)
+SCANNER_COPY = os.path.join(os.path.dirname(__file__), "..", "..", "1_welcometogithub-jh4995", "scanner.py")
+
+
+class CorpusScannerTest(unittest.TestCase):
+    
+    def setUp(self):
+        root = temp_dir(self.addCleanup)
+        self.data_dir = os.path.join(root, "data")
+        self.manifest_file = os.path.join(root, "manifest.json")
+        make_corpus(self.data_dir, 40)
+    
+    def test_scan_equals_os_walk(self):
+        expected = sorted(os.path.join(dir_path, name)
+                          for dir_path, _, names in os.walk(self.data_dir) for name in names)
+        corpus_scanner = CorpusScanner(self.data_dir, num_workers=4)
+        entries = corpus_scanner.scan()
+        self.assertEqual([path for path, _, _ in entries], expected)
+        self.assertEqual([size for _, size, _ in entries], [os.path.getsize(path) for path in expected])
+        self.assertEqual(corpus_scanner.num_dirs, 5)
+    
+    def test_manifest_reuse_and_diff(self):
+        entries = CorpusScanner(self.data_dir, self.manifest_file).scan()
+        os.remove(entries[0][0])
+        
+        # manifest를 재사용하면 삭제된 파일이 남아 있고, 다시 탐색하면 diff에 나타남
+        corpus_scanner = CorpusScanner(self.data_dir, self.manifest_file)
+        self.assertEqual(corpus_scanner.scan(reuse_manifest=True), entries)
+        added, removed, modified = corpus_scanner.diff(entries, corpus_scanner.scan())
+        self.assertEqual((added, removed, modified), ([], [entries[0][0]], []))
+    
+    def test_rejects_empty_or_missing_root(self):
+        with self.assertRaises(ValueError):
+            CorpusScanner("")
+        with self.assertRaises(ValueError):
+            CorpusScanner(os.path.join(self.data_dir, "missing")).scan()
+    
+    @unittest.skipUnless(os.path.exists(SCANNER_COPY), "scanner.py 사본 없음")
+    def test_vendored_copy_is_identical(self):
+        with open(SCANNER_COPY, 'rb') as copy, open(scanner.__file__, 'rb') as f:
+            self.assertEqual(copy.read(), f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import unittest
+import itertools
+from unittest import mock
+from src.searcher import Searcher, QueryError
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+def open_searcher(index_dir, **kwargs):
+    return Searcher(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                    use_impacts=False, preload_tagger=False, **kwargs)
+
+
+class SearchApiTest(unittest.TestCase):
+    """search()의 페이지 / SearchResponse 필드와 iter_search()가 같은 순위를 내는지 확인"""
+    
+    QUERIES = ["반도체 기판", "서버 보안 데이터", "laser", "[AND] 장치 방법", "[FIELD=T] 위성 서버"]
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.index_dir = os.path.join(root, "index")
+        make_corpus(os.path.join(root, "data"), 150)
+        build_index(os.path.join(root, "data"), cls.index_dir)
+    
+    def setUp(self):
+        self.searcher = open_searcher(self.index_dir)
+        self.addCleanup(self.searcher.close)
+    
+    def ranking(self, results):
+        return [(r.rank, r.doc_id, r.score) for r in results]
+    
+    def test_pages_concatenate_to_full_ranking(self):
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                full = self.searcher.search(query, 0, 1000)
+                self.assertGreater(full.total, 10)
+                self.assertEqual(len(full.results), full.total)
+                self.assertEqual([r.rank for r in full.results], list(range(1, full.total + 1)))
+                self.assertEqual([(-r.score, r.doc_id) for r in full.results],
+                                 sorted((-r.score, r.doc_id) for r in full.results))
+                
+                pages = []
+                for offset in range(0, full.total + 7, 7):
+                    page = self.searcher.search(query, offset, 7)
+                    self.assertEqual((page.query, page.total, page.offset), (query, full.total, offset))
+                    pages.extend(page.results)
+                self.assertEqual(self.ranking(pages), self.ranking(full.results))
+    
+    def test_iter_search_matches_search(self):
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                full = self.searcher.search(query, 0, 1000)
+                self.assertEqual(self.ranking(self.searcher.iter_search(query)), self.ranking(full.results))
+    
+    def test_iter_search_makes_snippets_only_for_consumed_results(self):
+        with mock.patch.object(self.searcher, "get_snippets", wraps=self.searcher.get_snippets) as get_snippets:
+            results = list(itertools.islice(self.searcher.iter_search("반도체 기판", snippets=True), 3))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(get_snippets.call_count, 3)
+        self.assertTrue(all(result.snippets is not None for result in results))
+    
+    def test_snippets_follow_verbose_prefix(self):
+        response = self.searcher.search("[VERBOSE] 서버 보안", 0, 3)
+        self.assertTrue(response.verbose)
+        self.assertTrue(all(result.snippets is not None for result in response.results))
+        
+        response = self.searcher.search("[VERBOSE] 서버 보안", 0, 3, snippets=False)
+        self.assertFalse(response.verbose)
+        self.assertTrue(all(result.snippets is None for result in response.results))
+        
+        response = self.searcher.search("서버 보안", 0, 3)
+        self.assertFalse(response.verbose)
+        self.assertTrue(all(result.snippets is None for result in response.results))
+    
+    def test_notices_are_returned_not_printed(self):
+        response = self.searcher.search("[FUZZY] 반도채 기판")
+        self.assertIn("(오타 보정: 반도채 -> 반도체)", response.notices)
+        self.assertEqual(self.searcher.search("반도체 기판").notices, [])
+        
+        notices = []
+        results = self.searcher.iter_search("[FUZZY] 반도채 기판", notices=notices)
+        self.assertEqual(notices, [])  # generator는 첫 결과를 꺼낼 때 쿼리를 실행함
+        next(results)
+        self.assertEqual(notices, response.notices)
+    
+    def test_limit_offset_edges(self):
+        total = self.searcher.search("반도체").total
+        response = self.searcher.search("반도체", 0, 0)
+        self.assertEqual((response.total, response.results), (total, []))
+        response = self.searcher.search("반도체", total, 10)
+        self.assertEqual((response.total, response.results), (total, []))
+        self.assertIsNone(response.filter_count)
+        self.assertTrue(response.exact and response.total_exact)
+        
+        self.assertEqual(self.searcher.search("[CLASS=H04] 반도체").filter_count,
+                         len(self.searcher.filter_index.evaluate([("CLASS", "=", "H04")])))
+        
+        with self.assertRaises(ValueError):
+            self.searcher.search("반도체", -1, 10)
+        with self.assertRaises(QueryError):
+            self.searcher.search("*")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import unittest
+from src.searcher import Searcher
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, VOCABULARY,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+
+def open_searcher(index_dir, **kwargs):
+    return Searcher(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                    use_impacts=False, preload_tagger=False, **kwargs)
+
+
+class TieredSearchTest(unittest.TestCase):
+    """tier_fields를 메모리에 올린 tiered 평가가 전체 평가와 같은 상위 결과를 내는지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.field_dir = os.path.join(root, "field")
+        cls.merged_dir = os.path.join(root, "merged")
+        make_corpus(cls.data_dir, 400)
+        build_index(cls.data_dir, cls.field_dir, postings_layout="field")
+        build_index(cls.data_dir, cls.merged_dir, postings_layout="merged")
+        
+        rng = random.Random(1)
+        cls.queries = [" ".join(rng.sample(VOCABULARY, rng.randint(1, 4))) for _ in range(60)]
+    
+    def open(self, index_dir, **kwargs):
+        searcher = open_searcher(index_dir, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_tiered_top_k_equals_exhaustive(self):
+        exhaustive = self.open(self.field_dir)
+        for tier_fields in [('T',), ('T', 'A')]:
+            tiered = self.open(self.field_dir, tier_fields=tier_fields)
+            for query in self.queries:
+                for prefix in ["", "[FIELD=T][FIELD=C] ", "[CLASS=H04] "]:
+                    for offset, limit in [(0, 1), (0, 10), (5, 10)]:
+                        with self.subTest(tiers=tier_fields, query=prefix + query, offset=offset, limit=limit):
+                            expected = exhaustive.search(prefix + query, offset, limit)
+                            actual = tiered.search(prefix + query, offset, limit)
+                            self.assertEqual([(r.doc_id, r.score) for r in actual.results],
+                                             [(r.doc_id, r.score) for r in expected.results])
+                            if actual.total_exact:
+                                self.assertEqual(actual.total, expected.total)
+            self.assertGreater(tiered.tier_counts["tiered"], 0)
+    
+    def test_total_is_lower_bound_when_inexact(self):
+        exhaustive = self.open(self.field_dir)
+        tiered = self.open(self.field_dir, tier_fields=('T',))
+        inexact = 0
+        for query in self.queries:
+            expected = exhaustive.search(query, 0, 3)
+            actual = tiered.search(query, 0, 3)
+            if actual.total_exact:
+                self.assertEqual(actual.total, expected.total)
+            else:
+                inexact += 1
+                self.assertLessEqual(actual.total, expected.total)
+        self.assertGreater(inexact, 0)
+        self.assertGreater(tiered.tier_counts["disk_skipped"], 0)
+    
+    def test_unsupported_queries_fall_back(self):
+        tiered = self.open(self.field_dir, tier_fields=('T', 'A'))
+        exhaustive = self.open(self.field_dir)
+        for query in ["[AND] 반도체 기판", "[PHRASE] 반도체 기판", "반도* 기판"]:
+            with self.subTest(query=query):
+                self.assertEqual([(r.doc_id, r.score) for r in tiered.search(query, 0, 10).results],
+                                 [(r.doc_id, r.score) for r in exhaustive.search(query, 0, 10).results])
+        self.assertEqual(tiered.tier_counts["tiered"], 0)
+        
+        # 필요한 결과 수가 정해지지 않은 iter_search와 merged 레이아웃은 tiered 평가를 쓰지 않음
+        self.assertEqual(len(list(tiered.iter_search("반도체 기판"))), exhaustive.search("반도체 기판").total)
+        merged = self.open(self.merged_dir, tier_fields=('T',))
+        merged.search("반도체 기판")
+        self.assertEqual(tiered.tier_counts["tiered"], 0)
+        self.assertEqual(merged.tier_counts["tiered"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import types
+import threading
+import unittest
+import subprocess
+from unittest import mock
+from src import tokenizer
+from src.searcher import Searcher
+from src.pruning import IndexPruner
+from .support import (DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, FakeTagger,
+                      use_tagger, make_corpus, build_index, temp_dir)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SlowKomoran(FakeTagger):
+    """생성할 때 잠시 기다리는 Komoran 대역 (생성 횟수를 셈)"""
+    
+    created = 0
+    
+    def __init__(self):
+        super().__init__()
+        SlowKomoran.created += 1
+        threading.Event().wait(0.05)
+
+
+def fake_konlpy():
+    """sys.modules에 SlowKomoran을 제공하는 konlpy.tag를 넣는 patch"""
+    tag = types.ModuleType("konlpy.tag")
+    tag.Komoran = SlowKomoran
+    package = types.ModuleType("konlpy")
+    package.tag = tag
+    return mock.patch.dict(sys.modules, {"konlpy": package, "konlpy.tag": tag})
+
+
+class LazyTaggerTest(unittest.TestCase):
+    """Komoran(JVM)은 형태소 분석이 필요할 때만, 한 번만 생성되는지 확인"""
+    
+    def setUp(self):
+        SlowKomoran.created = 0
+        for patcher in (fake_konlpy(), mock.patch.object(tokenizer, "tagger", None),
+                        mock.patch.object(tokenizer, "tagger_thread", None),
+                        mock.patch.dict(tokenizer.startup_times, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_tagger_created_once_across_threads(self):
+        tokenizer.start_tagger()
+        tokenizer.start_tagger()
+        taggers = []
+        threads = [threading.Thread(target=lambda: taggers.append(tokenizer.get_tagger())) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tokenizer.tagger_thread.join()
+        
+        self.assertEqual(SlowKomoran.created, 1)
+        self.assertTrue(all(tagger is tokenizer.tagger for tagger in taggers))
+        self.assertEqual(set(tokenizer.startup_times), {"konlpy_import", "komoran_init", "first_use_wait"})
+        self.assertEqual(tokenizer.extract_terms("반도체 Laser 및"), ["반도체", "laser"])
+    
+    def test_preload_starts_tagger_only_when_requested(self):
+        root = temp_dir(self.addCleanup)
+        with use_tagger():
+            make_corpus(os.path.join(root, "data"), 30)
+            build_index(os.path.join(root, "data"), os.path.join(root, "index"))
+        
+        with mock.patch("src.searcher.start_tagger") as start_tagger:
+            searcher = Searcher(os.path.join(root, "index"), DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                preload_tagger=False)
+            searcher.close()
+            start_tagger.assert_not_called()
+            
+            pruner = IndexPruner(os.path.join(root, "index"), DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                                 os.path.join(root, "pruned"))
+            pruner.searcher.close()
+            start_tagger.assert_not_called()
+            
+            searcher = Searcher(os.path.join(root, "index"), DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE)
+            searcher.close()
+            start_tagger.assert_called_once_with()
+        self.assertEqual(SlowKomoran.created, 0)
+    
+    def test_stats_command_does_not_import_konlpy(self):
+        root = temp_dir(self.addCleanup)
+        with use_tagger():
+            make_corpus(os.path.join(root, "data"), 30)
+            build_index(os.path.join(root, "data"), os.path.join(root, "index"))
+        
+        script = ("import sys, main\n"
+                  "exit_code = main.main(['--index-dir', sys.argv[1], 'stats', '--format', 'json'])\n"
+                  "sys.stderr.write(f'{exit_code} {\"konlpy\" in sys.modules}')\n")
+        completed = subprocess.run([sys.executable, "-c", script, os.path.join(root, "index")], cwd=PROJECT_DIR,
+                                   capture_output=True, text=True, timeout=120)
+        self.assertTrue(completed.stderr.endswith("0 False"), completed.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
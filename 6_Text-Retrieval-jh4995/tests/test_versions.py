@@ -0,0 +1,71 @@
+import os
+import unittest
+from src.searcher import Searcher
+from src.versions import IndexVersions
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+
+class IndexVersionsTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.versions = IndexVersions(os.path.join(temp_dir(self.addCleanup), "index"))
+        for _ in range(5):
+            self.versions.create()
+    
+    def test_cleanup_counts_published_versions_only(self):
+        self.versions.publish("v0003")
+        self.assertEqual(self.versions.cleanup(2), ["v0001"])
+        # CURRENT보다 새로운 (게시 전 / 구축 중인) 버전은 남김
+        self.assertEqual(self.versions.versions(), ["v0002", "v0003", "v0004", "v0005"])
+        self.assertEqual(self.versions.cleanup(0), ["v0002"])
+        self.assertEqual(self.versions.versions(), ["v0003", "v0004", "v0005"])
+    
+    def test_cleanup_without_current(self):
+        self.assertEqual(self.versions.cleanup(1), [])
+        self.assertEqual(len(self.versions.versions()), 5)
+
+
+class VersionSwapTest(unittest.TestCase):
+    """auto_reload Searcher가 새 버전이 게시되면 쿼리 사이에 교체하고, 교체 후 결과가 새 버전과 같은지 확인"""
+    
+    def setUp(self):
+        patcher = use_tagger()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        root = temp_dir(self.addCleanup)
+        self.data_dir = os.path.join(root, "data")
+        self.index_root = os.path.join(root, "index")
+    
+    def open(self, index_dir, **kwargs):
+        searcher = Searcher(index_dir, DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def test_swap_to_published_version(self):
+        make_corpus(self.data_dir, 100)
+        build_index(self.data_dir, self.index_root, versioned=True)
+        searcher = self.open(self.index_root, auto_reload=True, reload_interval=0)
+        before = searcher.search("반도체 기판", 0, 10)
+        self.assertEqual(searcher.version, "v0001")
+        
+        # 문서를 추가하고 새 버전 게시
+        make_corpus(self.data_dir, 200)
+        build_index(self.data_dir, self.index_root, versioned=True)
+        expected = self.open(os.path.join(self.index_root, "v0002")).search("반도체 기판", 0, 10)
+        self.assertNotEqual(expected.total, before.total)
+        
+        # 첫 쿼리에서 백그라운드 로드 시작, 로드가 끝난 뒤 쿼리에서 교체
+        searcher.search("반도체 기판", 0, 10)
+        searcher.reload_thread.join()
+        response = searcher.search("반도체 기판", 0, 10)
+        self.assertIn("(인덱스 교체: v0002)", response.notices)
+        self.assertEqual(searcher.version, "v0002")
+        self.assertEqual(response.total, expected.total)
+        self.assertEqual([(r.doc_id, r.score) for r in response.results],
+                         [(r.doc_id, r.score) for r in expected.results])
+
+
+if __name__ == "__main__":
+    unittest.main()
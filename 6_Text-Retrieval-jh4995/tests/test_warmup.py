@@ -0,0 +1,97 @@
+import os
+import json
+import unittest
+from unittest import mock
+from src.searcher import Searcher
+from .support import DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE, use_tagger, make_corpus, build_index, temp_dir
+
+QUERIES = ["반도체 기판", "반도체 센서", "반도체", "위성 laser", "기판"]
+
+
+class WarmupTest(unittest.TestCase):
+    """access log로 자주 검색된 term을 기록하고, 다음 실행에서 그 포스팅을 미리 읽어 파일 없이 검색하는지 확인"""
+    
+    @classmethod
+    def setUpClass(cls):
+        patcher = use_tagger()
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        root = temp_dir(cls.addClassCleanup)
+        cls.data_dir = os.path.join(root, "data")
+        cls.index_dirs = {}
+        make_corpus(cls.data_dir, 200)
+        for layout in ["field", "merged"]:
+            cls.index_dirs[layout] = os.path.join(root, layout)
+            build_index(cls.data_dir, cls.index_dirs[layout], postings_layout=layout)
+    
+    def open(self, layout, **kwargs):
+        searcher = Searcher(self.index_dirs[layout], DOC_TABLE_FILE, TERM_DICT_FILE, POSTINGS_FILE,
+                            use_impacts=False, use_ngrams=False, preload_tagger=False, **kwargs)
+        self.addCleanup(searcher.close)
+        return searcher
+    
+    def record_queries(self, layout):
+        """access log에 QUERIES를 기록하고 (로그 파일 경로, 검색 결과) 반환"""
+        access_log = os.path.join(self.index_dirs[layout], "access_log.json")
+        if os.path.exists(access_log):
+            os.remove(access_log)
+        searcher = self.open(layout, access_log="access_log.json")
+        responses = [searcher.search(query, 0, 10) for query in QUERIES]
+        searcher.close()
+        return access_log, responses
+    
+    def test_access_log_persists(self):
+        access_log, _ = self.record_queries("field")
+        with open(access_log, encoding='utf8') as f:
+            self.assertEqual(json.load(f), {"반도체": 3, "기판": 2, "센서": 1, "위성": 1, "laser": 1})
+        # 다음 실행은 이전 기록부터 이어서 누적
+        searcher = self.open("field", access_log="access_log.json")
+        searcher.search("기판", 0, 10)
+        self.assertEqual(searcher.term_access["기판"], 3)
+    
+    def test_preload_serves_hot_terms_from_memory(self):
+        for layout in ["field", "merged"]:
+            with self.subTest(layout=layout):
+                _, expected = self.record_queries(layout)
+                searcher = self.open(layout, access_log="access_log.json", warmup_terms=2)
+                searcher.warmup_thread.join()
+                hot_ranges = {start for term in ["반도체", "기판"]
+                              for start, _ in searcher.postings_ranges(searcher.term_dict, searcher.postings_layout, term)}
+                self.assertEqual(set(searcher.resident_postings), hot_ranges)
+                
+                # warmup한 term만 쓰는 쿼리는 postings.bin을 읽지 않음
+                with mock.patch.object(searcher, "fp") as fp:
+                    response = searcher.search(QUERIES[0], 0, 10)
+                    fp.seek.assert_not_called()
+                self.assertEqual([(r.doc_id, r.score) for r in response.results],
+                                 [(r.doc_id, r.score) for r in expected[0].results])
+    
+    def test_warmup_budget(self):
+        self.record_queries("field")
+        searcher = self.open("field", access_log="access_log.json")
+        terms = [term for term, _ in searcher.term_access.most_common()]
+        sizes = {term: sum(size for _, size in searcher.postings_ranges(searcher.term_dict, "field", term))
+                 for term in terms}
+        
+        # 예산을 넘는 term은 건너뛰고 다음 term을 계속 시도
+        searcher.warmup_budget = sizes["반도체"] - 1
+        fitting = [term for term in terms if sizes[term] <= searcher.warmup_budget]
+        warmed, used = searcher.warm_postings(searcher.current_state(), terms)
+        self.assertLessEqual(used, searcher.warmup_budget)
+        self.assertNotIn(searcher.term_dict["반도체"]['C']["start"], searcher.resident_postings)
+        self.assertGreater(warmed, 0)
+        self.assertLessEqual(warmed, len(fitting))
+    
+    def test_prefetch_mode_keeps_results(self):
+        _, expected = self.record_queries("field")
+        searcher = self.open("field", access_log="access_log.json", warmup_terms=5, warmup_mode="prefetch")
+        searcher.warmup_thread.join()
+        self.assertEqual(searcher.resident_postings, {})
+        for query, expected_response in zip(QUERIES, expected):
+            self.assertEqual([(r.doc_id, r.score) for r in searcher.search(query, 0, 10).results],
+                             [(r.doc_id, r.score) for r in expected_response.results])
+
+
+if __name__ == "__main__":
+    unittest.main()